@@ -0,0 +1,370 @@
+# File: binary_protocol.py
+
+import json
+import struct
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+# Every binary packet starts with MAGIC so receivers can tell it apart from
+# the JSON (+zlib) packets that older peers send. zlib streams start with 0x78
+# and JSON with '{', neither of which collides with these bytes.
+MAGIC = b'\xd5\x51'
+BINARY_PROTOCOL_VERSION = 1
+
+# magic, version, message type code, flags, node id hash, sequence, timestamp
+HEADER = struct.Struct('!2sBBBIId')
+
+# Header flags
+FLAG_JSON_BODY = 0x01  # Body is zlib-compressed JSON of the payload (no struct layout)
+
+# Message type codes. Append only: codes are part of the wire format.
+MESSAGE_TYPES = (
+    'heartbeat', 'squid_move', 'squid_action', 'object_sync',
+    'rock_throw', 'player_join', 'player_leave', 'state_update',
+    'squid_exit', 'new_squid_arrival', 'squid_return', 'squid_state',
+)
+MESSAGE_TYPE_CODES = {name: code for code, name in enumerate(MESSAGE_TYPES, start=1)}
+
+# Enum-coded strings. ESCAPE means the string follows the struct, length-prefixed.
+ESCAPE = 0xFF
+DIRECTIONS = ('right', 'left', 'up', 'down')
+STATUSES = (
+    'idle', 'roaming', 'sleeping', 'eating', 'exploring', 'startled', 'fleeing',
+    'hiding', 'hiding behind plant', 'anxious', 'nervous', 'curious', 'playful',
+    'carrying_rock', 'pushing decoration', 'moving to food', 'searching for food',
+    'cautiously exploring', 'boldly exploring', 'visiting another tank',
+)
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+
+# Squid state (as built by MultiplayerPluginLogic._get_squid_state):
+# x, y, looking_direction, view_cone_angle, hunger, happiness,
+# direction, image_direction_key, status, state flags, color r, g, b,
+# squid_width, squid_height
+SQUID_STATE = struct.Struct('!6f7B2H')
+SQUID_STATE_FIELDS = frozenset((
+    'x', 'y', 'direction', 'image_direction_key', 'looking_direction', 'view_cone_angle',
+    'hunger', 'happiness', 'status', 'carrying_rock', 'is_sleeping', 'color', 'node_id',
+    'view_cone_visible', 'squid_width', 'squid_height',
+))
+STATE_CARRYING_ROCK = 0x01
+STATE_SLEEPING = 0x02
+STATE_VIEW_CONE_VISIBLE = 0x04
+
+# squid_state (keyframe/delta, see state_sync.py): keyframe id, flags, field mask,
+# then only the fields whose mask bit is set, in SQUID_DELTA_FIELDS order.
+SQUID_DELTA_HEADER = struct.Struct('!IBH')
+SQUID_DELTA_KEYFRAME = 0x01
+SQUID_DELTA_FIELDS = (
+    # name, kind, struct format
+    ('x', 'num', struct.Struct('!f')),
+    ('y', 'num', struct.Struct('!f')),
+    ('looking_direction', 'num', struct.Struct('!f')),
+    ('view_cone_angle', 'num', struct.Struct('!f')),
+    ('hunger', 'num', struct.Struct('!f')),
+    ('happiness', 'num', struct.Struct('!f')),
+    ('direction', 'direction', None),
+    ('image_direction_key', 'direction', None),
+    ('status', 'status', None),
+    ('carrying_rock', 'bool', None),
+    ('is_sleeping', 'bool', None),
+    ('view_cone_visible', 'bool', None),
+    ('color', 'color', struct.Struct('!3B')),
+    ('squid_width', 'int', struct.Struct('!H')),
+    ('squid_height', 'int', struct.Struct('!H')),
+)
+SQUID_DELTA_BITS = {name: 1 << bit for bit, (name, _, _) in enumerate(SQUID_DELTA_FIELDS)}
+_SQUID_DELTA_BOOL_MASK = sum(SQUID_DELTA_BITS[name] for name, kind, _ in SQUID_DELTA_FIELDS if kind == 'bool')
+
+# IPv4 address of the sender for object_sync's node_info
+NODE_IP = struct.Struct('!4B')
+
+
+def node_id_hash(node_id: str) -> int:
+    """32-bit hash of a node id, as carried in the packet header"""
+    return zlib.crc32(node_id.encode('utf-8')) & 0xFFFFFFFF
+
+
+def is_binary_packet(data: bytes) -> bool:
+    return len(data) >= HEADER.size and data[:2] == MAGIC
+
+
+def peek_node_hash(data: bytes) -> int:
+    """Sender node hash from a binary packet's header, without decoding the rest"""
+    return int.from_bytes(data[5:9], 'big')
+
+
+def _pack_string(value: str) -> bytes:
+    raw = value.encode('utf-8')[:255]
+    return bytes((len(raw),)) + raw
+
+
+def _unpack_string(data: bytes, offset: int):
+    length = data[offset]
+    end = offset + 1 + length
+    if end > len(data):
+        raise ValueError("Truncated string in binary packet")
+    return data[offset + 1:end].decode('utf-8', errors='replace'), end
+
+
+def _encode_squid_state(state: Dict[str, Any], node_id: str) -> Optional[bytes]:
+    """Fixed-layout squid state, or None if `state` has fields the layout cannot carry"""
+    if not SQUID_STATE_FIELDS.issuperset(state) or state.get('node_id', node_id) != node_id:
+        return None
+    color = state.get('color') or (150, 150, 150)
+    if len(color) != 3 or not all(isinstance(c, int) and 0 <= c <= 255 for c in color):
+        return None
+
+    extra = []
+    codes = []
+    for value, table in ((state.get('direction', 'right'), DIRECTION_CODES),
+                         (state.get('image_direction_key', state.get('direction', 'right')), DIRECTION_CODES),
+                         (state.get('status', 'idle'), STATUS_CODES)):
+        code = table.get(value)
+        if code is None:
+            if not isinstance(value, str):
+                return None
+            code = ESCAPE
+            extra.append(_pack_string(value))
+        codes.append(code)
+
+    flags = 0
+    if state.get('carrying_rock'): flags |= STATE_CARRYING_ROCK
+    if state.get('is_sleeping'): flags |= STATE_SLEEPING
+    if state.get('view_cone_visible'): flags |= STATE_VIEW_CONE_VISIBLE
+
+    try:
+        packed = SQUID_STATE.pack(
+            state.get('x', 0.0), state.get('y', 0.0),
+            state.get('looking_direction', 0.0), state.get('view_cone_angle', 0.0),
+            state.get('hunger', 0.0), state.get('happiness', 0.0),
+            codes[0], codes[1], codes[2], flags, color[0], color[1], color[2],
+            int(state.get('squid_width', 60)), int(state.get('squid_height', 40)))
+    except (struct.error, TypeError):
+        return None
+    return packed + b''.join(extra)
+
+
+def _decode_squid_state(data: bytes, offset: int, node_id: str):
+    (x, y, looking, cone_angle, hunger, happiness, direction_code, image_code, status_code,
+     flags, r, g, b, width, height) = SQUID_STATE.unpack_from(data, offset)
+    offset += SQUID_STATE.size
+
+    strings = []
+    for code, table in ((direction_code, DIRECTIONS), (image_code, DIRECTIONS), (status_code, STATUSES)):
+        if code == ESCAPE:
+            value, offset = _unpack_string(data, offset)
+        elif code < len(table):
+            value = table[code]
+        else:
+            raise ValueError(f"Unknown enum code {code} in squid state")
+        strings.append(value)
+
+    state = {
+        'x': x, 'y': y,
+        'direction': strings[0],
+        'image_direction_key': strings[1],
+        'looking_direction': looking,
+        'view_cone_angle': cone_angle,
+        'hunger': hunger, 'happiness': happiness,
+        'status': strings[2],
+        'carrying_rock': bool(flags & STATE_CARRYING_ROCK),
+        'is_sleeping': bool(flags & STATE_SLEEPING),
+        'color': (r, g, b),
+        'node_id': node_id,
+        'view_cone_visible': bool(flags & STATE_VIEW_CONE_VISIBLE),
+        'squid_width': width, 'squid_height': height,
+    }
+    return state, offset
+
+
+def _encode_object_sync(payload: Dict[str, Any], node_id: str) -> Optional[bytes]:
+    if set(payload) != {'squid', 'objects', 'node_info'} or payload['objects']:
+        return None  # Object lists have no fixed layout; send the whole payload as JSON
+    node_info = payload['node_info']
+    if not isinstance(node_info, dict) or set(node_info) != {'id', 'ip'} or node_info['id'] != node_id:
+        return None
+    try:
+        ip = NODE_IP.pack(*(int(part) for part in str(node_info['ip']).split('.')))
+    except (struct.error, ValueError):
+        return None
+    squid = _encode_squid_state(payload['squid'], node_id)
+    if squid is None:
+        return None
+    return ip + squid
+
+
+def _decode_object_sync(data: bytes, offset: int, node_id: str) -> Dict[str, Any]:
+    ip = '.'.join(str(part) for part in NODE_IP.unpack_from(data, offset))
+    squid, _ = _decode_squid_state(data, offset + NODE_IP.size, node_id)
+    return {'squid': squid, 'objects': [], 'node_info': {'id': node_id, 'ip': ip}}
+
+
+def _encode_squid_move(payload: Dict[str, Any], node_id: str) -> Optional[bytes]:
+    return _encode_squid_state(payload, node_id)
+
+
+def _decode_squid_move(data: bytes, offset: int, node_id: str) -> Dict[str, Any]:
+    return _decode_squid_state(data, offset, node_id)[0]
+
+
+def _encode_squid_delta(payload: Dict[str, Any], node_id: str) -> Optional[bytes]:
+    fields = payload.get('set')
+    if set(payload) - {'key', 'keyframe', 'set'} or not isinstance(fields, dict):
+        return None
+    fields = dict(fields)
+    if fields.pop('node_id', node_id) != node_id or not set(SQUID_DELTA_BITS).issuperset(fields):
+        return None
+
+    mask = 0
+    bools = 0
+    parts = []
+    strings = []
+    try:
+        for name, kind, fmt in SQUID_DELTA_FIELDS:
+            if name not in fields:
+                continue
+            value = fields[name]
+            mask |= SQUID_DELTA_BITS[name]
+            if kind == 'num' or kind == 'int':
+                parts.append(fmt.pack(value))
+            elif kind == 'bool':
+                if value:
+                    bools |= SQUID_DELTA_BITS[name]
+            elif kind == 'color':
+                parts.append(fmt.pack(*value))
+            else:
+                code = (DIRECTION_CODES if kind == 'direction' else STATUS_CODES).get(value)
+                if code is None:
+                    if not isinstance(value, str):
+                        return None
+                    code = ESCAPE
+                    strings.append(_pack_string(value))
+                parts.append(bytes((code,)))
+    except (struct.error, TypeError, ValueError):
+        return None
+
+    flags = SQUID_DELTA_KEYFRAME if payload.get('keyframe') else 0
+    header = SQUID_DELTA_HEADER.pack(int(payload.get('key', 0)) & 0xFFFFFFFF, flags, mask)
+    # Boolean values share one bitmask; it is only sent when a boolean changed
+    bool_bytes = struct.pack('!H', bools) if mask & _SQUID_DELTA_BOOL_MASK else b''
+    return header + bool_bytes + b''.join(parts) + b''.join(strings)
+
+
+
+def _decode_squid_delta(data: bytes, offset: int, node_id: str) -> Dict[str, Any]:
+    key, flags, mask = SQUID_DELTA_HEADER.unpack_from(data, offset)
+    offset += SQUID_DELTA_HEADER.size
+    bools = 0
+    if mask & _SQUID_DELTA_BOOL_MASK:
+        bools = struct.unpack_from('!H', data, offset)[0]
+        offset += 2
+
+    fields = {}
+    escaped = []
+    for name, kind, fmt in SQUID_DELTA_FIELDS:
+        bit = SQUID_DELTA_BITS[name]
+        if not mask & bit:
+            continue
+        if kind == 'num' or kind == 'int':
+            fields[name] = fmt.unpack_from(data, offset)[0]
+            offset += fmt.size
+        elif kind == 'bool':
+            fields[name] = bool(bools & bit)
+        elif kind == 'color':
+            fields[name] = fmt.unpack_from(data, offset)
+            offset += fmt.size
+        else:
+            code = data[offset]
+            offset += 1
+            table = DIRECTIONS if kind == 'direction' else STATUSES
+            if code == ESCAPE:
+                escaped.append(name)
+            elif code < len(table):
+                fields[name] = table[code]
+            else:
+                raise ValueError(f"Unknown enum code {code} in squid state")
+    for name in escaped:
+        fields[name], offset = _unpack_string(data, offset)
+
+    payload = {'key': key, 'set': fields}
+    if flags & SQUID_DELTA_KEYFRAME:
+        payload['keyframe'] = True
+        fields['node_id'] = node_id
+    return payload
+
+
+# Message types with a fixed layout: name -> (encoder, decoder).
+# Everything else travels as a binary header plus a zlib JSON body.
+STRUCT_CODECS = {
+    'object_sync': (_encode_object_sync, _decode_object_sync),
+    'squid_move': (_encode_squid_move, _decode_squid_move),
+    'squid_state': (_encode_squid_delta, _decode_squid_delta),
+}
+
+
+def encode_message(message_type: str, payload: Dict[str, Any], node_id: str,
+                   sequence: int, timestamp: float) -> Optional[bytes]:
+    """
+    Encode one message as a binary packet.
+    Returns None if the message type has no code; the caller should send JSON instead.
+    """
+    type_code = MESSAGE_TYPE_CODES.get(message_type)
+    if type_code is None:
+        return None
+
+    flags = 0
+    body = None
+    codec = STRUCT_CODECS.get(message_type)
+    if codec is not None:
+        body = codec[0](payload, node_id)
+    if body is None:
+        flags |= FLAG_JSON_BODY
+        body = zlib.compress(json.dumps(payload).encode('utf-8'))
+
+    header = HEADER.pack(MAGIC, BINARY_PROTOCOL_VERSION, type_code, flags,
+                         node_id_hash(node_id), sequence & 0xFFFFFFFF, timestamp)
+    return header + body
+
+
+def decode_message(data: bytes, resolve_node_id: Callable[[int], Optional[str]]) -> Optional[Dict[str, Any]]:
+    """
+    Decode a binary packet into the same message dict a JSON packet decodes to
+    ({'node_id', 'timestamp', 'type', 'payload'}), plus 'seq' and 'wire'.
+
+    resolve_node_id maps a header hash back to a node id learned from earlier
+    JSON packets. Returns None if the sender is not known yet.
+    Raises ValueError for malformed or unsupported packets.
+    """
+    try:
+        magic, version, type_code, flags, sender_hash, sequence, timestamp = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a binary packet")
+        if version != BINARY_PROTOCOL_VERSION:
+            raise ValueError(f"Unsupported binary protocol version {version}")
+        if not 1 <= type_code <= len(MESSAGE_TYPES):
+            raise ValueError(f"Unknown message type code {type_code}")
+
+        node_id = resolve_node_id(sender_hash)
+        if node_id is None:
+            return None
+
+        message_type = MESSAGE_TYPES[type_code - 1]
+        if flags & FLAG_JSON_BODY:
+            payload = json.loads(zlib.decompress(data[HEADER.size:]).decode('utf-8'))
+        else:
+            codec = STRUCT_CODECS.get(message_type)
+            if codec is None:
+                raise ValueError(f"No binary layout for '{message_type}'")
+            payload = codec[1](data, HEADER.size, node_id)
+    except (struct.error, IndexError, zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Malformed binary packet: {e}") from e
+
+    return {
+        'node_id': node_id,
+        'timestamp': timestamp,
+        'type': message_type,
+        'payload': payload,
+        'seq': sequence,
+        'wire': version,
+    }
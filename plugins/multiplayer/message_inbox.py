@@ -0,0 +1,70 @@
+# File: message_inbox.py
+
+import threading
+from typing import Any, Dict, List, Tuple
+
+# Message types where only the newest message per sending node matters
+COALESCED_MESSAGE_TYPES = ('object_sync', 'squid_move', 'squid_state', 'heartbeat')
+
+
+def supersede(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The message that replaces `older` when `newer` from the same node arrives.
+    A squid_state delta cannot replace the keyframe it is relative to, so the
+    keyframe is kept unchanged in 'set' and the newest delta rides along in
+    'delta'. Every delta is relative to the original keyframe, never to the
+    delta before it, so a later delta replaces the one already folded in.
+    """
+    if newer.get('type') == 'squid_state':
+        old_payload = older.get('payload', {})
+        new_payload = newer.get('payload', {})
+        if old_payload.get('keyframe') and not new_payload.get('keyframe') and \
+           old_payload.get('key') == new_payload.get('key'):
+            return dict(newer, payload={'key': old_payload.get('key'), 'keyframe': True,
+                                        'set': old_payload.get('set', {}),
+                                        'delta': new_payload.get('set', {})})
+    return newer
+
+
+class CoalescingInbox:
+    """
+    Thread-safe hand-off of decoded messages from the listener thread to the
+    GUI thread. A newer state message from a node replaces the one from the
+    same node still waiting to be applied, so a packet flood cannot pile up
+    work for the next Qt timer tick. Other messages are kept in arrival order.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: List[Any] = []  # (message_dict, addr) in arrival order; None once superseded
+        self._latest: Dict[Tuple[str, str], int] = {}  # (node_id, type) -> index in _items
+        self.coalesced = 0  # Messages dropped because a newer one replaced them
+
+    def put(self, message_dict: Dict[str, Any], addr: tuple):
+        with self._lock:
+            message_type = message_dict.get('type')
+            if message_type in COALESCED_MESSAGE_TYPES:
+                key = (message_dict.get('node_id'), message_type)
+                index = self._latest.get(key)
+                if index is not None:
+                    message_dict = supersede(self._items[index][0], message_dict)
+                    self._items[index] = None
+                    self.coalesced += 1
+                self._latest[key] = len(self._items)
+            self._items.append((message_dict, addr))
+
+    def drain(self) -> List[Tuple[Dict[str, Any], tuple]]:
+        """Take every waiting message, oldest first"""
+        with self._lock:
+            items = self._items
+            self._items = []
+            self._latest = {}
+        return [item for item in items if item is not None]
+
+    def empty(self) -> bool:
+        with self._lock:
+            return not self._items
+
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._items) - sum(1 for item in self._items if item is None)
@@ -13,7 +13,10 @@ PLUGIN_REQUIRES = [] # Names of other plugins this one depends on
 MULTICAST_GROUP = '224.3.29.71'   # IP address for the multicast group
 MULTICAST_PORT = 10000            # Port number for multicast communication
 SYNC_INTERVAL = 1.0               # Default seconds between game state sync broadcasts
+STATE_KEYFRAME_INTERVAL = 10      # Squid state syncs between full keyframes (the rest only carry changed fields)
 MAX_PACKET_SIZE = 65507           # Maximum UDP packet size, to prevent fragmentation
+WIRE_FORMAT = 'binary'            # 'binary' (compact structs, falls back to JSON for older peers) or 'json'
+PEER_TIMEOUT = 30.0               # Seconds without contact before a peer no longer counts for wire format negotiation
 
 # --- Visual Settings (Defaults) ---
 # These are default visual parameters. The MultiplayerPlugin instance may override these
@@ -8,10 +8,25 @@ import zlib
 import json
 import traceback # Retaining import
 import threading
+import selectors
 import logging # Ensure logging is imported
 
 # Import constants
-from .mp_constants import MULTICAST_GROUP, MULTICAST_PORT, MAX_PACKET_SIZE
+from .mp_constants import MULTICAST_GROUP, MULTICAST_PORT, MAX_PACKET_SIZE, WIRE_FORMAT, PEER_TIMEOUT
+from . import binary_protocol
+from .message_inbox import CoalescingInbox
+from .packet_validator import PacketValidator
+
+# Message types always sent as JSON: they announce our node id and wire
+# capabilities, so peers can resolve binary headers and negotiate formats.
+ANNOUNCE_MESSAGE_TYPES = ('heartbeat', 'player_join', 'player_leave')
+
+# Squid state messages; an older sequence number than the last one seen
+# from the same node means the packet was reordered and is dropped.
+STATE_MESSAGE_TYPES = ('object_sync', 'squid_move', 'squid_state')
+
+# Optional features this node understands, advertised in every JSON packet
+CAPABILITIES = ('delta_sync',)
 
 
 class NetworkNode:
@@ -46,8 +61,29 @@ class NetworkNode:
         self.connection_retry_interval = 5.0 # seconds
         self.auto_reconnect = True # Flag to control auto-reconnect attempts
         self.use_compression = True # Flag to control message compression
-
-        self.incoming_queue = queue.Queue() # Thread-safe queue for received messages
+        self.wire_format = WIRE_FORMAT # 'binary' or 'json'; binary is only used once every peer supports it
+
+        self.send_sequence = 0 # Stamped on every outgoing packet
+        self.peer_wire_versions = {} # node_id -> binary protocol version the peer advertised (absent = JSON only)
+        self.peer_capabilities = {} # node_id -> set of advertised CAPABILITIES
+        self.known_nodes_version = 0 # Incremented whenever a new peer appears (network thread)
+        self.node_id_hashes = {} # Header node hash -> node_id, learned from JSON packets
+        self.node_id_hash = binary_protocol.node_id_hash(self.node_id) # Our own, to drop looped-back packets
+        self._own_json_prefix = ('{' + json.dumps({'node_id': self.node_id})[1:-1]).encode('utf-8') # Start of our JSON packets
+        self.last_state_sequences = {} # node_id -> sequence of the newest squid state received (listener thread)
+        self.last_heard = {} # node_id -> time of the last accepted packet (network thread)
+        self._send_lock = threading.Lock() # send_message is called from the GUI and network threads
+
+        # Work the network thread runs on a schedule (syncs, heartbeats, cleanup)
+        self._periodic_tasks = {} # name -> {'interval': float or callable, 'callback': callable, 'due': float}
+        self._tasks_lock = threading.Lock()
+        self._wake_recv, self._wake_send = socket.socketpair() # Interrupts select() from other threads
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+        self.add_periodic_task('peer_cleanup', PEER_TIMEOUT / 2, self._prune_silent_peers)
+        self._announce_pending = True # Send the next packet as JSON so peers learn our id and capabilities
+
+        self.incoming_queue = CoalescingInbox() # Decoded, validated messages; newer state replaces older per node
         self.queue_lock = threading.Lock() # Used with incoming_message_queue in one of the versions, ensure consistency
 
         self.known_nodes = {} # Stores info about other detected nodes
@@ -163,35 +199,151 @@ class NetworkNode:
             return False
 
     def _listen_for_multicast(self):
-        """Dedicated thread function to listen for incoming multicast packets."""
-        self.logger.info(f"Listener thread started for node {self.node_id} on IP {self.local_ip}.")
+        """
+        Network thread: one selector loop that receives packets and runs the
+        periodic tasks (state sync, heartbeats, peer cleanup). It sleeps until
+        a packet arrives, a task is due or wake() is called - no polling.
+        """
+        self.logger.info(f"Network thread started for node {self.node_id} on IP {self.local_ip}.")
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_recv, selectors.EVENT_READ, 'wake')
+        registered_socket = None
+
         while self._is_listening_active: # Loop controlled by flag
             if not self.is_connected or not self.socket:
-                self.logger.warning("Listening loop: Socket not connected or available. Attempting to reconnect...")
-                if not self.try_reconnect(): # This will call initialize_socket_structure
-                    self.logger.error("Listening loop: Reconnect failed. Pausing before retry.")
-                    time.sleep(self.connection_retry_interval) 
-                    continue # Retry connection
+                if registered_socket is not None:
+                    self._unregister(selector, registered_socket)
+                    registered_socket = None
+                if self.auto_reconnect and time.time() - self.last_connection_attempt >= self.connection_retry_interval:
+                    self.logger.warning("Network loop: Socket not connected. Attempting to reconnect...")
+                    self.last_connection_attempt = time.time()
+                    if not self.initialize_socket_structure():
+                        self.logger.error("Network loop: Reconnect failed. Will retry.")
+
+            if self.is_connected and self.socket is not None and self.socket is not registered_socket:
+                if registered_socket is not None:
+                    self._unregister(selector, registered_socket)
+                try:
+                    self.socket.setblocking(False)
+                    selector.register(self.socket, selectors.EVENT_READ, 'socket')
+                    registered_socket = self.socket
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"Could not watch socket: {e}")
+                    self.is_connected = False
+                    registered_socket = None
+
+            timeout = self._run_due_tasks()
+            if registered_socket is None:
+                timeout = min(timeout, self.connection_retry_interval)
 
             try:
-                raw_data, addr = self.socket.recvfrom(MAX_PACKET_SIZE)
+                events = selector.select(timeout)
+            except (OSError, ValueError) as e: # Socket closed underneath us
+                if self._is_listening_active:
+                    self.logger.error(f"Socket error in network thread: {e}")
+                self.is_connected = False
+                continue
 
-                if raw_data:
-                    # Use the thread-safe queue for passing data to the main thread
-                    self.incoming_queue.put({'raw_data': raw_data, 'addr': addr})
-            except socket.timeout:
-                continue # Normal behavior for non-blocking socket, allows checking _is_listening_active
+            for key, _ in events:
+                if key.data == 'wake':
+                    try:
+                        while self._wake_recv.recv(64): pass
+                    except (BlockingIOError, OSError): pass
+                else:
+                    self._receive_available(key.fileobj)
+
+        if registered_socket is not None:
+            self._unregister(selector, registered_socket)
+        selector.close()
+        self.logger.info(f"Network thread stopped for node {self.node_id}.")
+
+    def _unregister(self, selector, sock):
+        try:
+            selector.unregister(sock)
+        except (KeyError, ValueError, OSError):
+            pass
+
+    def _receive_available(self, sock):
+        """Read every datagram waiting on the socket"""
+        while True:
+            try:
+                raw_data, addr = sock.recvfrom(MAX_PACKET_SIZE)
+            except (BlockingIOError, InterruptedError, socket.timeout):
+                return
             except OSError as e: # Handle socket closed or other OS errors
                 if self._is_listening_active: # Log only if we weren't expecting closure
-                    self.logger.error(f"Socket OS error in listener thread: {e}", exc_info=True)
-                self.is_connected = False # Assume connection is lost if OS error occurs
-                # No break here, rely on try_reconnect in the next iteration if _is_listening_active is still true
+                    self.logger.error(f"Socket OS error in network thread: {e}")
+                self.is_connected = False
+                return
+            if not raw_data:
+                continue
+            try:
+                message_dict = self._decode_packet(raw_data, addr)
+                if message_dict is not None and self._accept_message(message_dict, addr):
+                    # Hand decoded messages to the main thread; superseded state is coalesced
+                    self.incoming_queue.put(message_dict, addr)
             except Exception as e: # Catch any other unexpected errors
-                if self._is_listening_active:
-                     self.logger.error(f"Unexpected error in listener thread: {e}", exc_info=True)
-                time.sleep(0.1) # Brief pause before retrying or exiting based on flag
+                self.logger.error(f"Unexpected error handling packet from {addr}: {e}", exc_info=self.debug_mode)
 
-        self.logger.info(f"Listener thread stopped for node {self.node_id}.")
+    def add_periodic_task(self, name, interval, callback):
+        """
+        Run callback() on the network thread every `interval` seconds.
+        interval may be a callable returning the next delay. Replaces a task of the same name.
+        """
+        with self._tasks_lock:
+            self._periodic_tasks[name] = {'interval': interval, 'callback': callback, 'due': time.time()}
+        self.wake()
+
+    def run_task_soon(self, name):
+        """Make a periodic task due now instead of at its scheduled time."""
+        with self._tasks_lock:
+            task = self._periodic_tasks.get(name)
+            if task is None:
+                return
+            task['due'] = time.time()
+        self.wake()
+
+    def remove_periodic_task(self, name):
+        with self._tasks_lock:
+            self._periodic_tasks.pop(name, None)
+
+    def wake(self):
+        """Make the network thread re-check its tasks now (callable from any thread)."""
+        try:
+            self._wake_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass # Already has a wake-up pending, or closed
+
+    def _run_due_tasks(self):
+        """Run the periodic tasks that are due; returns seconds until the next one."""
+        now = time.time()
+        with self._tasks_lock:
+            due_tasks = [(name, task) for name, task in self._periodic_tasks.items() if task['due'] <= now]
+        for name, task in due_tasks:
+            try:
+                task['callback']()
+            except Exception as e:
+                self.logger.error(f"Error in network task '{name}': {e}", exc_info=self.debug_mode)
+            try:
+                interval = task['interval']() if callable(task['interval']) else task['interval']
+            except Exception:
+                interval = 1.0
+            task['due'] = time.time() + max(0.05, interval)
+
+        with self._tasks_lock:
+            next_due = min((task['due'] for task in self._periodic_tasks.values()), default=now + 60.0)
+        return max(0.0, next_due - time.time())
+
+    def _prune_silent_peers(self):
+        """Forget protocol state of peers that stopped sending (network thread)."""
+        cutoff = time.time() - PEER_TIMEOUT * 2
+        for node_id, last_seen in list(self.last_heard.items()):
+            if last_seen < cutoff:
+                self.last_heard.pop(node_id, None)
+                self.last_state_sequences.pop(node_id, None)
+                self.peer_wire_versions.pop(node_id, None)
+                self.peer_capabilities.pop(node_id, None)
+                self.node_id_hashes.pop(binary_protocol.node_id_hash(node_id), None)
 
 
     def is_listening(self):
@@ -233,7 +385,10 @@ class NetworkNode:
 
         self.logger.info("Stopping listener thread...")
         self._is_listening_active = False # Signal the loop to terminate
-        
+        self.wake()
+
+        if self.listener_thread is threading.current_thread():
+            return # Called from a network task; the loop exits when the task returns
         if self.listener_thread and self.listener_thread.is_alive():
             self.listener_thread.join(timeout=2.0) # Wait for the thread to finish
             if self.listener_thread.is_alive():
@@ -279,29 +434,24 @@ class NetworkNode:
                  self.logger.error(f"Send failed for '{message_type}': Still not connected after reconnect check.")
                  return False
 
-        # Construct the full message with metadata
-        message_data = {
-            'node_id': self.node_id,       # Sender's ID
-            'timestamp': time.time(),    # Time of sending
-            'type': message_type,        # Type of message (e.g., "squid_exit")
-            'payload': payload           # The actual data payload
-        }
+        timestamp = time.time()
+        with self._send_lock:
+            sequence = self._next_sequence()
+            use_binary = self._use_binary(message_type)
 
         try:
-            data_to_send: bytes
-            serialized_message = json.dumps(message_data).encode('utf-8')
+            data_to_send = None
+            if use_binary:
+                data_to_send = binary_protocol.encode_message(message_type, payload, self.node_id, sequence, timestamp)
 
-            if self.use_compression:
-                # Use NetworkUtilities for compression if available, else direct zlib
-                if self.utils and hasattr(self.utils, 'compress_message'):
-                    # Assuming compress_message takes the dict and returns bytes
-                    data_to_send = self.utils.compress_message(message_data) 
-                else: # Fallback to direct zlib if NetworkUtilities or method missing
+            if data_to_send is None: # JSON fallback for older peers
+                serialized_message = self._encode_json(message_type, payload, sequence, timestamp)
+                if self.use_compression:
                     data_to_send = zlib.compress(serialized_message)
-                if self.debug_mode and message_type.upper() in ["SQUID_EXIT", "SQUID_RETURN"]:
-                    self.logger.debug(f"DEBUG_COMPRESS (send): Type: {message_type}. Original: {len(serialized_message)}, Compressed: {len(data_to_send)}")
-            else: 
-                data_to_send = serialized_message
+                    if self.debug_mode and message_type.upper() in ["SQUID_EXIT", "SQUID_RETURN"]:
+                        self.logger.debug(f"DEBUG_COMPRESS (send): Type: {message_type}. Original: {len(serialized_message)}, Compressed: {len(data_to_send)}")
+                else: 
+                    data_to_send = serialized_message
 
             if len(data_to_send) > MAX_PACKET_SIZE:
                 self.logger.warning(f"Message '{message_type}' size ({len(data_to_send)}) exceeds MAX_PACKET_SIZE. May fail or be fragmented (UDP handles this, but can be less reliable).")
@@ -322,6 +472,136 @@ class NetworkNode:
             self.logger.error(f"Error sending message '{message_type}': {e}", exc_info=self.debug_mode)
         return False
 
+    def _next_sequence(self):
+        self.send_sequence = (self.send_sequence + 1) & 0xFFFFFFFF
+        return self.send_sequence
+
+    def _use_binary(self, message_type: str) -> bool:
+        """Binary packets go out only when every active peer has advertised binary support."""
+        if self.wire_format != 'binary' or message_type in ANNOUNCE_MESSAGE_TYPES:
+            return False
+        if self._announce_pending:
+            self._announce_pending = False # A newly seen peer gets one JSON packet to learn our id from
+            return False
+
+        active_peers = self._active_peers()
+        if not active_peers:
+            return False # Nobody is listening yet; JSON is readable by anyone who joins
+        return all(self.peer_wire_versions.get(node_id) == binary_protocol.BINARY_PROTOCOL_VERSION
+                   for node_id in active_peers)
+
+    def _active_peers(self):
+        now = time.time()
+        return [node_id for node_id, last_seen in list(self.last_heard.items())
+                if now - last_seen < PEER_TIMEOUT]
+
+    def peers_support(self, capability: str) -> bool:
+        """True if there are active peers and every one of them advertised `capability`."""
+        active_peers = self._active_peers()
+        return bool(active_peers) and all(capability in self.peer_capabilities.get(node_id, ())
+                                          for node_id in active_peers)
+
+    def _encode_json(self, message_type: str, payload: dict, sequence: int, timestamp: float):
+        """Serialized JSON message, the format older peers understand."""
+        message_data = {
+            'node_id': self.node_id,       # Sender's ID
+            'timestamp': timestamp,      # Time of sending
+            'type': message_type,        # Type of message (e.g., "squid_exit")
+            'payload': payload,          # The actual data payload
+            'seq': sequence,             # Sequence number, as in binary headers
+            'caps': list(CAPABILITIES),  # Optional features we understand
+        }
+        if self.wire_format == 'binary':
+            message_data['wire'] = binary_protocol.BINARY_PROTOCOL_VERSION # Advertise binary support
+        return json.dumps(message_data).encode('utf-8')
+
+    def _decode_packet(self, raw_data: bytes, addr: tuple):
+        """
+        Decode one datagram into a message dict, parsing it exactly once.
+        Our own packets are dropped from the header (binary) or the leading
+        node_id (JSON) before the payload is parsed. Returns None for our own,
+        unknown-sender and malformed packets. Runs on the listener thread.
+        """
+        if binary_protocol.is_binary_packet(raw_data):
+            if binary_protocol.peek_node_hash(raw_data) == self.node_id_hash:
+                return None
+            try:
+                message_dict = binary_protocol.decode_message(raw_data, self.node_id_hashes.get)
+            except ValueError as e_binary:
+                if self.debug_mode: self.logger.warning(f"Failed to decode binary packet from {addr}: {e_binary}")
+                return None
+            if message_dict is None:
+                # Sender not announced yet; its next heartbeat (JSON) introduces it
+                if self.debug_mode: self.logger.debug(f"Binary packet from {addr} by unknown node; waiting for its announcement.")
+            return message_dict
+
+        try:
+            # zlib streams never start with '{', so there is no need to try both
+            data = raw_data if raw_data[:1] == b'{' else zlib.decompress(raw_data)
+            if data.startswith(self._own_json_prefix):
+                return None
+            message_dict = json.loads(data)
+        except (zlib.error, ValueError) as e_decode: # ValueError covers JSON and UTF-8 errors
+            if self.debug_mode: self.logger.warning(f"Failed to decode packet from {addr}. Error: {e_decode}. Data: {raw_data[:80]}")
+            return None
+
+        if not isinstance(message_dict, dict) or not isinstance(message_dict.get('node_id'), str):
+            if self.debug_mode: self.logger.debug(f"Invalid or incomplete message structure from {addr}: {message_dict}")
+            return None
+        sender = message_dict['node_id']
+        if sender == self.node_id:
+            return None
+        # Learned here rather than on the main thread so binary packets queued right
+        # behind this one can already be resolved
+        self.node_id_hashes[binary_protocol.node_id_hash(sender)] = sender
+        return message_dict
+
+    def _accept_message(self, message_dict: dict, addr: tuple) -> bool:
+        """
+        Validate a decoded message, drop reordered state and record the sender's
+        capabilities. Runs on the listener thread.
+        """
+        is_valid, error = PacketValidator.validate_message(message_dict)
+        if not is_valid:
+            if self.debug_mode: self.logger.debug(f"Rejected '{message_dict.get('type')}' from {addr}: {error}")
+            return False
+        if self._is_stale_state(message_dict):
+            return False
+
+        sender = message_dict['node_id']
+        if sender not in self.last_heard:
+            with self._send_lock:
+                self._announce_pending = True # Make sure the newcomer can resolve our binary headers
+            self.known_nodes_version += 1
+        self.last_heard[sender] = time.time()
+        self._learn_peer(message_dict)
+        return True
+
+    def _learn_peer(self, message_dict: dict):
+        """Record a peer's advertised wire format and capabilities."""
+        sender = message_dict.get('node_id')
+        if not isinstance(sender, str):
+            return
+        wire_version = message_dict.get('wire')
+        if wire_version is not None:
+            self.peer_wire_versions[sender] = wire_version
+        capabilities = message_dict.get('caps')
+        if isinstance(capabilities, list):
+            self.peer_capabilities[sender] = set(capabilities)
+
+    def _is_stale_state(self, message_dict: dict) -> bool:
+        """True for a squid state packet older than one already received from the same node."""
+        sequence = message_dict.get('seq')
+        if message_dict.get('type') not in STATE_MESSAGE_TYPES or not isinstance(sequence, int):
+            return False
+        sender = message_dict.get('node_id')
+        last = self.last_state_sequences.get(sender)
+        # Serial number comparison so the 32-bit counter can wrap
+        if last is not None and ((sequence - last) & 0xFFFFFFFF) >= 0x80000000:
+            return True
+        self.last_state_sequences[sender] = sequence
+        return False
+
     def send_message_batch(self, messages: list):
         """Sends a batch of messages in a single packet."""
         # Connection check similar to send_message
@@ -375,8 +655,9 @@ class NetworkNode:
 
     def receive_messages(self):
         """
-        Processes all currently queued raw datagrams from the listener thread.
-        This should be called by the main application thread.
+        Processes all messages the listener thread has decoded so far.
+        This should be called by the main application thread; it only does
+        peer bookkeeping, the packets were parsed and validated on the listener thread.
         Returns:
             list: A list of (message_dict, address_tuple) for successfully decoded messages.
         """
@@ -388,76 +669,9 @@ class NetworkNode:
 
         received_messages_this_call = []
         
-        # Process all items currently in the queue
-        while not self.incoming_queue.empty():
-            try:
-                item = self.incoming_queue.get_nowait() # Get item from queue
-                raw_data = item['raw_data']
-                addr = item['addr']
-            except queue.Empty: # Should not happen with while not empty(), but as safeguard
-                break
-            except Exception as e_q: # Should not happen for basic queue ops
-                self.logger.error(f"Error getting item from incoming_queue: {e_q}")
-                continue
-
-            # Peek at sender_node_id from raw data if possible (for debug log context)
-            temp_node_id_peek = "unknown_at_raw_recv"
-            try: # This peeking is best-effort for logging, might fail if data is not as expected
-                peek_data_bytes = raw_data
-                if self.use_compression: # Try decompressing a copy for peeking
-                    try: peek_data_bytes = zlib.decompress(raw_data)
-                    except zlib.error: pass # If not zlib compressed, peek_data_bytes remains raw_data
-                
-                j_peek = json.loads(peek_data_bytes.decode('utf-8', errors='ignore'))
-                temp_node_id_peek = j_peek.get('node_id', 'peek_decode_fail')
-            except: # Broad except as peeking can fail in many ways
-                temp_node_id_peek = 'peek_failed_entirely'
-
-
-            # Log raw reception if it's not from self (based on peek)
-            if temp_node_id_peek != self.node_id:
-                if self.debug_mode: print(f"DEBUG_RAW_RECEIVE (Node {self.node_id}) from {addr} (Peeked Sender: {temp_node_id_peek}). Size: {len(raw_data)}. Data[:60]: {raw_data[:60]}")
-            
-            message_dict = None
-            decoded_successfully = False
-            # Try decoding (with or without compression)
-            try:
-                data_for_json_decode = raw_data
-                if self.use_compression:
-                    try:
-                        if self.utils and hasattr(self.utils, 'decompress_message'):
-                            # Assumes decompress_message returns a dict or raises error
-                            message_dict = self.utils.decompress_message(raw_data)
-                        else: # Fallback to direct zlib + json
-                            data_for_json_decode = zlib.decompress(raw_data)
-                            message_dict = json.loads(data_for_json_decode.decode('utf-8'))
-                        decoded_successfully = True
-                    except (zlib.error, TypeError) as e_zlib: # TypeError if utils.decompress_message fails unexpectedly
-                        # If zlib fails, it might be an uncompressed message. Try decoding raw_data as JSON.
-                        if self.debug_mode: self.logger.debug(f"Zlib decompression failed from {addr} (Sender: {temp_node_id_peek}): {e_zlib}. Trying as uncompressed JSON.")
-                        # data_for_json_decode remains raw_data
-                        message_dict = json.loads(raw_data.decode('utf-8'))
-                        decoded_successfully = True # If this line is reached, uncompressed JSON was successful
-                else: # Not using compression, just decode JSON
-                    message_dict = json.loads(raw_data.decode('utf-8'))
-                    decoded_successfully = True
-            
-            except (json.JSONDecodeError, UnicodeDecodeError) as e_decode:
-                if self.debug_mode: self.logger.warning(f"Failed to decode JSON/UTF-8 from {addr} (Sender: {temp_node_id_peek}). Error: {e_decode}. Data: {raw_data[:80]}")
-                continue # Skip this malformed packet
-            except Exception as e_general_decode: # Catch-all for other unexpected decoding issues
-                if self.debug_mode: self.logger.error(f"General error decoding packet from {addr} (Sender: {temp_node_id_peek}): {e_general_decode}", exc_info=True)
-                continue
-
-            if not decoded_successfully or not isinstance(message_dict, dict) or 'node_id' not in message_dict:
-                if self.debug_mode: self.logger.debug(f"Invalid or incomplete message structure after all decode attempts from {addr} (Sender: {temp_node_id_peek}): {message_dict}")
-                continue
-            
-            final_sender_node_id = message_dict.get('node_id')
-            
-            # Critical filter: Ignore messages from self
-            if final_sender_node_id == self.node_id:
-                continue 
+        # Process all items currently in the queue (already decoded and validated by the listener thread)
+        for message_dict, addr in self.incoming_queue.drain():
+            final_sender_node_id = message_dict['node_id']
 
             # Log decoded message details
             if self.debug_mode:
@@ -466,13 +680,7 @@ class NetworkNode:
                 if message_dict.get('type') == 'squid_exit': # Specific debug for SQUID_EXIT payload
                     print(f"DEBUG_SQUID_EXIT_PAYLOAD_RECEIVED: {message_dict.get('payload')}")
             
-            # Update known_nodes (this is a simplified version, a more robust presence system might be needed)
-            # The payload of interest for squid's last known state might be deeper, e.g., message_dict['payload']['payload'] for SQUID_EXIT
-            squid_info_for_known_nodes = message_dict.get('payload', {}) 
-            if message_dict.get('type') == 'squid_exit' and isinstance(squid_info_for_known_nodes.get('payload'), dict):
-                squid_info_for_known_nodes = squid_info_for_known_nodes.get('payload')
-
-            self.known_nodes[final_sender_node_id] = (addr[0], time.time(), squid_info_for_known_nodes)
+            self._remember_node(message_dict, addr)
             
             # Add the fully processed message and its original address to the list for the caller
             received_messages_this_call.append((message_dict, addr))
@@ -480,6 +688,16 @@ class NetworkNode:
         return received_messages_this_call
 
 
+    def _remember_node(self, message_dict: dict, addr: tuple):
+        """Update known_nodes with the sender of a decoded message."""
+        # Update known_nodes (this is a simplified version, a more robust presence system might be needed)
+        # The payload of interest for squid's last known state might be deeper, e.g., message_dict['payload']['payload'] for SQUID_EXIT
+        sender = message_dict['node_id']
+        squid_info_for_known_nodes = message_dict.get('payload', {}) 
+        if message_dict.get('type') == 'squid_exit' and isinstance(squid_info_for_known_nodes.get('payload'), dict):
+            squid_info_for_known_nodes = squid_info_for_known_nodes.get('payload')
+        self.known_nodes[sender] = (addr[0], time.time(), squid_info_for_known_nodes)
+
     def process_messages(self, plugin_manager_ref): 
         """
         Retrieves messages from the internal queue (filled by receive_messages via listener thread)
@@ -489,14 +707,8 @@ class NetworkNode:
         messages_to_process_from_queue = []
         while not self.incoming_queue.empty(): # Drain the queue
             try:
-                # Item from queue is expected to be {'raw_data': ..., 'addr': ...} from _listen_for_multicast
-                # NO, item from queue should be (decoded_message_dict, addr) if receive_messages puts decoded ones.
-                # Let's clarify: _listen_for_multicast puts raw data.
-                # receive_messages (called by this process_messages or similar) decodes them.
-                # This process_messages should be working with DECODED messages.
-                
-                # The current structure has receive_messages called by process_messages.
-                # So, call receive_messages first to get decoded messages.
+                # _listen_for_multicast decodes packets and queues (message_dict, addr).
+                # receive_messages drains the queue and does the peer bookkeeping.
                 decoded_messages_and_addrs = self.receive_messages() # This call processes the queue internally.
 
                 for message_data, addr in decoded_messages_and_addrs:
@@ -566,5 +778,12 @@ class NetworkNode:
             except Exception as e_sock_close:
                 if self.debug_mode: self.logger.debug(f"Error closing socket (may already be closed): {e_sock_close}")
             self.socket = None # Clear socket reference
+
+        # The network thread has exited, so nothing waits on the wake-up pair any more
+        for wake_socket in (self._wake_recv, self._wake_send):
+            try:
+                wake_socket.close()
+            except OSError:
+                pass
             
         self.logger.info(f"Network node {self.node_id} closed.")
\ No newline at end of file
@@ -20,6 +20,7 @@ import logging # Added for logger
 from . import mp_constants # Access constants like mp_constants.PLUGIN_NAME
 from .mp_network_node import NetworkNode
 from .remote_entity_manager import RemoteEntityManager # Ensure this is imported if type hinting or direct use
+from .state_sync import SquidStateEncoder, SquidStateDecoder # Keyframe + delta squid state sync
 from .squid_multiplayer_autopilot import RemoteSquidController # Ensure this for autopilot logic
 
 # TamagotchiLogic is imported in main.py and should be in sys.path
@@ -46,7 +47,6 @@ class MultiplayerPlugin:
         self.tamagotchi_logic: TamagotchiLogic | None = None # Set during setup
 
         # --- Timers and Threads ---
-        self.sync_thread: threading.Thread | None = None
         self.message_process_timer: QtCore.QTimer | None = None
         self.controller_update_timer: QtCore.QTimer | None = None
         self.controller_creation_timer: QtCore.QTimer | None = None
@@ -60,6 +60,10 @@ class MultiplayerPlugin:
         self.pending_controller_creations: List[Dict[str, Any]] = []
         self.connection_lines: Dict[str, QtWidgets.QGraphicsLineItem] = {}
         self.last_message_times: Dict[str, float] = {}
+        self.state_encoder = SquidStateEncoder(mp_constants.STATE_KEYFRAME_INTERVAL) # Outgoing squid state deltas
+        self.state_decoder = SquidStateDecoder() # Remote keyframes for incoming deltas
+        self._state_peers_version = 0 # NetworkNode.known_nodes_version at the last keyframe request
+        self._state_snapshot: Dict[str, Any] | None = None # Latest local state, published each simulation tick
 
         # --- Configuration ---
         self.MULTICAST_GROUP = mp_constants.MULTICAST_GROUP
@@ -1649,6 +1653,7 @@ class MultiplayerPlugin:
             "on_network_squid_exit": self.handle_squid_exit_message,
             "on_network_squid_move": self.handle_squid_move,
             "on_network_object_sync": self.handle_object_sync,
+            "on_network_squid_state": self.handle_squid_state,
             "on_network_rock_throw": self.handle_rock_throw,
             "on_network_heartbeat": self.handle_heartbeat,
             "on_network_state_update": self.handle_state_update, # Generic state update
@@ -1675,6 +1680,10 @@ class MultiplayerPlugin:
         self.plugin_manager.register_hook("pre_update") 
         self.plugin_manager.subscribe_to_hook("pre_update", mp_constants.PLUGIN_NAME, self._process_network_node_queue)
 
+        # State snapshots for the network thread are taken at the end of each simulation tick
+        self.plugin_manager.register_hook("post_update")
+        self.plugin_manager.subscribe_to_hook("post_update", mp_constants.PLUGIN_NAME, self._publish_state_snapshot)
+
         if self.debug_mode: self.logger.debug("Network message hooks and pre_update hook registered.")
 
 
@@ -1686,78 +1695,92 @@ class MultiplayerPlugin:
 
 
     def start_sync_timer(self):
-        """Starts a daemon thread for periodic game state synchronization."""
+        """Schedules state syncs and heartbeats on the NetworkNode's network thread."""
         if not self.logger: return
-        if self.sync_thread and self.sync_thread.is_alive():
-            if self.debug_mode: self.logger.debug("Sync thread already running.")
+        if not self.network_node:
+            self.logger.error("Cannot schedule state sync, network_node is not set.")
             return
+        self.network_node.add_periodic_task('state_sync', self._next_sync_delay, self.sync_game_state)
+        self.network_node.add_periodic_task('heartbeat', 8.0, self.send_heartbeat) # Every 8 seconds
+        if self.debug_mode: self.logger.info("Game state synchronization scheduled on the network thread.")
 
-        def game_state_sync_loop():
-            while True:
-                if not self.is_setup: # Check if plugin is still supposed to be running
-                    if self.debug_mode: self.logger.debug("SyncLoop: Plugin not setup or disabled, loop exiting.")
-                    break
-                try:
-                    if self.network_node and self.network_node.is_connected and \
-                       self.tamagotchi_logic and self.tamagotchi_logic.squid:
-                        
-                        # Dynamic sync interval based on local squid activity and peer count
-                        is_local_squid_moving = getattr(self.tamagotchi_logic.squid, 'is_moving', False)
-                        sync_delay_seconds = 0.3 if is_local_squid_moving else self.SYNC_INTERVAL # More frequent if moving
-                        
-                        num_peers = len(getattr(self.network_node, 'known_nodes', {}))
-                        if num_peers > 8: sync_delay_seconds *= 1.5 # Reduce load with many peers
-                        elif num_peers > 15: sync_delay_seconds *= 2.0
-                        sync_delay_seconds = max(0.2, min(sync_delay_seconds, 3.0)) # Clamp interval
 
-                        self.sync_game_state() # Send current state
-                        time.sleep(sync_delay_seconds)
-                    else:
-                        # If not connected or prerequisites missing, wait longer before retrying
-                        time.sleep(2.5) 
-                except ReferenceError: # Can happen during interpreter shutdown
-                    if self.debug_mode: self.logger.debug("SyncLoop: ReferenceError (likely app shutting down), loop exiting.")
-                    break
-                except Exception as e_sync:
-                    if self.debug_mode: self.logger.error(f"Error in game_state_sync_loop: {e_sync}", exc_info=True)
-                    time.sleep(3.0) # Wait a bit longer after an error
-        
-        self.sync_thread = threading.Thread(target=game_state_sync_loop, daemon=True)
-        self.sync_thread.start()
-        if self.debug_mode: self.logger.info("Game state synchronization thread started.")
+    def _publish_state_snapshot(self, **kwargs):
+        """
+        post_update hook (GUI thread): capture the local squid state for the network thread.
+        Each snapshot is a new dict that is never modified afterwards, so handing it over is a
+        single attribute assignment and the network thread never touches Qt-owned objects.
+        """
+        if not self.is_setup or not self.network_node or not self.tamagotchi_logic: return
+        try:
+            squid_state = self._get_squid_state()
+            if not squid_state: return
+            previous = self._state_snapshot
+            is_moving = bool(getattr(self.tamagotchi_logic.squid, 'is_moving', False))
+            self._state_snapshot = {
+                'squid': squid_state,
+                'objects': self._get_objects_state(),
+                'is_moving': is_moving,
+            }
+            if previous is None or (is_moving and not previous['is_moving']):
+                self.network_node.run_task_soon('state_sync') # Started moving: sync at the faster rate now
+        except Exception as e:
+            if self.debug_mode: self.logger.error(f"Error capturing state snapshot: {e}", exc_info=True)
+
+
+    def _next_sync_delay(self) -> float:
+        """Seconds until the next state sync, based on local squid activity and peer count."""
+        snapshot = self._state_snapshot
+        is_local_squid_moving = bool(snapshot and snapshot['is_moving'])
+        sync_delay_seconds = 0.3 if is_local_squid_moving else self.SYNC_INTERVAL # More frequent if moving
+
+        num_peers = len(getattr(self.network_node, 'known_nodes', {}))
+        if num_peers > 15: sync_delay_seconds *= 2.0 # Reduce load with many peers
+        elif num_peers > 8: sync_delay_seconds *= 1.5
+        return max(0.2, min(sync_delay_seconds, 3.0)) # Clamp interval
 
 
     def sync_game_state(self):
-        """Collects and sends current local game state."""
+        """Sends the latest local state snapshot. Runs on the network thread."""
         if not self.logger: return
-        if not self.tamagotchi_logic or not hasattr(self.tamagotchi_logic, 'squid') or \
-           not self.network_node or not self.network_node.is_connected:
+        network_node = self.network_node
+        snapshot = self._state_snapshot
+        if not self.is_setup or not network_node or not network_node.is_connected or snapshot is None:
             return # Prerequisites not met
 
         try:
-            squid_current_state = self._get_squid_state()
-            objects_current_state = self._get_objects_state() # Get state of syncable objects
-
-            sync_payload = {
-                'squid': squid_current_state,
-                'objects': objects_current_state,
-                'node_info': {'id': self.network_node.node_id, 'ip': self.network_node.local_ip}
-            }
-            self.network_node.send_message('object_sync', sync_payload) # Use 'object_sync' for combined state
-            
-            # Send heartbeat periodically as well
-            time_now = time.time()
-            if time_now - self.last_message_times.get('heartbeat_sent', 0) > 8.0: # Every 8 seconds
-                heartbeat_payload = {
-                    'node_id': self.network_node.node_id, 'status': 'active',
-                    'squid_pos': (squid_current_state['x'], squid_current_state['y']) # Include position in heartbeat
+            squid_current_state = snapshot['squid']
+            objects_current_state = snapshot['objects']
+
+            if not objects_current_state and network_node.peers_support('delta_sync'):
+                # Every peer rebuilds our state from keyframes plus changed fields
+                if network_node.known_nodes_version != self._state_peers_version:
+                    self._state_peers_version = network_node.known_nodes_version
+                    self.state_encoder.request_keyframe() # New peers need a baseline
+                network_node.send_message('squid_state', self.state_encoder.encode(squid_current_state))
+            else:
+                sync_payload = {
+                    'squid': squid_current_state,
+                    'objects': objects_current_state,
+                    'node_info': {'id': network_node.node_id, 'ip': network_node.local_ip}
                 }
-                self.network_node.send_message('heartbeat', heartbeat_payload)
-                self.last_message_times['heartbeat_sent'] = time_now
+                network_node.send_message('object_sync', sync_payload) # Use 'object_sync' for combined state
         except Exception as e:
             self.logger.error(f"ERROR during sync_game_state: {e}", exc_info=True)
 
 
+    def send_heartbeat(self):
+        """Announces this node (and its squid's position) to peers. Runs on the network thread."""
+        network_node = self.network_node
+        if not self.is_setup or not network_node or not network_node.is_connected: return
+        heartbeat_payload = {'node_id': network_node.node_id, 'status': 'active'}
+        snapshot = self._state_snapshot
+        if snapshot is not None:
+            heartbeat_payload['squid_pos'] = (snapshot['squid']['x'], snapshot['squid']['y']) # Include position in heartbeat
+        network_node.send_message('heartbeat', heartbeat_payload)
+        self.last_message_times['heartbeat_sent'] = time.time()
+
+
     def _get_squid_state(self) -> Dict:
         """Compiles and returns a dictionary of the local squid's current state."""
         if not self.logger: return {}
@@ -1935,6 +1958,35 @@ class MultiplayerPlugin:
             if self.debug_mode: self.logger.error(f"Handling object_sync from {addr} failed: {e}", exc_info=True)
 
 
+    def handle_squid_state(self, node: NetworkNode, message: Dict, addr: tuple):
+        """Handles 'squid_state' messages: a keyframe or the fields changed since the sender's last keyframe."""
+        if not self.logger: return
+        sender_node_id = message.get('node_id')
+        if not sender_node_id or (self.network_node and sender_node_id == self.network_node.node_id): return
+
+        try:
+            remote_squid_state = self.state_decoder.decode(sender_node_id, message.get('payload', {}))
+            if remote_squid_state is None:
+                if self.debug_mode: self.logger.debug(f"squid_state from {sender_node_id[-6:]} before its keyframe; waiting.")
+                return
+
+            if self.entity_manager:
+                if sender_node_id in self.entity_manager.remote_squids:
+                    self.entity_manager.apply_squid_state(sender_node_id, remote_squid_state)
+                else:
+                    self.entity_manager.update_remote_squid(sender_node_id, remote_squid_state, is_new_arrival=False)
+            else:
+                self.update_remote_squid(sender_node_id, remote_squid_state, is_new_arrival=False)
+
+            if self.tamagotchi_logic and self.tamagotchi_logic.squid and \
+               hasattr(self.tamagotchi_logic.squid, 'process_squid_detection'):
+                self.tamagotchi_logic.squid.process_squid_detection(
+                    remote_node_id=sender_node_id, is_visible=True, remote_squid_props=remote_squid_state
+                )
+        except Exception as e:
+            if self.debug_mode: self.logger.error(f"Handling squid_state from {addr} failed: {e}", exc_info=True)
+
+
     def process_remote_object(self, remote_obj_data: Dict, source_node_id: str, clone_id: str):
         """
         Creates or updates a visual clone of a remote object in the local scene.
@@ -2552,17 +2604,19 @@ class MultiplayerPlugin:
                 if self.debug_mode: self.logger.debug(f"Stopped timer '{timer_attr_name}'.")
             setattr(self, timer_attr_name, None) # Clear reference
 
-        # Sync thread is a daemon, will exit with app. Signal it to stop if it checks is_setup.
-        if self.sync_thread and self.sync_thread.is_alive():
-             if self.debug_mode: self.logger.info("Sync thread was active during cleanup. As a daemon, it will exit with app or when its loop condition (is_setup) fails.")
-        self.sync_thread = None # Clear reference
+        self._state_snapshot = None
         
         # NetworkNode cleanup
         if self.network_node:
             nn_ref = self.network_node # Temporary reference for cleanup
             self.network_node = None # Nullify early to prevent re-use during its own shutdown
 
-            if nn_ref.is_connected: # Send leave message if connected
+            # Stop scheduled syncs/heartbeats so nothing else goes out after the leave message
+            nn_ref.remove_periodic_task('state_sync')
+            nn_ref.remove_periodic_task('heartbeat')
+            nn_ref.auto_reconnect = False
+
+            if nn_ref.is_connected: # Send leave message while the socket is still up
                 try:
                     nn_ref.send_message(
                         'player_leave',
@@ -2570,25 +2624,12 @@ class MultiplayerPlugin:
                     )
                 except Exception as e_leave: # Socket might already be closed
                     if self.debug_mode: self.logger.error(f"Error sending player_leave message (socket may be closed): {e_leave}", exc_info=False) # No exc_info if expected
-            
-            # Close socket and leave multicast group
-            if nn_ref.socket: 
-                try:
-                    if nn_ref.is_connected and hasattr(nn_ref, 'local_ip') and nn_ref.local_ip and \
-                       hasattr(mp_constants, 'MULTICAST_GROUP') and mp_constants.MULTICAST_GROUP:
-                        import socket as sock_module # Local import for cleanup
-                        mreq_leave = sock_module.inet_aton(mp_constants.MULTICAST_GROUP) + sock_module.inet_aton(nn_ref.local_ip)
-                        nn_ref.socket.setsockopt(sock_module.IPPROTO_IP, sock_module.IP_DROP_MEMBERSHIP, mreq_leave)
-                except AttributeError as e_attr: 
-                     if self.debug_mode: self.logger.warning(f"Attribute error during multicast group leave: {e_attr}")
-                except Exception as e_mcast_leave:
-                     if self.debug_mode: self.logger.warning(f"Error leaving multicast group: {e_mcast_leave}", exc_info=True)
-                finally:
-                    try:
-                        nn_ref.socket.close()
-                    except Exception: pass # Ignore errors on closing already closed socket
-            nn_ref.is_connected = False
-            nn_ref.socket = None
+
+            # Stop the network thread, leave the multicast group and close all sockets
+            try:
+                nn_ref.close()
+            except Exception as e_close:
+                if self.debug_mode: self.logger.warning(f"Error closing network node: {e_close}", exc_info=True)
         
         # Cleanup visuals if entity_manager is not handling it or as a final sweep
         if self.entity_manager:
@@ -38,7 +38,7 @@ class PacketValidator:
         valid_types = [
             'heartbeat', 'squid_move', 'squid_action', 'object_sync', 
             'rock_throw', 'player_join', 'player_leave', 'state_update',
-            'squid_exit', 'new_squid_arrival'
+            'squid_exit', 'new_squid_arrival', 'squid_state', 'squid_return'
         ]
         if message['type'] not in valid_types:
             return False, f"Unknown message type: {message['type']}"
@@ -52,6 +52,8 @@ class PacketValidator:
             return PacketValidator.validate_squid_exit(message['payload'])
         elif message['type'] == 'object_sync':
             return PacketValidator.validate_object_sync(message['payload'])
+        elif message['type'] == 'squid_state':
+            return PacketValidator.validate_squid_state(message['payload'])
         
         # Default to valid for types without specific validation
         return True, None
@@ -116,6 +118,23 @@ class PacketValidator:
         
         return True, None
     
+    @staticmethod
+    def validate_squid_state(payload: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """Validate squid state keyframe/delta payload"""
+        if not isinstance(payload.get('key'), int):
+            return False, "Missing keyframe id in squid_state"
+        
+        if not isinstance(payload.get('set'), dict):
+            return False, "squid_state fields must be a dictionary"
+        
+        # A keyframe must carry a usable position
+        if payload.get('keyframe'):
+            for field in ['x', 'y', 'direction']:
+                if field not in payload['set']:
+                    return False, f"Missing required squid field in keyframe: {field}"
+        
+        return True, None
+    
     @staticmethod
     def sanitize_object_data(objects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sanitize object data to ensure no malicious content"""
@@ -6,6 +6,11 @@ from typing import Dict, Any, Optional, List
 import logging
 import base64
 
+try:
+    from src.image_cache import ImageCache # Shared with the game so scaled squid frames are built once
+except ImportError:
+    ImageCache = None
+
 # AnimatableGraphicsItem class
 class AnimatableGraphicsItem(QtWidgets.QGraphicsPixmapItem, QtCore.QObject):
     def __init__(self, pixmap=None, parent=None):
@@ -84,6 +89,10 @@ class RemoteEntityManager:
         self.project_root = os.path.join(self.script_dir, '..', '..')
         self.images_folder_root_path = os.path.join(self.project_root, 'images')
 
+        if ImageCache is not None:
+            ImageCache.warm_up((os.path.join(self.images_folder_root_path, name), size)
+                               for name, size in self.IMAGE_DIMENSIONS.items())
+
         self.position_update_timer = QtCore.QTimer()
         self.position_update_timer.timeout.connect(self._update_visuals_once_per_second)
         self.MOVEMENT_INTERVAL_MS = 1000  # Update once per second
@@ -149,12 +158,17 @@ class RemoteEntityManager:
             if self.debug_mode: self.logger.warning(f"Image file '{image_file_name}' not in IMAGE_DIMENSIONS. Using default: {self.DEFAULT_IMAGE_DIMENSION}")
         
         image_path = os.path.join(self.images_folder_root_path, image_file_name)
-        pixmap = QtGui.QPixmap(image_path)
+        if ImageCache is not None:
+            pixmap = ImageCache.get_pixmap(image_path, (target_width, target_height))
+        else:
+            pixmap = QtGui.QPixmap(image_path)
+            if not pixmap.isNull():
+                pixmap = pixmap.scaled(target_width, target_height, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
         if pixmap.isNull():
             if self.debug_mode: self.logger.error(f"Image {image_path} not found. Fallback gray pixmap {target_width}x{target_height}.")
             fb_pixmap = QtGui.QPixmap(target_width, target_height); fb_pixmap.fill(QtCore.Qt.gray)
             return fb_pixmap, (target_width, target_height) 
-        return pixmap.scaled(target_width, target_height, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation), (target_width, target_height)
+        return pixmap, (target_width, target_height)
 
     def _update_dependent_items_position(self, remote_squid_info, new_visual_x, new_visual_y):
         if remote_squid_info.get('status_text'):
@@ -424,6 +438,36 @@ class RemoteEntityManager:
                  self.remove_remote_squid(node_id)
             return False
 
+    def apply_squid_state(self, node_id, squid_state):
+        """
+        Apply a full remote squid state (rebuilt from a keyframe/delta 'squid_state' message),
+        doing only the work for fields that differ from what is already displayed.
+        """
+        remote_squid_info = self.remote_squids.get(node_id)
+        if remote_squid_info is None:
+            if self.debug_mode: self.logger.warning(f"State for unknown {node_id}. Ignoring.")
+            return False
+        try:
+            data = remote_squid_info['data']
+            changed = {key for key, value in squid_state.items() if data.get(key) != value}
+            data.update(squid_state)
+            remote_squid_info['last_update'] = time.time()
+            if not changed:
+                return True
+
+            if changed - {'x', 'y'}:
+                # Image, status or view cone changed: take the full update path
+                self._handle_existing_squid_update(node_id, data, remote_squid_info)
+            else:
+                remote_squid_info['network_target_x'] = data.get('x')
+                remote_squid_info['network_target_y'] = data.get('y')
+                if data.get('view_cone_visible', False):
+                    self.update_remote_view_cone(node_id, data)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error apply_squid_state for {node_id}: {e}", exc_info=True)
+            return False
+
     def calculate_entry_position(self, exit_data: dict) -> tuple[float, float, str]:
         original_exit_direction = exit_data.get('direction')
         original_exit_pos_x = exit_data.get('position', {}).get('x', 0)
@@ -0,0 +1,84 @@
+# File: state_sync.py
+
+from typing import Any, Dict, Optional
+
+
+class SquidStateEncoder:
+    """
+    Turns successive local squid states into 'squid_state' payloads.
+
+    Every payload names the keyframe it is relative to ('key'). A keyframe
+    carries the whole state; in between, payloads carry only the fields that
+    differ from the keyframe, so an unchanged field costs nothing and a lost
+    packet never corrupts later ones. Multicast has no per-peer
+    acknowledgements, so keyframes are repeated every `keyframe_interval`
+    payloads and on request (e.g. when a new peer appears).
+    """
+
+    def __init__(self, keyframe_interval: int = 10):
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.keyframe: Optional[Dict[str, Any]] = None
+        self.keyframe_id = 0
+        self.since_keyframe = 0
+        self._keyframe_requested = True
+
+    def request_keyframe(self):
+        """Make the next payload a full keyframe"""
+        self._keyframe_requested = True
+
+    def encode(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        if self._keyframe_requested or self.keyframe is None or \
+           self.since_keyframe >= self.keyframe_interval or not set(self.keyframe).issuperset(state):
+            self._keyframe_requested = False
+            self.keyframe_id = (self.keyframe_id + 1) & 0xFFFFFFFF
+            self.keyframe = dict(state)
+            self.since_keyframe = 0
+            return {'key': self.keyframe_id, 'keyframe': True, 'set': dict(state)}
+
+        self.since_keyframe += 1
+        keyframe = self.keyframe
+        changed = {field: value for field, value in state.items() if keyframe[field] != value}
+        return {'key': self.keyframe_id, 'set': changed}
+
+
+class SquidStateDecoder:
+    """
+    Rebuilds remote squid states from 'squid_state' payloads, keeping the
+    latest keyframe of each node. Deltas relative to a keyframe this node
+    has not seen (late join, lost packet) are dropped until the next one.
+    A keyframe coalesced with a delta in the inbox carries it in 'delta'.
+    """
+
+    def __init__(self):
+        self.keyframes: Dict[str, tuple] = {}  # node_id -> (keyframe id, state)
+
+    def decode(self, node_id: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Full current state of `node_id`, or None if its keyframe is missing"""
+        key = payload.get('key')
+        fields = self._fields(payload.get('set'))
+        if fields is None:
+            return None
+
+        if payload.get('keyframe'):
+            self.keyframes[node_id] = (key, dict(fields))
+            state = dict(fields)
+            state.update(self._fields(payload.get('delta')) or {})
+            return state
+
+        stored = self.keyframes.get(node_id)
+        if stored is None or stored[0] != key:
+            return None
+        state = dict(stored[1])
+        state.update(fields)
+        return state
+
+    @staticmethod
+    def _fields(fields) -> Optional[Dict[str, Any]]:
+        if not isinstance(fields, dict):
+            return None
+        if isinstance(fields.get('color'), list):
+            fields = dict(fields, color=tuple(fields['color'])) # JSON turns tuples into lists
+        return fields
+
+    def forget(self, node_id: str):
+        self.keyframes.pop(node_id, None)
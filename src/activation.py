@@ -0,0 +1,86 @@
+import numpy as np
+
+
+def _linear(x):
+    return np.clip(x, -1.0, 1.0)
+
+
+def _tanh(x):
+    return np.tanh(x)
+
+
+def _sigmoid(x):
+    # Logistic curve rescaled to -1..1 so 0 input stays at rest (50)
+    return 2.0 / (1.0 + np.exp(-2.0 * x)) - 1.0
+
+
+def _relu(x):
+    return np.clip(x, 0.0, 1.0)
+
+
+class ActivationPropagator:
+    """
+    Forward propagation of neuron activations through the weight matrix.
+
+    Activations live on the usual 0-100 scale, with 50 as the resting value.
+    Each step, every neuron receives the weighted mean of its neighbours'
+    activations. Connections are undirected, as in Hebbian learning: a pair
+    feeds both ways, using the mean weight when both (a, b) and (b, a) are
+    stored, so key order never matters. Neurons with an external
+    input (the squid's stats) mix that input with the network drive scaled by
+    `coupling`; all other neurons (e.g. neurogenesis neurons) are driven by the
+    network alone. `leak` is the fraction of the old activation replaced by the
+    new one each step (1.0 = no memory of the previous tick).
+    """
+
+    ACTIVATIONS = {
+        'linear': _linear,
+        'tanh': _tanh,
+        'sigmoid': _sigmoid,
+        'relu': _relu,
+    }
+
+    def __init__(self, activation='linear', leak=0.5, coupling=0.3):
+        if activation not in self.ACTIVATIONS:
+            print(f"Unknown activation function '{activation}', using 'linear'")
+            activation = 'linear'
+        self.activation = activation
+        self.leak = min(max(float(leak), 0.0), 1.0)
+        self.coupling = float(coupling)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from a LearningConfig-style object (uses its `propagation` dict if present)"""
+        settings = getattr(config, 'propagation', None) or {}
+        return cls(settings.get('activation', 'linear'),
+                   settings.get('leak', 0.5),
+                   settings.get('coupling', 0.3))
+
+    def step(self, weights, names, inputs, previous):
+        """
+        Compute the next activation for every neuron in `names`.
+
+        weights:  WeightMatrix (or anything with a compatible matrix() method)
+        inputs:   {neuron: value} external inputs on the 0-100 scale
+        previous: {neuron: value} activations from the last step
+        Returns {neuron: value} on the 0-100 scale.
+        """
+        if not names:
+            return {}
+
+        prev = (np.array([previous.get(n, 50) for n in names], dtype=np.float64) - 50.0) / 50.0
+        has_input = np.array([n in inputs for n in names], dtype=bool)
+        external = (np.array([inputs.get(n, 50) for n in names], dtype=np.float64) - 50.0) / 50.0
+
+        # Undirected connections: symmetrise so column j holds every neighbour of neuron j
+        w = weights.matrix(names, symmetric=True)
+        w = 0.5 * (w + w.T)
+        fan_in = np.maximum(np.count_nonzero(w, axis=0), 1)
+        network = (w.T @ prev) / fan_in
+
+        drive = np.where(has_input, external + self.coupling * network, network)
+        target = self.ACTIVATIONS[self.activation](drive)
+        activation = (1.0 - self.leak) * prev + self.leak * target
+
+        values = np.clip(50.0 + 50.0 * activation, 0.0, 100.0)
+        return dict(zip(names, values.tolist()))
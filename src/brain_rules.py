@@ -0,0 +1,770 @@
+import random
+import time
+from datetime import datetime
+import numpy as np
+
+from .learning import LearningConfig
+from .weight_matrix import WeightMatrix
+from .activation import ActivationPropagator
+
+
+class BrainRules:
+    """
+    The squid brain without Qt: state updates, activation propagation,
+    Hebbian learning, neurogenesis and pruning.
+
+    BrainWidget draws this state; HeadlessBrain runs it on its own. Hosts
+    provide update() (repaint request) and relax_layout() (spread out new
+    neurons); the other hooks below are optional.
+    """
+
+    rng = random                     # Hosts may swap in a seeded random.Random
+    clock = staticmethod(time.time)
+    quiet = False                    # Skip console output (headless runs)
+    debug_mode = False
+
+    def init_brain_state(self, config=None, tamagotchi_logic=None):
+        """Neurons, weights, learning and neurogenesis state of a fresh brain"""
+        self.config = config if config else LearningConfig() #
+        if not hasattr(self.config, 'hebbian'): #
+            self.config.hebbian = { #
+                'learning_interval': 30000, #
+                'weight_decay': 0.01, #
+                'active_threshold': 50 #
+            }
+
+        self.excluded_neurons = ['is_sick', 'is_eating', 'pursuing_food', 'direction', 'is_sleeping'] #
+        self.propagator = ActivationPropagator.from_config(self.config)
+        self.activations = {}  # Propagated neuron values, read by the DecisionEngine
+        self.hebbian_countdown_seconds = 30  # Default duration
+        self.learning_active = True #
+        self.pruning_enabled = True #
+        self.is_paused = False #
+        self.last_hebbian_time = self.clock() #
+        self.last_neurogenesis_type = None
+        self.tamagotchi_logic = tamagotchi_logic #
+        self.recently_updated_neuron_pairs = [] #
+        self.neuron_shapes = {} #
+
+        # Neural communication tracking system
+        self.communication_events = {} #
+        self.weight_change_events = {} #
+        self.activity_duration = 0.5 #
+
+        # Initialize neurogenesis data
+        self.neurogenesis_data = { #
+            'novelty_counter': 0, #
+            'stress_counter': 0, #
+            'reward_counter': 0, #
+            'new_neurons': [], #
+            'last_neuron_time': self.clock(), #
+            'new_neurons_details': {} # Added to ensure it exists
+        }
+
+        # Ensure neurogenesis config exists
+        if not hasattr(self.config, 'neurogenesis'): #
+            self.config.neurogenesis = { #
+                'decay_rate': 0.75,  # Default decay rate if not specified
+                'novelty_threshold': 3.0, #
+                'stress_threshold': 1.2, #
+                'reward_threshold': 3.5, #
+                'cooldown': 180, #
+                'highlight_duration': 5.0, #
+                'max_neurons': 32
+            }
+
+        self.neurogenesis_config = self.config.neurogenesis #
+
+        # <<< MAX NEURO COUNTER VALUES >>>
+        self.max_novelty_counter = 100
+        self.max_stress_counter = 100
+        self.max_reward_counter = 100
+
+        # Neural state initialization
+        self.state = { #
+            "hunger": 50, #
+            "happiness": 50, #
+            "cleanliness": 50, #
+            "sleepiness": 50, #
+            "satisfaction": 50, #
+            "anxiety": 50, #
+            "curiosity": 50, #
+            "is_sick": False, #
+            "is_eating": False, #
+            "is_sleeping": False, #
+            "pursuing_food": False, #
+            "direction": "up", #
+            "position": (0, 0), #
+            "is_startled": False, #
+            "is_fleeing": False, #
+            'neurogenesis_active': True
+        }
+
+        # Neuron position configuration
+        self.original_neuron_positions = { #
+            "hunger": (127, 81), #
+            "happiness": (361, 81), #
+            "cleanliness": (627, 81), #
+            "sleepiness": (840, 81), #
+            "satisfaction": (271, 380), #
+            "anxiety": (491, 389), #
+            "curiosity": (701, 386) #
+        }
+        self.neuron_positions = self.original_neuron_positions.copy() #
+
+        # Set shapes for specific original neurons to 'square'
+        self.neuron_shapes["curiosity"] = 'square' #
+        self.neuron_shapes["anxiety"] = 'square' #
+        self.neuron_shapes["satisfaction"] = 'square' #
+
+        # Set shapes for other original neurons (defaults to circle if not set)
+        self.neuron_shapes["hunger"] = 'circle' #
+        self.neuron_shapes["happiness"] = 'circle' #
+        self.neuron_shapes["cleanliness"] = 'circle' #
+        self.neuron_shapes["sleepiness"] = 'circle' #
+
+        # Initialize communication events for all neurons
+        for neuron in self.neuron_positions.keys(): #
+            self.communication_events[neuron] = 0 #
+
+        # Add neurogenesis visualization tracking
+        self.neurogenesis_highlight = { #
+            'neuron': None, #
+            'start_time': 0, #
+            'duration': 5.0  # seconds
+        }
+
+        # Connection and weight initialization
+        self.connections = self.initialize_connections() #
+        self.weights = WeightMatrix()  # Dense weight store, dict-compatible
+        self.initialize_weights()  # Populate weights
+        self.frozen_weights = None #
+        self.training_data = [] #
+        self.learning_rate = 0.1 #
+        self.capture_training_data_enabled = False #
+
+        # Visual state colors
+        self.state_colors = { #
+            'is_sick': (255, 204, 204),  # Pastel red
+            'is_eating': (204, 255, 204),  # Pastel green
+            'is_sleeping': (204, 229, 255),  # Pastel blue
+            'pursuing_food': (255, 229, 204),  # Pastel orange
+            'direction': (229, 204, 255)  # Pastel purple
+        }
+
+    def _log(self, message):
+        if not self.quiet:
+            print(message)
+
+    def animate_weight_change(self, pair, neuron1, neuron2, prev_weight, new_weight, start_time):
+        """Hook for hosts that animate learning; the rules only change the weight"""
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @weights.setter
+    def weights(self, value):
+        # Plain dicts (old saves, tabs, plugins) are converted to the matrix store
+        self._weights = value if isinstance(value, WeightMatrix) else WeightMatrix(value)
+
+    def initialize_connections(self):
+        connections = []
+        neurons = list(self.neuron_positions.keys())
+        for i in range(len(neurons)):
+            for j in range(i+1, len(neurons)):
+                connections.append((neurons[i], neurons[j]))
+        return connections
+
+    def initialize_weights(self):
+        neurons = list(self.neuron_positions.keys())
+        for i in range(len(neurons)):
+            for j in range(i+1, len(neurons)):
+                self.weights[(neurons[i], neurons[j])] = self.rng.uniform(-1, 1)
+
+    def get_neuron_value(self, value):
+        """
+        Convert a neuron value to a numerical format for Hebbian learning.
+
+        Args:
+            value: The value of the neuron, which can be int, float, bool, or str.
+
+        Returns:
+            float: The numerical value of the neuron.
+        """
+        if isinstance(value, (int, float)):
+            return float(value)
+        elif isinstance(value, bool):
+            return 100.0 if value else 0.0
+        elif isinstance(value, str):
+            # For string values (like 'direction'), return a default value
+            return 75.0
+        else:
+            return 0.0
+        
+
+    def is_new_neuron(self, neuron_name, newness_duration_sec=300, now=None): # 300s = 5 minutes
+        """Check if a neuron was created within the newness duration (as of `now`, default self.clock())."""
+        # Check if it's in the primary neurogenesis data
+        if neuron_name in self.neurogenesis_data.get('new_neurons', []):
+            details = self.neurogenesis_data.get('new_neurons_details', {}).get(neuron_name)
+            if details:
+                created_at = details.get('created_at')
+                if created_at and ((self.clock() if now is None else now) - created_at) < newness_duration_sec:
+                    return True # It's new based on details
+            else:
+                 # If no details but in list, assume it might be new (fallback)
+                 # You might want to refine this based on how 'new_neurons' is managed.
+                 # For now, if it's in the list and < 5 mins, assume new.
+                 # A better check is needed if 'new_neurons' isn't pruned.
+                 # Let's rely *only* on details for a stricter check.
+                 pass
+        return False
+
+    def update_connection(self, neuron1, neuron2, value1, value2):
+        """
+        Update the connection weight between two neurons based on their activation values,
+        with modulated learning rate and extended visual animations.
+        """
+        current_time = self.clock()
+        pair = (neuron1, neuron2)
+        reverse_pair = (neuron2, neuron1)
+
+        # Check if the pair or its reverse exists in weights, if not, initialize it
+        if pair not in self.weights and reverse_pair not in self.weights:
+            # Only add if both neurons exist
+            if neuron1 in self.neuron_positions and neuron2 in self.neuron_positions:
+                self.weights[pair] = 0.0  # Start with 0 weight
+            else:
+                return  # Don't create connection if a neuron doesn't exist
+
+        # Use the correct pair order
+        use_pair = pair if pair in self.weights else reverse_pair
+        
+        # Ensure the pair still exists before proceeding (might be pruned)
+        if use_pair not in self.weights:
+            return
+
+        prev_weight = self.weights[use_pair]
+
+        # --- Learning Rate Calculation ---
+        base_lr = self.learning_rate  # Use the instance learning_rate (0.1 by default)
+        newness_boost = 2.0  # New neurons learn 2x faster
+        effective_lr = base_lr
+
+        is_n1_new = self.is_new_neuron(neuron1)
+        is_n2_new = self.is_new_neuron(neuron2)
+
+        if is_n1_new or is_n2_new:
+            effective_lr = base_lr * newness_boost
+        # --- End Learning Rate ---
+
+        # Calculate weight change (basic Hebbian)
+        weight_change = effective_lr * (value1 / 100.0) * (value2 / 100.0)
+        
+        # Add weight decay (optional but good for stability)
+        decay_rate = self.config.hebbian.get('weight_decay', 0.01) * 0.1  # Slow decay during learning
+        new_weight = prev_weight + weight_change - (prev_weight * decay_rate)
+        
+        # Clamp weight to [-1, 1] range
+        new_weight = min(max(new_weight, -1.0), 1.0)
+        self.weights[use_pair] = new_weight
+
+        # --- Extended Animation Tracking (2 seconds duration) ---
+        self.animate_weight_change(use_pair, neuron1, neuron2, prev_weight, new_weight, current_time)
+
+        # Record weight change time for both neurons
+        if abs(new_weight - prev_weight) > 0.001:  # Only if significant change
+            self.weight_change_events[neuron1] = current_time
+            self.weight_change_events[neuron2] = current_time
+            
+            # Add to recently updated for visualization/logging
+            if (neuron1, neuron2) not in self.recently_updated_neuron_pairs and \
+            (neuron2, neuron1) not in self.recently_updated_neuron_pairs:
+                self.recently_updated_neuron_pairs.append((neuron1, neuron2))
+            
+            # Trigger visual update
+            self.update()
+
+        # Record communication time for both neurons
+        self.communication_events[neuron1] = current_time
+        self.communication_events[neuron2] = current_time
+
+        # Debug output with color coding
+        lr_indicator = " (\x1b[35mBOOSTED\x1b[0m)" if effective_lr > base_lr else ""
+        direction = "\x1b[32m↑\x1b[0m" if new_weight > prev_weight else "\x1b[31m↓\x1b[0m"
+        self._log(f"\x1b[42mUpdated connection\x1b[0m {direction} between {neuron1} and {neuron2}: "
+            f"\x1b[31m{prev_weight:.3f}\x1b[0m → \x1b[32m{new_weight:.3f}\x1b[0m "
+            f"(LR: {effective_lr:.3f}{lr_indicator})")
+
+    def prune_weak_connections(self, threshold=0.05, min_age_sec=600): # Prune if < 0.05 abs weight & > 10 mins old
+        """Removes connections with absolute weight below the threshold, ignoring new neurons."""
+        if not self.pruning_enabled: # Respect the global pruning flag
+            return 0
+
+        # Don't prune connections of "new" neurons (gives them time to establish)
+        protected = [n for n in self.neurogenesis_data.get('new_neurons', [])
+                     if self.is_new_neuron(n, min_age_sec)]
+        removed = self.weights.prune(threshold, protected)
+
+        if removed:
+            self._log(f"\x1b[33mPruned {len(removed)} weak connections (Threshold: {threshold}).\x1b[0m")
+            self.update() # Update visualization if connections changed
+
+        return len(removed) # Return how many were pruned
+
+    def perform_hebbian_learning(self):
+        """Perform Hebbian learning with pre-pruning."""
+        current_time = self.clock()
+        min_interval = 5  # Minimum 5 seconds between learning operations
+
+        if hasattr(self, 'last_hebbian_time') and (current_time - self.last_hebbian_time < min_interval):
+            return
+
+        if self.is_paused:
+            return
+
+        # --- NEW: Call Connection Pruning ---
+        # Call this *before* learning to remove very weak/old connections
+        self.prune_weak_connections()
+        # ---------------------------------
+
+        self._log("  ")
+        self._log("\x1b[44mPerforming Hebbian learning...\x1b[0m")
+        self.last_hebbian_time = current_time
+
+        # Initialize the list of updated neuron pairs
+        self.recently_updated_neuron_pairs = []
+
+        # Clean up old weight change events
+        self.weight_change_events = {
+            k: v for k, v in self.weight_change_events.items()
+            if (current_time - v) < self.activity_duration
+        }
+
+        current_state = self.state  # Use the current state of the brain
+        active_neurons = self.get_active_neurons()
+
+        # If less than two neurons are active, no learning occurs
+        if len(active_neurons) < 2:
+            self._log("Not enough active neurons for Hebbian learning")
+            if hasattr(self, 'hebbian_countdown_seconds'):
+                interval_ms = self.config.hebbian.get('learning_interval', 40000)
+                self.hebbian_countdown_seconds = int(interval_ms / 1000)
+            return
+
+        # Full-coverage mode: one vectorized update over every active pair
+        if self.config.hebbian.get('full_coverage', False):
+            self.batch_hebbian_learning(active_neurons)
+            sample_size = 0
+        else:
+            # Select only 2 pairs for learning (or fewer if not enough pairs)
+            num_possible_pairs = len(active_neurons) * (len(active_neurons) - 1) // 2
+            sample_size = min(2, num_possible_pairs)
+
+        if sample_size > 0:
+            sampled_pairs_indices = self.rng.sample([(i, j) for i in range(len(active_neurons)) for j in range(i + 1, len(active_neurons))], sample_size)
+            self._log(f">> Learning on {sample_size} random neuron pairs")
+            for i, j in sampled_pairs_indices:
+                neuron1 = active_neurons[i]
+                neuron2 = active_neurons[j]
+                value1 = self.get_neuron_value(current_state.get(neuron1, 50))
+                value2 = self.get_neuron_value(current_state.get(neuron2, 50))
+                self.update_connection(neuron1, neuron2, value1, value2)
+        elif not self.config.hebbian.get('full_coverage', False):
+            self._log("No valid pairs found for Hebbian learning.")
+
+
+        # Update the brain visualization
+        self.update()
+
+        # Reset the countdown after learning
+        if hasattr(self, 'hebbian_countdown_seconds'):
+            interval_ms = self.config.hebbian.get('learning_interval', 40000)
+            self.hebbian_countdown_seconds = int(interval_ms / 1000)
+            self._log(f"Reset countdown to {self.hebbian_countdown_seconds} seconds")
+
+    def get_active_neurons(self):
+        """Neurons taking part in Hebbian learning: above the active threshold or boosted by decorations"""
+        # Determine which neurons are significantly active (excluding specified neurons)
+        active_threshold = self.config.hebbian.get('active_threshold', 50)
+        active_neurons = []
+        for neuron, value in self.state.items():
+            if neuron in self.excluded_neurons:
+                continue
+            
+            num_value = self.get_neuron_value(value) # Use helper to get numerical value
+            
+            if num_value > active_threshold:
+                active_neurons.append(neuron)
+
+        # Include decoration effects in learning (ensure manager exists)
+        decoration_memories = {}
+        if self.tamagotchi_logic and hasattr(self.tamagotchi_logic, 'squid') and hasattr(self.tamagotchi_logic.squid, 'memory_manager'):
+            decoration_memories = self.tamagotchi_logic.squid.memory_manager.get_all_short_term_memories('decorations')
+
+        if isinstance(decoration_memories, list): # Updated to handle list format
+            for memory in decoration_memories:
+                for stat, boost in memory.get('effects', {}).items():
+                    if stat in self.excluded_neurons:
+                        continue
+                    if isinstance(boost, (int, float)) and boost > 0:
+                        if stat not in active_neurons:
+                            active_neurons.append(stat)
+
+        return active_neurons
+
+    def batch_hebbian_learning(self, active_neurons, now=None):
+        """
+        Hebbian update for every pair of active neurons in one NumPy pass.
+        Same rule as update_connection (learning rate, newness boost, slow decay, clamp)
+        but without per-pair animations or console output. `now` is the time
+        of the update (default self.clock(); fast_forward passes simulated time).
+        """
+        neurons = [n for n in active_neurons if n in self.neuron_positions]
+        if len(neurons) < 2:
+            return []
+
+        current_time = self.clock() if now is None else now
+        activations = [self.get_neuron_value(self.state.get(n, 50)) for n in neurons]
+        boosted = [self.is_new_neuron(n, now=current_time) for n in neurons]
+        decay_rate = self.config.hebbian.get('weight_decay', 0.01) * 0.1
+
+        updated = self.weights.hebbian_update(neurons, activations, self.learning_rate, decay_rate,
+                                              boosted=boosted, boost=2.0)
+
+        self.recently_updated_neuron_pairs = updated
+        for neuron in neurons:
+            self.weight_change_events[neuron] = current_time
+            self.communication_events[neuron] = current_time
+
+        if self.debug_mode:
+            self._log(f">> Batch Hebbian learning updated {len(updated)} connections across {len(neurons)} active neurons")
+        return updated
+
+    def log_neurogenesis_event(self, neuron_name, event_type, reason=None, details=None):
+        """Log neurogenesis events in a human-readable paragraph format."""
+        
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        log_entry = ""
+
+        if event_type == "created" and details:
+            neuron_type = details.get("trigger_type")
+            trigger_value = details.get("trigger_value", 0.0)
+
+            if not neuron_type:
+                return # Cannot log without a neuron type
+
+            # General creation message
+            log_entry += f"{timestamp} - a {neuron_type.upper()} neuron ({neuron_name}) was created because {neuron_type} counter was {trigger_value:.2f}\n"
+
+            # Specific details for stress neurons
+            if neuron_type == "stress":
+                log_entry += "An inhibitory connection was made to ANXIETY\n"
+                log_entry += "Maximum anxiety value has been permanently reduced by 10\n"
+
+        elif event_type == "pruned":
+            # A more consistent format for pruned events
+            timestamp_full = datetime.now().strftime("%H:%M:%S")
+            log_entry = f"{timestamp_full} - a neuron ({neuron_name}) was PRUNED due to {reason if reason else 'unknown reason'}\n"
+
+        if log_entry:
+            try:
+                with open('neurogenesis_log.txt', 'a', encoding='utf-8') as f:
+                    f.write(log_entry)
+                    # Always add the separator after an entry
+                    f.write("\n-------------------------------\n\n")
+            except Exception as e:
+                self._log(f"\x1b[31mNeurogenesis logging failed: {str(e)}\x1b[0m")
+
+    def update_state(self, new_state, now=None):
+        """Apply one tick of squid state; `now` defaults to self.clock() (fast_forward passes simulated time)"""
+        if self.is_paused:
+            return
+
+        current_time = self.clock() if now is None else now
+
+        excluded_from_direct_update = ['is_sick', 'is_eating', 'pursuing_food', 'direction', 'is_sleeping', 'is_startled', 'is_fleeing']
+        for key in self.state.keys():
+            if key in new_state and key not in excluded_from_direct_update:
+                self.state[key] = new_state[key]
+
+        binary_states_to_update = ['is_eating', 'pursuing_food', 'is_fleeing', 'is_startled', 'is_sleeping', 'is_sick']
+        for b_state in binary_states_to_update:
+            if b_state in new_state:
+                self.state[b_state] = new_state[b_state]
+
+        if not hasattr(self, 'neurogenesis_data') or self.neurogenesis_data is None:
+            self.neurogenesis_data = {'novelty_counter': 0, 'stress_counter': 0, 'reward_counter': 0, 'new_neurons': [], 'last_neuron_time': current_time - self.neurogenesis_config.get('cooldown', 300), 'new_neurons_details': {}}
+        
+        for counter_key in ['novelty_counter', 'stress_counter', 'reward_counter']:
+            if counter_key not in self.neurogenesis_data:
+                self.neurogenesis_data[counter_key] = 0
+        if 'last_neuron_time' not in self.neurogenesis_data:
+            self.neurogenesis_data['last_neuron_time'] = current_time - self.neurogenesis_config.get('cooldown', 300)
+
+        self.propagate_activations(new_state)
+
+        if new_state.get('novelty_exposure', 0) > 0: self.neurogenesis_data['novelty_counter'] += new_state.get('novelty_exposure', 0)
+        if new_state.get('sustained_stress', 0) > 0: self.neurogenesis_data['stress_counter'] += new_state.get('sustained_stress', 0)
+        if new_state.get('recent_rewards', 0) > 0: self.neurogenesis_data['reward_counter'] += new_state.get('recent_rewards', 0)
+
+        self.neurogenesis_data['novelty_counter'] = min(self.neurogenesis_data['novelty_counter'], self.max_novelty_counter)
+        self.neurogenesis_data['stress_counter'] = min(self.neurogenesis_data['stress_counter'], self.max_stress_counter)
+        self.neurogenesis_data['reward_counter'] = min(self.neurogenesis_data['reward_counter'], self.max_reward_counter)
+
+        if new_state.get('_debug_forced_neurogenesis', False):
+            if self.check_neurogenesis(new_state):
+                self.update()
+                return
+
+        if hasattr(self, 'last_weight_decay_time'):
+            if current_time - self.last_weight_decay_time > 60:
+                self.weights.scale(1.0 - self.config.hebbian.get('weight_decay', 0.01))
+                self.last_weight_decay_time = current_time
+        else:
+            self.last_weight_decay_time = current_time
+
+        novelty_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('novelty_threshold', 3), 'novelty')
+        stress_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('stress_threshold', 0.7), 'stress')
+        reward_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('reward_threshold', 0.6), 'reward')
+        
+        max_neurons = self.neurogenesis_config.get('max_neurons', 32)
+        current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
+        cooldown_ok = current_time - self.neurogenesis_data.get('last_neuron_time', 0) > self.neurogenesis_config.get('cooldown', 300)
+
+        potential_triggers = []
+        if self.neurogenesis_data['novelty_counter'] > novelty_threshold: potential_triggers.append(('novelty', self.neurogenesis_data['novelty_counter']))
+        if self.neurogenesis_data['stress_counter'] > stress_threshold: potential_triggers.append(('stress', self.neurogenesis_data['stress_counter']))
+        if self.neurogenesis_data['reward_counter'] > reward_threshold: potential_triggers.append(('reward', self.neurogenesis_data['reward_counter']))
+
+        neuron_type_to_create = None
+        if potential_triggers and cooldown_ok and (not self.pruning_enabled or current_neuron_count < max_neurons):
+            neuron_type_to_create, trigger_value = max(potential_triggers, key=lambda item: item[1])
+            
+            # Start of Bugfix
+            new_neuron_name = self._create_neuron_internal(neuron_type_to_create, new_state, trigger_value_for_log=trigger_value)
+            if new_neuron_name:
+                self.neurogenesis_highlight = {'neuron': new_neuron_name, 'start_time': self.clock(), 'duration': self.neurogenesis_config.get('highlight_duration', 5.0)}
+                self.last_neurogenesis_type = neuron_type_to_create
+                self.neurogenesis_data['last_neuron_time'] = current_time
+
+                # Reset counter AFTER creation
+                if neuron_type_to_create == 'reward': self.neurogenesis_data['reward_counter'] = 0
+                elif neuron_type_to_create == 'novelty': self.neurogenesis_data['novelty_counter'] = 0
+                elif neuron_type_to_create == 'stress':
+                    self.neurogenesis_data['stress_counter'] = 0
+                    if 'anxiety' in self.state: self.state['anxiety'] = max(0, self.state['anxiety'] - 10)
+                self.update()
+            else:
+                self.last_neurogenesis_type = None
+            # End of Bugfix
+
+        if self.pruning_enabled:
+            prune_threshold_percent = int(max_neurons * 0.95)
+            if current_neuron_count > prune_threshold_percent:
+                prune_chance = (current_neuron_count - prune_threshold_percent) / (max_neurons - prune_threshold_percent)
+                if self.rng.random() < prune_chance: self.prune_weak_neurons()
+
+        decay_rate = self.neurogenesis_config.get('decay_rate', 0.90)
+        self.neurogenesis_data['novelty_counter'] *= decay_rate
+        self.neurogenesis_data['stress_counter'] *= decay_rate
+        self.neurogenesis_data['reward_counter'] *= decay_rate
+
+        self.update()
+        if self.capture_training_data_enabled: self.capture_training_data(new_state)
+
+    def propagate_activations(self, new_state):
+        """
+        Run one forward propagation step through the weight matrix.
+        Stat-driven neurons keep showing the squid's stats in self.state; neurons
+        without an external input (neurogenesis neurons) take the propagated value.
+        """
+        settings = getattr(self.config, 'propagation', None) or {}
+        if not settings.get('enabled', False):
+            return self.activations
+
+        names = [n for n in self.neuron_positions
+                 if n not in self.excluded_neurons
+                 and isinstance(self.state.get(n), (int, float)) and not isinstance(self.state.get(n), bool)]
+        inputs = {n: new_state[n] for n in names
+                  if isinstance(new_state.get(n), (int, float)) and not isinstance(new_state.get(n), bool)}
+        previous = {n: self.activations.get(n, self.state.get(n, 50)) for n in names}
+
+        self.activations = self.propagator.step(self.weights, names, inputs, previous)
+        for neuron, value in self.activations.items():
+            if neuron not in inputs:
+                self.state[neuron] = value
+        return self.activations
+
+    def check_neurogenesis(self, state):
+        """Check conditions for neurogenesis and create new neurons when triggered."""
+        current_time = self.clock()
+        if hasattr(self, 'pruning_enabled') and self.pruning_enabled:
+            max_neurons = self.neurogenesis_config.get('max_neurons', 32)
+            current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
+            if current_neuron_count >= max_neurons:
+                return False
+
+        cooldown = self.neurogenesis_config.get('cooldown', 300)
+        if current_time - self.neurogenesis_data.get('last_neuron_time', 0) <= cooldown:
+            return False
+
+        def get_personality_modifier(personality, trigger_type):
+            modifiers = {'timid': {'novelty': 1.2, 'stress': 0.8}, 'adventurous': {'novelty': 0.8, 'stress': 1.2}, 'greedy': {'novelty': 1.0, 'stress': 1.0}, 'stubborn': {'novelty': 1.1, 'stress': 0.9}}
+            personality_str = getattr(personality, 'value', str(personality)).lower()
+            return modifiers.get(personality_str, {}).get(trigger_type, 1.0)
+        personality_modifier = getattr(self, 'get_personality_modifier', get_personality_modifier)
+
+        novelty_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('novelty_threshold', 3), 'novelty')
+        stress_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('stress_threshold', 0.7), 'stress')
+        reward_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('reward_threshold', 0.6), 'reward')
+
+        created = False
+        triggers = [
+            ('reward', state.get('recent_rewards', 0), reward_threshold, 1.0),
+            ('novelty', state.get('novelty_exposure', 0), novelty_threshold, personality_modifier(state.get('personality'), 'novelty')),
+            ('stress', state.get('sustained_stress', 0), stress_threshold, personality_modifier(state.get('personality'), 'stress')),
+        ]
+
+        for n_type, val, thresh, mod in triggers:
+            if val > (thresh * mod):
+                new_neuron = self._create_neuron_internal(n_type, state)
+                if new_neuron:
+                    created = True
+                    break
+        
+        if created:
+            self.neurogenesis_data['last_neuron_time'] = current_time
+            if hasattr(self, 'pruning_enabled') and self.pruning_enabled:
+                current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
+                max_neurons = self.neurogenesis_config.get('max_neurons', 32)
+                if current_neuron_count > max_neurons * 0.8 and self.rng.random() < ((current_neuron_count - (max_neurons*0.8))/(max_neurons*0.2)):
+                    self.prune_weak_neurons()
+        return created
+
+    def get_adjusted_threshold(self, base_threshold, trigger_type):
+        """Scale threshold based on network size to prevent runaway neurogenesis"""
+        original_count = len(self.original_neuron_positions)
+        current_count = len(self.neuron_positions) - len(self.excluded_neurons)
+        new_neuron_count = current_count - original_count
+        baseline = original_count + 3
+        if new_neuron_count <= 0 or current_count <= baseline:
+            return base_threshold
+        scaling_factors = {'novelty': 0.25, 'stress': 0.1, 'reward': 0.08}
+        scaling_factor = scaling_factors.get(trigger_type, 0.15)
+        multiplier = 1.0 + (scaling_factor * (new_neuron_count - baseline + 1))
+        adjusted = base_threshold * multiplier
+        return adjusted
+
+    def prune_weak_neurons(self):
+        """Remove weakly connected or inactive neurons to maintain network stability"""
+        min_neurons = len(self.original_neuron_positions)
+        current_count = len(self.neuron_positions) - len(self.excluded_neurons)
+        if current_count <= min_neurons:
+            return False
+
+        candidates = []
+        for neuron in list(self.neuron_positions.keys()):
+            if neuron in self.original_neuron_positions or neuron in self.excluded_neurons:
+                continue
+            connections = self.weights.connection_strengths(neuron)
+            activity = self.state.get(neuron, 0)
+            activity_score = 0 if isinstance(activity, bool) else abs(activity - 50)
+            if not connections or sum(connections) / len(connections) < 0.2:
+                candidates.append((neuron, 1))
+            elif activity_score < 10:
+                candidates.append((neuron, 2))
+        candidates.sort(key=lambda x: x[1])
+
+        if candidates:
+            neuron_to_remove = candidates[0][0]
+            if neuron_to_remove in self.neuron_positions: del self.neuron_positions[neuron_to_remove]
+            if neuron_to_remove in self.state: del self.state[neuron_to_remove]
+            self.weights.remove_neuron(neuron_to_remove)
+            if neuron_to_remove in self.neurogenesis_data.get('new_neurons', []):
+                self.neurogenesis_data['new_neurons'].remove(neuron_to_remove)
+            reason = "weak connections/activity"
+            self.log_neurogenesis_event(neuron_to_remove, "pruned", reason)
+            return True
+        return False
+
+    def _create_neuron_internal(self, neuron_type, state, trigger_value_for_log=None):
+        """Create a new neuron with complete state initialization and contextual connections."""
+        current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
+        max_neurons_config = self.neurogenesis_config.get('max_neurons', 32)
+        if self.pruning_enabled and current_neuron_count >= max_neurons_config:
+            self._log(f"\x1b[33mNeurogenesis blocked: Max neuron limit ({max_neurons_config}) reached.\x1b[0m")
+            return None
+
+        base_name = {'novelty': 'novel', 'stress': 'stress', 'reward': 'reward'}[neuron_type]
+        new_name_index = len([n for n in self.neuron_positions if n.startswith(base_name)])
+        new_name = f"{base_name}_{new_name_index}"
+        
+        active_neurons_pos = sorted([(k, v, self.neuron_positions[k]) for k, v in self.state.items() if isinstance(v, (int, float)) and k in self.neuron_positions and k not in self.excluded_neurons], key=lambda x: x[1], reverse=True)
+        base_x, base_y = active_neurons_pos[0][2] if active_neurons_pos else (600, 300)
+        self.neuron_positions[new_name] = (base_x + self.rng.randint(-50, 50), base_y + self.rng.randint(-50, 50))
+
+        cfg_appearance = self.config.neurogenesis.get('appearance', {})
+        cfg_colors = cfg_appearance.get('colors', {})
+        cfg_shapes = cfg_appearance.get('shapes', {})
+        self.state.setdefault(new_name, 50)
+        default_colors = {'novelty': (255, 255, 150), 'stress': (255, 150, 150), 'reward': (173, 216, 230)}
+        self.state_colors[new_name] = tuple(cfg_colors.get(neuron_type, default_colors.get(neuron_type, (200, 200, 200))))
+        default_shapes = {'novelty': 'diamond', 'stress': 'square', 'reward': 'triangle'}
+        self.neuron_shapes[new_name] = cfg_shapes.get(neuron_type, default_shapes.get(neuron_type, 'circle'))
+        self.communication_events[new_name] = self.clock()
+
+        # --- START FIX: Add default connections for all neuron types ---
+        default_weights = {
+            'novelty': {'curiosity': 0.6, 'anxiety': -0.4},
+            'stress': {'anxiety': -0.7, 'happiness': 0.3},
+            'reward': {'satisfaction': 0.8, 'happiness': 0.5}
+        }
+        
+        # Check if the neuron_type has predefined connections
+        if neuron_type in default_weights:
+            # Create connections to the specified target neurons
+            for target, weight in default_weights[neuron_type].items():
+                if target in self.neuron_positions:
+                    self.weights[(new_name, target)] = weight
+                    self.weights[(target, new_name)] = weight * 0.5  # Weaker reciprocal connection
+                    self.communication_events[target] = self.clock() # Highlight target neuron
+        # --- END FIX ---
+        
+        trigger_reason_value = trigger_value_for_log if trigger_value_for_log is not None else state.get({'novelty': 'novelty_exposure', 'stress': 'sustained_stress', 'reward': 'recent_rewards'}[neuron_type], 0)
+        
+        log_creation_details = {"trigger_type": neuron_type, "trigger_value": round(trigger_reason_value, 2), "context": ""}
+        self.log_neurogenesis_event(new_name, "created", details=log_creation_details)
+        self.relax_layout()
+        return new_name
+
+    def update_weights(self):
+        """
+        Update weights by adding small random noise. 
+        WARNING: This adds noise and might counteract Hebbian learning.
+        Consider disabling or further reducing noise if learning seems unstable.
+        """
+        if self.frozen_weights is not None:
+            return
+
+        # Add a very small amount of noise/drift, then clamp to [-1, 1]
+        # (the generator is seeded from self.rng so --seed runs repeat exactly)
+        noise_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.weights.add_noise(-0.01, 0.01, noise_rng) # Reduced noise
+        self.weights.clamp(-1, 1)
+
+    def strengthen_connection(self, neuron1, neuron2, amount):
+        pair = (neuron1, neuron2)
+        reverse_pair = (neuron2, neuron1)
+        if pair not in self.weights and reverse_pair not in self.weights:
+            self.weights[pair] = 0.0
+        use_pair = pair if pair in self.weights else reverse_pair
+        self.weights[use_pair] += amount
+        self.weights[use_pair] = max(-1, min(1, self.weights[use_pair]))
+        self.update()
+
+    def capture_training_data(self, state):
+        training_sample = [state[neuron] for neuron in self.neuron_positions.keys()]
+        self.training_data.append(training_sample)
+        self._log(f"Captured training data: {training_sample}")
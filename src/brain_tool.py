@@ -1804,14 +1804,19 @@ class SquidBrainWindow(QtWidgets.QMainWindow):
             max_weight = max(abs(w) for w in weights.values()) if weights else 1.0
             max_weight = max(max_weight, 0.01)  # Prevent division by zero
 
+            # Get weight values (check both direction permutations) in a single lookup
+            if hasattr(weights, 'matrix'):
+                grid = weights.matrix(neurons)
+            else:
+                grid = [[weights.get((src, dst), weights.get((dst, src), 0)) for dst in neurons] for src in neurons]
+
             # Create heatmap grid
             for i, src in enumerate(neurons):
                 for j, dst in enumerate(neurons):
                     if src == dst:
                         continue
-                        
-                    # Get weight value (check both direction permutations)
-                    weight = weights.get((src, dst), weights.get((dst, src), 0))
+
+                    weight = float(grid[i][j])
                     
                     # Calculate color intensity
                     intensity = min(abs(weight) / max_weight, 1.0)
@@ -2572,8 +2577,8 @@ class NeuronInspector(QtWidgets.QDialog):
         # --- Connections Tab Data ---
         self.connections_table.setRowCount(0) # Clear previous
         connections_data = []
-        # Ensure brain_widget.weights exists and is a dictionary
-        if hasattr(self.brain_widget, 'weights') and isinstance(self.brain_widget.weights, dict):
+        # Ensure brain_widget.weights exists and is a mapping (dict or WeightMatrix)
+        if hasattr(self.brain_widget, 'weights') and hasattr(self.brain_widget.weights, 'items'):
             for conn_key, weight_val in self.brain_widget.weights.items():
                 # Ensure conn_key is a tuple of two strings (neuron names)
                 if isinstance(conn_key, tuple) and len(conn_key) == 2:
@@ -9,165 +9,51 @@ import json
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtWidgets import QSplitter
 from PyQt5.QtGui import QPixmap, QFont
-from datetime import datetime
 
 from .personality import Personality
-from .learning import LearningConfig
+from .brain_rules import BrainRules
+from .neuron_layout import ForceLayout
 
-class BrainWidget(QtWidgets.QWidget):
+class BrainWidget(BrainRules, QtWidgets.QWidget):
     neuronClicked = QtCore.pyqtSignal(str)
 
     def __init__(self, config=None, debug_mode=False, tamagotchi_logic=None):
         self.resolution_scale = 1.0  # Default resolution scale
-        self.config = config if config else LearningConfig() #
-        if not hasattr(self.config, 'hebbian'): #
-            self.config.hebbian = { #
-                'learning_interval': 30000, #
-                'weight_decay': 0.01, #
-                'active_threshold': 50 #
-            }
         super().__init__() #
-
-        self.excluded_neurons = ['is_sick', 'is_eating', 'pursuing_food', 'direction', 'is_sleeping'] #
-        self.hebbian_countdown_seconds = 30  # Default duration
-        self.learning_active = True #
-        self.pruning_enabled = True #
+        self.init_brain_state(config, tamagotchi_logic)
         self.debug_mode = debug_mode  # Initialize debug_mode
-        self.is_paused = False #
-        self.last_hebbian_time = time.time() #
-        self.last_neurogenesis_type = None
-        self.tamagotchi_logic = tamagotchi_logic #
-        self.recently_updated_neuron_pairs = [] #
-        self.neuron_shapes = {} #
-
-        # Neural communication tracking system
-        self.communication_events = {} #
         self.communication_highlight_duration = 0.5 #
-        self.weight_change_events = {} #
-        self.activity_duration = 0.5 #
-
-        # Initialize neurogenesis data
-        self.neurogenesis_data = { #
-            'novelty_counter': 0, #
-            'stress_counter': 0, #
-            'reward_counter': 0, #
-            'new_neurons': [], #
-            'last_neuron_time': time.time(), #
-            'new_neurons_details': {} # Added to ensure it exists
-        }
-
-        # Ensure neurogenesis config exists
-        if not hasattr(self.config, 'neurogenesis'): #
-            self.config.neurogenesis = { #
-                'decay_rate': 0.75,  # Default decay rate if not specified
-                'novelty_threshold': 3.0, #
-                'stress_threshold': 1.2, #
-                'reward_threshold': 3.5, #
-                'cooldown': 180, #
-                'highlight_duration': 5.0, #
-                'max_neurons': 32
-            }
-
-        self.neurogenesis_config = self.config.neurogenesis #
-
-        # <<< MAX NEURO COUNTER VALUES >>>
-        self.max_novelty_counter = 100
-        self.max_stress_counter = 100
-        self.max_reward_counter = 100
-
-        # Neural state initialization
-        self.state = { #
-            "hunger": 50, #
-            "happiness": 50, #
-            "cleanliness": 50, #
-            "sleepiness": 50, #
-            "satisfaction": 50, #
-            "anxiety": 50, #
-            "curiosity": 50, #
-            "is_sick": False, #
-            "is_eating": False, #
-            "is_sleeping": False, #
-            "pursuing_food": False, #
-            "direction": "up", #
-            "position": (0, 0), #
-            "is_startled": False, #
-            "is_fleeing": False, #
-            'neurogenesis_active': True
-        }
-
-        # Neuron position configuration
-        self.original_neuron_positions = { #
-            "hunger": (127, 81), #
-            "happiness": (361, 81), #
-            "cleanliness": (627, 81), #
-            "sleepiness": (840, 81), #
-            "satisfaction": (271, 380), #
-            "anxiety": (491, 389), #
-            "curiosity": (701, 386) #
-        }
-        self.neuron_positions = self.original_neuron_positions.copy() #
-
-        # Set shapes for specific original neurons to 'square'
-        self.neuron_shapes["curiosity"] = 'square' #
-        self.neuron_shapes["anxiety"] = 'square' #
-        self.neuron_shapes["satisfaction"] = 'square' #
-
-        # Set shapes for other original neurons (defaults to circle if not set)
-        self.neuron_shapes["hunger"] = 'circle' #
-        self.neuron_shapes["happiness"] = 'circle' #
-        self.neuron_shapes["cleanliness"] = 'circle' #
-        self.neuron_shapes["sleepiness"] = 'circle' #
-
-        # Initialize communication events for all neurons
-        for neuron in self.neuron_positions.keys(): #
-            self.communication_events[neuron] = 0 #
 
         # Animation control variables
         self.animation_timer = QtCore.QTimer(self)
         self.animation_timer.timeout.connect(self.update_animations)
         self.animation_timer.start(50)  # 20 FPS
         self.neuron_sizes = {}  # For smooth size transitions
+        # Background, indicators, neurons and idle connections are rendered into
+        # this pixmap and redrawn only when the key describing them changes
+        self._static_layer = None
+        self._static_layer_key = None
+        self._static_layer_transform = (0, 1.0)  # (top offset, scale) of the neuron area
+        self._overlay_drawn = False
+
+        # Force-directed layout, relaxed a few steps per frame after neurons are added or dragged
+        self.layout_engine = ForceLayout()
+        self.layout_timer = QtCore.QTimer(self)
+        self.layout_timer.timeout.connect(self._relax_layout_step)
+        self._layout_steps_left = 0
+        self.layout_frame_budget = 0.004  # Seconds of layout work per timer tick
         self.weight_animations = []  # Track multiple weight changes
-        self.neurogenesis_highlight = {
-            'neuron': None,
-            'start_time': 0,
-            'duration': 5.0,
-            'pulse_phase': 0
-        }
-
-        # Add neurogenesis visualization tracking
-        self.neurogenesis_highlight = { #
-            'neuron': None, #
-            'start_time': 0, #
-            'duration': 5.0  # seconds
-        }
+        self.weight_animation_index = {}  # (source, target) -> animation drawn for that connection
 
-        # Connection and weight initialization
-        self.connections = self.initialize_connections() #
-        self.weights = {}  # Initialize empty dictionary for weights
-        self.initialize_weights()  # Populate weights
         self.show_links = True #
-        self.frozen_weights = None #
         self.history = [] #
-        self.training_data = [] #
         self.associations = np.zeros((len(self.neuron_positions), len(self.neuron_positions))) #
-        self.learning_rate = 0.1 #
-        self.capture_training_data_enabled = False #
         self.dragging = False #
         self.dragged_neuron = None #
         self.drag_start_pos = None #
         self.setMouseTracking(True) #
         self.show_weights = False #
 
-        # Visual state colors
-        self.state_colors = { #
-            'is_sick': (255, 204, 204),  # Pastel red
-            'is_eating': (204, 255, 204),  # Pastel green
-            'is_sleeping': (204, 229, 255),  # Pastel blue
-            'pursuing_food': (255, 229, 204),  # Pastel orange
-            'direction': (229, 204, 255)  # Pastel purple
-        }
-
 
     def set_debug_mode(self, enabled):
         """Set debug mode without causing circular callbacks"""
@@ -196,7 +82,11 @@ class BrainWidget(QtWidgets.QWidget):
         print(f"Brain window debug mode set to: {enabled}")
 
     def update_animations(self):
-        """Update all animation states"""
+        """Update all animation states and repaint only when something changed"""
+        if not self.isVisible():
+            self.animation_timer.stop()  # showEvent starts it again
+            return
+
         current_time = time.time()
         
         # Update neurogenesis pulse phase
@@ -207,13 +97,75 @@ class BrainWidget(QtWidgets.QWidget):
             else:
                 self.neurogenesis_highlight['neuron'] = None
         
-        # Update weight animations
+        # Update weight animations; the oldest running one of each pair is drawn
         self.weight_animations = [
             anim for anim in self.weight_animations 
             if current_time - anim['start_time'] < anim['duration']
         ]
-        
-        self.update()
+        self.weight_animation_index = {}
+        for anim in self.weight_animations:
+            self.weight_animation_index.setdefault(anim['pair'], anim)
+
+        sizes_changed = self._advance_neuron_sizes()
+        if (sizes_changed or self._overlay_drawn or self._has_active_overlays(current_time) or
+                self._static_layer_key != self._compute_static_layer_key()):
+            self.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.animation_timer.isActive():
+            self.animation_timer.start(50)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.animation_timer.stop()
+
+    def _target_neuron_size(self, name):
+        value = self.get_neuron_value(self.state.get(name, 50))
+        return 25.0 * (0.8 + 0.4 * (abs(value - 50) / 50))
+
+    def _advance_neuron_sizes(self):
+        """Ease neuron sizes toward their activity-based size; True if any changed"""
+        changed = False
+        for name in self.neuron_positions:
+            if name in self.excluded_neurons:
+                continue
+            target_size = self._target_neuron_size(name)
+            current_size = self.neuron_sizes.get(name)
+            if current_size is None or abs(target_size - current_size) < 0.05:
+                new_size = target_size
+            else:
+                new_size = current_size + (target_size - current_size) * 0.2
+            if new_size != current_size:
+                self.neuron_sizes[name] = new_size
+                changed = True
+        return changed
+
+    def _has_active_overlays(self, current_time):
+        """True while anything drawn on top of the static layer is animating"""
+        if self.weight_animations or (self.dragging and self.dragged_neuron):
+            return True
+        highlight = self.neurogenesis_highlight
+        if highlight.get('neuron') and current_time - highlight.get('start_time', 0) < highlight.get('duration', 0):
+            return True
+        return any(current_time - event_time < self.activity_duration
+                   for event_time in self.communication_events.values())
+
+    def _compute_static_layer_key(self):
+        """Everything the static layer depends on; a different key means it must be redrawn"""
+        weights = self._weights
+        return (
+            self.width(), self.height(), self.devicePixelRatioF(),
+            id(weights), getattr(weights, 'version', None),
+            tuple(self.neuron_positions.items()),
+            tuple(self.excluded_neurons),
+            tuple(self.neuron_shapes.items()),
+            tuple(self.state_colors.items()),
+            tuple(self.neuron_sizes.items()),
+            self.show_links, self.show_weights,
+            tuple(text for text, _ in self._active_indicators()),
+            frozenset(self.weight_animation_index),
+        )
 
     def toggle_pruning(self, enabled):
         """Enable or disable the pruning mechanisms for neurogenesis"""
@@ -245,98 +197,10 @@ class BrainWidget(QtWidgets.QWidget):
         self.is_paused = False
         print(f"++ Hebbian learning started for {duration_seconds} seconds")
 
-    def get_neuron_value(self, value):
-        """
-        Convert a neuron value to a numerical format for Hebbian learning.
-
-        Args:
-            value: The value of the neuron, which can be int, float, bool, or str.
-
-        Returns:
-            float: The numerical value of the neuron.
-        """
-        if isinstance(value, (int, float)):
-            return float(value)
-        elif isinstance(value, bool):
-            return 100.0 if value else 0.0
-        elif isinstance(value, str):
-            # For string values (like 'direction'), return a default value
-            return 75.0
-        else:
-            return 0.0
-        
-    def is_new_neuron(self, neuron_name, newness_duration_sec=300): # 300s = 5 minutes
-        """Check if a neuron was created within the newness duration."""
-        # Check if it's in the primary neurogenesis data
-        if neuron_name in self.neurogenesis_data.get('new_neurons', []):
-            details = self.neurogenesis_data.get('new_neurons_details', {}).get(neuron_name)
-            if details:
-                created_at = details.get('created_at')
-                if created_at and (time.time() - created_at) < newness_duration_sec:
-                    return True # It's new based on details
-            else:
-                 # If no details but in list, assume it might be new (fallback)
-                 # You might want to refine this based on how 'new_neurons' is managed.
-                 # For now, if it's in the list and < 5 mins, assume new.
-                 # A better check is needed if 'new_neurons' isn't pruned.
-                 # Let's rely *only* on details for a stricter check.
-                 pass
-        return False
-
-
-    def update_connection(self, neuron1, neuron2, value1, value2):
-        """
-        Update the connection weight between two neurons based on their activation values,
-        with modulated learning rate and extended visual animations.
-        """
-        current_time = time.time()
-        pair = (neuron1, neuron2)
-        reverse_pair = (neuron2, neuron1)
-
-        # Check if the pair or its reverse exists in weights, if not, initialize it
-        if pair not in self.weights and reverse_pair not in self.weights:
-            # Only add if both neurons exist
-            if neuron1 in self.neuron_positions and neuron2 in self.neuron_positions:
-                self.weights[pair] = 0.0  # Start with 0 weight
-            else:
-                return  # Don't create connection if a neuron doesn't exist
-
-        # Use the correct pair order
-        use_pair = pair if pair in self.weights else reverse_pair
-        
-        # Ensure the pair still exists before proceeding (might be pruned)
-        if use_pair not in self.weights:
-            return
-
-        prev_weight = self.weights[use_pair]
-
-        # --- Learning Rate Calculation ---
-        base_lr = self.learning_rate  # Use the instance learning_rate (0.1 by default)
-        newness_boost = 2.0  # New neurons learn 2x faster
-        effective_lr = base_lr
-
-        is_n1_new = self.is_new_neuron(neuron1)
-        is_n2_new = self.is_new_neuron(neuron2)
-
-        if is_n1_new or is_n2_new:
-            effective_lr = base_lr * newness_boost
-        # --- End Learning Rate ---
-
-        # Calculate weight change (basic Hebbian)
-        weight_change = effective_lr * (value1 / 100.0) * (value2 / 100.0)
-        
-        # Add weight decay (optional but good for stability)
-        decay_rate = self.config.hebbian.get('weight_decay', 0.01) * 0.1  # Slow decay during learning
-        new_weight = prev_weight + weight_change - (prev_weight * decay_rate)
-        
-        # Clamp weight to [-1, 1] range
-        new_weight = min(max(new_weight, -1.0), 1.0)
-        self.weights[use_pair] = new_weight
-
-        # --- Extended Animation Tracking (2 seconds duration) ---
-        self.weight_animations.append({
-            'pair': use_pair,
-            'start_time': current_time,
+    def animate_weight_change(self, pair, neuron1, neuron2, prev_weight, new_weight, start_time):
+        animation = {
+            'pair': pair,
+            'start_time': start_time,
             'duration': 2.0,  # Extended to 2 seconds duration
             'start_weight': prev_weight,
             'end_weight': new_weight,
@@ -344,161 +208,9 @@ class BrainWidget(QtWidgets.QWidget):
             'neuron2': neuron2,
             'color': (0, 255, 0) if new_weight > prev_weight else (255, 0, 0),
             'pulse_speed': 0.5  # Slower pulse for longer duration
-        })
-
-        # Record weight change time for both neurons
-        if abs(new_weight - prev_weight) > 0.001:  # Only if significant change
-            self.weight_change_events[neuron1] = current_time
-            self.weight_change_events[neuron2] = current_time
-            
-            # Add to recently updated for visualization/logging
-            if (neuron1, neuron2) not in self.recently_updated_neuron_pairs and \
-            (neuron2, neuron1) not in self.recently_updated_neuron_pairs:
-                self.recently_updated_neuron_pairs.append((neuron1, neuron2))
-            
-            # Trigger visual update
-            self.update()
-
-        # Record communication time for both neurons
-        self.communication_events[neuron1] = current_time
-        self.communication_events[neuron2] = current_time
-
-        # Debug output with color coding
-        lr_indicator = " (\x1b[35mBOOSTED\x1b[0m)" if effective_lr > base_lr else ""
-        direction = "\x1b[32m↑\x1b[0m" if new_weight > prev_weight else "\x1b[31m↓\x1b[0m"
-        print(f"\x1b[42mUpdated connection\x1b[0m {direction} between {neuron1} and {neuron2}: "
-            f"\x1b[31m{prev_weight:.3f}\x1b[0m → \x1b[32m{new_weight:.3f}\x1b[0m "
-            f"(LR: {effective_lr:.3f}{lr_indicator})")
-
-    def prune_weak_connections(self, threshold=0.05, min_age_sec=600): # Prune if < 0.05 abs weight & > 10 mins old
-        """Removes connections with absolute weight below the threshold, ignoring new neurons."""
-        if not self.pruning_enabled: # Respect the global pruning flag
-            return 0
-
-        current_time = time.time()
-        to_delete = []
-
-        # Iterate over a copy of keys to allow deletion during iteration
-        for pair, weight in list(self.weights.items()):
-            # Ensure pair is a valid tuple
-            if not (isinstance(pair, tuple) and len(pair) == 2):
-                # print(f"Skipping invalid weight key during pruning: {pair}") # Optional Debug
-                continue
-
-            neuron1, neuron2 = pair
-
-            # Don't prune if either neuron is "new" (gives them time to establish)
-            if self.is_new_neuron(neuron1, min_age_sec) or self.is_new_neuron(neuron2, min_age_sec):
-                continue
-            
-            # Don't prune connections involving core/original neurons (optional, but safer)
-            # if neuron1 in self.original_neuron_positions or neuron2 in self.original_neuron_positions:
-            #    continue
-
-            # Check if absolute weight is below the threshold
-            if abs(weight) < threshold:
-                to_delete.append(pair)
-
-        for pair in to_delete:
-            if pair in self.weights:
-                del self.weights[pair]
-
-        if len(to_delete) > 0:
-            print(f"\x1b[33mPruned {len(to_delete)} weak connections (Threshold: {threshold}).\x1b[0m")
-            self.update() # Update visualization if connections changed
-        
-        return len(to_delete) # Return how many were pruned
-
-
-    def perform_hebbian_learning(self):
-        """Perform Hebbian learning with pre-pruning."""
-        current_time = time.time()
-        min_interval = 5  # Minimum 5 seconds between learning operations
-
-        if hasattr(self, 'last_hebbian_time') and (current_time - self.last_hebbian_time < min_interval):
-            return
-
-        if self.is_paused:
-            return
-
-        # --- NEW: Call Connection Pruning ---
-        # Call this *before* learning to remove very weak/old connections
-        self.prune_weak_connections()
-        # ---------------------------------
-
-        print("  ")
-        print("\x1b[44mPerforming Hebbian learning...\x1b[0m")
-        self.last_hebbian_time = current_time
-
-        # Initialize the list of updated neuron pairs
-        self.recently_updated_neuron_pairs = []
-
-        # Clean up old weight change events
-        self.weight_change_events = {
-            k: v for k, v in self.weight_change_events.items()
-            if (current_time - v) < self.activity_duration
         }
-
-        # Determine which neurons are significantly active (excluding specified neurons)
-        current_state = self.state  # Use the current state of the brain
-        active_threshold = self.config.hebbian.get('active_threshold', 50)
-        active_neurons = []
-        for neuron, value in current_state.items():
-            if neuron in self.excluded_neurons:
-                continue
-            
-            num_value = self.get_neuron_value(value) # Use helper to get numerical value
-            
-            if num_value > active_threshold:
-                active_neurons.append(neuron)
-
-        # Include decoration effects in learning (ensure manager exists)
-        decoration_memories = {}
-        if self.tamagotchi_logic and hasattr(self.tamagotchi_logic, 'squid') and hasattr(self.tamagotchi_logic.squid, 'memory_manager'):
-            decoration_memories = self.tamagotchi_logic.squid.memory_manager.get_all_short_term_memories('decorations')
-
-        if isinstance(decoration_memories, list): # Updated to handle list format
-            for memory in decoration_memories:
-                for stat, boost in memory.get('effects', {}).items():
-                    if stat in self.excluded_neurons:
-                        continue
-                    if isinstance(boost, (int, float)) and boost > 0:
-                        if stat not in active_neurons:
-                            active_neurons.append(stat)
-
-        # If less than two neurons are active, no learning occurs
-        if len(active_neurons) < 2:
-            print("Not enough active neurons for Hebbian learning")
-            if hasattr(self, 'hebbian_countdown_seconds'):
-                interval_ms = self.config.hebbian.get('learning_interval', 40000)
-                self.hebbian_countdown_seconds = int(interval_ms / 1000)
-            return
-
-        # Select only 2 pairs for learning (or fewer if not enough pairs)
-        num_possible_pairs = len(active_neurons) * (len(active_neurons) - 1) // 2
-        sample_size = min(2, num_possible_pairs)
-        
-        if sample_size > 0:
-            sampled_pairs_indices = random.sample([(i, j) for i in range(len(active_neurons)) for j in range(i + 1, len(active_neurons))], sample_size)
-            print(f">> Learning on {sample_size} random neuron pairs")
-            for i, j in sampled_pairs_indices:
-                neuron1 = active_neurons[i]
-                neuron2 = active_neurons[j]
-                value1 = self.get_neuron_value(current_state.get(neuron1, 50))
-                value2 = self.get_neuron_value(current_state.get(neuron2, 50))
-                self.update_connection(neuron1, neuron2, value1, value2)
-        else:
-            print("No valid pairs found for Hebbian learning.")
-
-
-        # Update the brain visualization
-        self.update()
-
-        # Reset the countdown after learning
-        if hasattr(self, 'hebbian_countdown_seconds'):
-            interval_ms = self.config.hebbian.get('learning_interval', 40000)
-            self.hebbian_countdown_seconds = int(interval_ms / 1000)
-            print(f"Reset countdown to {self.hebbian_countdown_seconds} seconds")
+        self.weight_animations.append(animation)
+        self.weight_animation_index.setdefault(pair, animation)
 
     def get_recently_updated_neurons(self):
         """Return the list of neuron pairs updated in the last learning cycle"""
@@ -594,20 +306,6 @@ class BrainWidget(QtWidgets.QWidget):
             if neuron in self.neuron_positions and neuron not in self.state:
                 self.state[neuron] = False  # Default boolean state
 
-    def initialize_connections(self):
-        connections = []
-        neurons = list(self.neuron_positions.keys())
-        for i in range(len(neurons)):
-            for j in range(i+1, len(neurons)):
-                connections.append((neurons[i], neurons[j]))
-        return connections
-
-    def initialize_weights(self):
-        neurons = list(self.neuron_positions.keys())
-        for i in range(len(neurons)):
-            for j in range(i+1, len(neurons)):
-                self.weights[(neurons[i], neurons[j])] = random.uniform(-1, 1)
-
     def get_neuron_count(self):
         """Returns the actual count of neurons in the network positions."""
         return len(self.neuron_positions)
@@ -660,181 +358,6 @@ class BrainWidget(QtWidgets.QWidget):
         efficiency = (reciprocal_count / len(self.connections)) * 100
         return efficiency
 
-    def log_neurogenesis_event(self, neuron_name, event_type, reason=None, details=None):
-        """Log neurogenesis events in a human-readable paragraph format."""
-        
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = ""
-
-        if event_type == "created" and details:
-            neuron_type = details.get("trigger_type")
-            trigger_value = details.get("trigger_value", 0.0)
-
-            if not neuron_type:
-                return # Cannot log without a neuron type
-
-            # General creation message
-            log_entry += f"{timestamp} - a {neuron_type.upper()} neuron ({neuron_name}) was created because {neuron_type} counter was {trigger_value:.2f}\n"
-
-            # Specific details for stress neurons
-            if neuron_type == "stress":
-                log_entry += "An inhibitory connection was made to ANXIETY\n"
-                log_entry += "Maximum anxiety value has been permanently reduced by 10\n"
-
-        elif event_type == "pruned":
-            # A more consistent format for pruned events
-            timestamp_full = datetime.now().strftime("%H:%M:%S")
-            log_entry = f"{timestamp_full} - a neuron ({neuron_name}) was PRUNED due to {reason if reason else 'unknown reason'}\n"
-
-        if log_entry:
-            try:
-                with open('neurogenesis_log.txt', 'a', encoding='utf-8') as f:
-                    f.write(log_entry)
-                    # Always add the separator after an entry
-                    f.write("\n-------------------------------\n\n")
-            except Exception as e:
-                print(f"\x1b[31mNeurogenesis logging failed: {str(e)}\x1b[0m")
-
-    def update_state(self, new_state):
-        if self.is_paused:
-            return
-
-        current_time = time.time()
-
-        excluded_from_direct_update = ['is_sick', 'is_eating', 'pursuing_food', 'direction', 'is_sleeping', 'is_startled', 'is_fleeing']
-        for key in self.state.keys():
-            if key in new_state and key not in excluded_from_direct_update:
-                self.state[key] = new_state[key]
-
-        binary_states_to_update = ['is_eating', 'pursuing_food', 'is_fleeing', 'is_startled', 'is_sleeping', 'is_sick']
-        for b_state in binary_states_to_update:
-            if b_state in new_state:
-                self.state[b_state] = new_state[b_state]
-
-        if not hasattr(self, 'neurogenesis_data') or self.neurogenesis_data is None:
-            self.neurogenesis_data = {'novelty_counter': 0, 'stress_counter': 0, 'reward_counter': 0, 'new_neurons': [], 'last_neuron_time': time.time() - self.neurogenesis_config.get('cooldown', 300), 'new_neurons_details': {}}
-        
-        for counter_key in ['novelty_counter', 'stress_counter', 'reward_counter']:
-            if counter_key not in self.neurogenesis_data:
-                self.neurogenesis_data[counter_key] = 0
-        if 'last_neuron_time' not in self.neurogenesis_data:
-            self.neurogenesis_data['last_neuron_time'] = time.time() - self.neurogenesis_config.get('cooldown', 300)
-
-        if new_state.get('novelty_exposure', 0) > 0: self.neurogenesis_data['novelty_counter'] += new_state.get('novelty_exposure', 0)
-        if new_state.get('sustained_stress', 0) > 0: self.neurogenesis_data['stress_counter'] += new_state.get('sustained_stress', 0)
-        if new_state.get('recent_rewards', 0) > 0: self.neurogenesis_data['reward_counter'] += new_state.get('recent_rewards', 0)
-
-        self.neurogenesis_data['novelty_counter'] = min(self.neurogenesis_data['novelty_counter'], self.max_novelty_counter)
-        self.neurogenesis_data['stress_counter'] = min(self.neurogenesis_data['stress_counter'], self.max_stress_counter)
-        self.neurogenesis_data['reward_counter'] = min(self.neurogenesis_data['reward_counter'], self.max_reward_counter)
-
-        if new_state.get('_debug_forced_neurogenesis', False):
-            if self.check_neurogenesis(new_state):
-                self.update()
-                return
-
-        if hasattr(self, 'last_weight_decay_time'):
-            if current_time - self.last_weight_decay_time > 60:
-                for conn_key in list(self.weights.keys()): self.weights[conn_key] *= (1.0 - self.config.hebbian.get('weight_decay', 0.01))
-                self.last_weight_decay_time = current_time
-        else:
-            self.last_weight_decay_time = current_time
-
-        novelty_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('novelty_threshold', 3), 'novelty')
-        stress_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('stress_threshold', 0.7), 'stress')
-        reward_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('reward_threshold', 0.6), 'reward')
-        
-        max_neurons = self.neurogenesis_config.get('max_neurons', 32)
-        current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
-        cooldown_ok = current_time - self.neurogenesis_data.get('last_neuron_time', 0) > self.neurogenesis_config.get('cooldown', 300)
-
-        potential_triggers = []
-        if self.neurogenesis_data['novelty_counter'] > novelty_threshold: potential_triggers.append(('novelty', self.neurogenesis_data['novelty_counter']))
-        if self.neurogenesis_data['stress_counter'] > stress_threshold: potential_triggers.append(('stress', self.neurogenesis_data['stress_counter']))
-        if self.neurogenesis_data['reward_counter'] > reward_threshold: potential_triggers.append(('reward', self.neurogenesis_data['reward_counter']))
-
-        neuron_type_to_create = None
-        if potential_triggers and cooldown_ok and (not self.pruning_enabled or current_neuron_count < max_neurons):
-            neuron_type_to_create, trigger_value = max(potential_triggers, key=lambda item: item[1])
-            
-            # Start of Bugfix
-            new_neuron_name = self._create_neuron_internal(neuron_type_to_create, new_state, trigger_value_for_log=trigger_value)
-            if new_neuron_name:
-                self.neurogenesis_highlight = {'neuron': new_neuron_name, 'start_time': time.time(), 'duration': self.neurogenesis_config.get('highlight_duration', 5.0)}
-                self.last_neurogenesis_type = neuron_type_to_create
-                self.neurogenesis_data['last_neuron_time'] = time.time()
-
-                # Reset counter AFTER creation
-                if neuron_type_to_create == 'reward': self.neurogenesis_data['reward_counter'] = 0
-                elif neuron_type_to_create == 'novelty': self.neurogenesis_data['novelty_counter'] = 0
-                elif neuron_type_to_create == 'stress':
-                    self.neurogenesis_data['stress_counter'] = 0
-                    if 'anxiety' in self.state: self.state['anxiety'] = max(0, self.state['anxiety'] - 10)
-                self.update()
-            else:
-                self.last_neurogenesis_type = None
-            # End of Bugfix
-
-        if self.pruning_enabled:
-            prune_threshold_percent = int(max_neurons * 0.95)
-            if current_neuron_count > prune_threshold_percent:
-                prune_chance = (current_neuron_count - prune_threshold_percent) / (max_neurons - prune_threshold_percent)
-                if random.random() < prune_chance: self.prune_weak_neurons()
-
-        decay_rate = self.neurogenesis_config.get('decay_rate', 0.90)
-        self.neurogenesis_data['novelty_counter'] *= decay_rate
-        self.neurogenesis_data['stress_counter'] *= decay_rate
-        self.neurogenesis_data['reward_counter'] *= decay_rate
-
-        self.update()
-        if self.capture_training_data_enabled: self.capture_training_data(new_state)
-
-    def check_neurogenesis(self, state):
-        """Check conditions for neurogenesis and create new neurons when triggered."""
-        current_time = time.time()
-        if hasattr(self, 'pruning_enabled') and self.pruning_enabled:
-            max_neurons = self.neurogenesis_config.get('max_neurons', 32)
-            current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
-            if current_neuron_count >= max_neurons:
-                return False
-
-        cooldown = self.neurogenesis_config.get('cooldown', 300)
-        if current_time - self.neurogenesis_data.get('last_neuron_time', 0) <= cooldown:
-            return False
-
-        def get_personality_modifier(personality, trigger_type):
-            modifiers = {'timid': {'novelty': 1.2, 'stress': 0.8}, 'adventurous': {'novelty': 0.8, 'stress': 1.2}, 'greedy': {'novelty': 1.0, 'stress': 1.0}, 'stubborn': {'novelty': 1.1, 'stress': 0.9}}
-            personality_str = getattr(personality, 'value', str(personality)).lower()
-            return modifiers.get(personality_str, {}).get(trigger_type, 1.0)
-        personality_modifier = getattr(self, 'get_personality_modifier', get_personality_modifier)
-
-        novelty_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('novelty_threshold', 3), 'novelty')
-        stress_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('stress_threshold', 0.7), 'stress')
-        reward_threshold = self.get_adjusted_threshold(self.neurogenesis_config.get('reward_threshold', 0.6), 'reward')
-
-        created = False
-        triggers = [
-            ('reward', state.get('recent_rewards', 0), reward_threshold, 1.0),
-            ('novelty', state.get('novelty_exposure', 0), novelty_threshold, personality_modifier(state.get('personality'), 'novelty')),
-            ('stress', state.get('sustained_stress', 0), stress_threshold, personality_modifier(state.get('personality'), 'stress')),
-        ]
-
-        for n_type, val, thresh, mod in triggers:
-            if val > (thresh * mod):
-                new_neuron = self._create_neuron_internal(n_type, state)
-                if new_neuron:
-                    created = True
-                    break
-        
-        if created:
-            self.neurogenesis_data['last_neuron_time'] = current_time
-            if hasattr(self, 'pruning_enabled') and self.pruning_enabled:
-                current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
-                max_neurons = self.neurogenesis_config.get('max_neurons', 32)
-                if current_neuron_count > max_neurons * 0.8 and random.random() < ((current_neuron_count - (max_neurons*0.8))/(max_neurons*0.2)):
-                    self.prune_weak_neurons()
-        return created
-
     def get_neurogenesis_threshold(self, trigger_type):
         """Safely get threshold for a trigger type with fallback defaults"""
         try:
@@ -853,174 +376,62 @@ class BrainWidget(QtWidgets.QWidget):
                 filtered_update[key] = stimulation_values[key]
         self.update_state(filtered_update)
 
-    def get_adjusted_threshold(self, base_threshold, trigger_type):
-        """Scale threshold based on network size to prevent runaway neurogenesis"""
-        original_count = len(self.original_neuron_positions)
-        current_count = len(self.neuron_positions) - len(self.excluded_neurons)
-        new_neuron_count = current_count - original_count
-        baseline = original_count + 3
-        if new_neuron_count <= 0 or current_count <= baseline:
-            return base_threshold
-        scaling_factors = {'novelty': 0.25, 'stress': 0.1, 'reward': 0.08}
-        scaling_factor = scaling_factors.get(trigger_type, 0.15)
-        multiplier = 1.0 + (scaling_factor * (new_neuron_count - baseline + 1))
-        adjusted = base_threshold * multiplier
-        return adjusted
-
-    def prune_weak_neurons(self):
-        """Remove weakly connected or inactive neurons to maintain network stability"""
-        min_neurons = len(self.original_neuron_positions)
-        current_count = len(self.neuron_positions) - len(self.excluded_neurons)
-        if current_count <= min_neurons:
-            return False
-
-        candidates = []
-        for neuron in list(self.neuron_positions.keys()):
-            if neuron in self.original_neuron_positions or neuron in self.excluded_neurons:
-                continue
-            connections = [abs(w) for (a, b), w in self.weights.items() if (a == neuron or b == neuron)]
-            activity = self.state.get(neuron, 0)
-            activity_score = 0 if isinstance(activity, bool) else abs(activity - 50)
-            if not connections or sum(connections) / len(connections) < 0.2:
-                candidates.append((neuron, 1))
-            elif activity_score < 10:
-                candidates.append((neuron, 2))
-        candidates.sort(key=lambda x: x[1])
-
-        if candidates:
-            neuron_to_remove = candidates[0][0]
-            if neuron_to_remove in self.neuron_positions: del self.neuron_positions[neuron_to_remove]
-            if neuron_to_remove in self.state: del self.state[neuron_to_remove]
-            for conn in list(self.weights.keys()):
-                if isinstance(conn, tuple) and (conn[0] == neuron_to_remove or conn[1] == neuron_to_remove):
-                    del self.weights[conn]
-            if neuron_to_remove in self.neurogenesis_data.get('new_neurons', []):
-                self.neurogenesis_data['new_neurons'].remove(neuron_to_remove)
-            reason = "weak connections/activity"
-            self.log_neurogenesis_event(neuron_to_remove, "pruned", reason)
-            return True
-        return False
-
-    def _create_neuron_internal(self, neuron_type, state, trigger_value_for_log=None):
-        """Create a new neuron with complete state initialization and contextual connections."""
-        current_neuron_count = len(self.neuron_positions) - len(self.excluded_neurons)
-        max_neurons_config = self.neurogenesis_config.get('max_neurons', 32)
-        if self.pruning_enabled and current_neuron_count >= max_neurons_config:
-            print(f"\x1b[33mNeurogenesis blocked: Max neuron limit ({max_neurons_config}) reached.\x1b[0m")
-            return None
-
-        base_name = {'novelty': 'novel', 'stress': 'stress', 'reward': 'reward'}[neuron_type]
-        new_name_index = len([n for n in self.neuron_positions if n.startswith(base_name)])
-        new_name = f"{base_name}_{new_name_index}"
-        
-        active_neurons_pos = sorted([(k, v, self.neuron_positions[k]) for k, v in self.state.items() if isinstance(v, (int, float)) and k in self.neuron_positions and k not in self.excluded_neurons], key=lambda x: x[1], reverse=True)
-        base_x, base_y = active_neurons_pos[0][2] if active_neurons_pos else (600, 300)
-        self.neuron_positions[new_name] = (base_x + random.randint(-50, 50), base_y + random.randint(-50, 50))
-
-        cfg_appearance = self.config.neurogenesis.get('appearance', {})
-        cfg_colors = cfg_appearance.get('colors', {})
-        cfg_shapes = cfg_appearance.get('shapes', {})
-        self.state.setdefault(new_name, 50)
-        default_colors = {'novelty': (255, 255, 150), 'stress': (255, 150, 150), 'reward': (173, 216, 230)}
-        self.state_colors[new_name] = tuple(cfg_colors.get(neuron_type, default_colors.get(neuron_type, (200, 200, 200))))
-        default_shapes = {'novelty': 'diamond', 'stress': 'square', 'reward': 'triangle'}
-        self.neuron_shapes[new_name] = cfg_shapes.get(neuron_type, default_shapes.get(neuron_type, 'circle'))
-        self.communication_events[new_name] = time.time()
-
-        # --- START FIX: Add default connections for all neuron types ---
-        default_weights = {
-            'novelty': {'curiosity': 0.6, 'anxiety': -0.4},
-            'stress': {'anxiety': -0.7, 'happiness': 0.3},
-            'reward': {'satisfaction': 0.8, 'happiness': 0.5}
-        }
-        
-        # Check if the neuron_type has predefined connections
-        if neuron_type in default_weights:
-            # Create connections to the specified target neurons
-            for target, weight in default_weights[neuron_type].items():
-                if target in self.neuron_positions:
-                    self.weights[(new_name, target)] = weight
-                    self.weights[(target, new_name)] = weight * 0.5  # Weaker reciprocal connection
-                    self.communication_events[target] = time.time() # Highlight target neuron
-        # --- END FIX ---
-        
-        trigger_reason_value = trigger_value_for_log if trigger_value_for_log is not None else state.get({'novelty': 'novelty_exposure', 'stress': 'sustained_stress', 'reward': 'recent_rewards'}[neuron_type], 0)
-        
-        log_creation_details = {"trigger_type": neuron_type, "trigger_value": round(trigger_reason_value, 2), "context": ""}
-        self.log_neurogenesis_event(new_name, "created", details=log_creation_details)
-        self.apply_repulsion_force()
-        return new_name
-
     def apply_repulsion_force(self, iterations=15, strength=0.6, threshold=120.0):
         """Applies a repulsion force between nearby neurons to spread them out."""
-
-        neuron_list = [name for name in self.neuron_positions.keys() if name not in self.excluded_neurons]
-
+        moved = False
         for _ in range(iterations):
-            displacements = {name: [0.0, 0.0] for name in neuron_list}
-
-            for i in range(len(neuron_list)):
-                for j in range(i + 1, len(neuron_list)):
-                    neuron1 = neuron_list[i]
-                    neuron2 = neuron_list[j]
-
-                    pos1 = self.neuron_positions[neuron1]
-                    pos2 = self.neuron_positions[neuron2]
-
-                    dx = pos1[0] - pos2[0]
-                    dy = pos1[1] - pos2[1]
-
-                    distance_sq = dx*dx + dy*dy
-
-                    if 0 < distance_sq < threshold*threshold:
-                        distance = math.sqrt(distance_sq)
-                        force = strength * (threshold - distance) / distance
-                        move_x = (dx / distance) * force
-                        move_y = (dy / distance) * force
-                        displacements[neuron1][0] += move_x
-                        displacements[neuron1][1] += move_y
-                        displacements[neuron2][0] -= move_x
-                        displacements[neuron2][1] -= move_y
-
-            damping = 0.5
-            moved = False
-            for name in neuron_list:
-                if name in self.original_neuron_positions:
-                   continue
-
-                pos = self.neuron_positions[name]
-                disp = displacements[name]
-
-                if abs(disp[0]) > 0.1 or abs(disp[1]) > 0.1:
-                    new_x = pos[0] + disp[0] * damping
-                    new_y = pos[1] + disp[1] * damping
-                    new_x = max(50, min(974, new_x))
-                    new_y = max(50, min(668, new_y))
-                    self.neuron_positions[name] = (new_x, new_y)
-                    moved = True
-
-            if not moved:
+            if not self._layout_step(strength, threshold):
                 break
+            moved = True
         if moved:
            self.update()
 
-    def update_weights(self):
-        """
-        Update weights by adding small random noise. 
-        WARNING: This adds noise and might counteract Hebbian learning.
-        Consider disabling or further reducing noise if learning seems unstable.
-        """
-        if self.frozen_weights is not None:
-            return
+    def relax_layout(self, iterations=15):
+        """Spread neurons out over the next frames instead of all at once"""
+        self._layout_steps_left = max(self._layout_steps_left, iterations)
+        if not self.layout_timer.isActive():
+            self.layout_timer.start(16)
+
+    def _relax_layout_step(self):
+        deadline = time.perf_counter() + self.layout_frame_budget
+        moved = False
+        while self._layout_steps_left > 0:
+            self._layout_steps_left -= 1
+            if not self._layout_step():
+                self._layout_steps_left = 0
+                break
+            moved = True
+            if time.perf_counter() >= deadline:
+                break
+        if self._layout_steps_left <= 0:
+            self.layout_timer.stop()
+        if moved:
+            self.update()
 
-        # --- MODIFIED: Iterate over a copy of the actual weight keys ---
-        for conn in list(self.weights.keys()):
-            # Check if the connection still exists (it might be pruned concurrently)
-            if conn in self.weights:
-                # Add a very small amount of noise/drift
-                self.weights[conn] += random.uniform(-0.01, 0.01) # Reduced noise
-                # Clamp the weight to stay within [-1, 1]
-                self.weights[conn] = max(-1, min(1, self.weights[conn]))
+    def _layout_step(self, strength=None, threshold=None):
+        """One layout step over all visible neurons; original neurons stay put. True if any moved."""
+        names = [name for name in self.neuron_positions if name not in self.excluded_neurons]
+        if len(names) < 2:
+            return False
+        positions = np.array([self.neuron_positions[name][:2] for name in names], dtype=np.float64)
+        movable = np.array([name not in self.original_neuron_positions for name in names], dtype=bool)
+
+        edges = edge_weights = None
+        if self.layout_engine.spring > 0:
+            index = {name: i for i, name in enumerate(names)}
+            connections = [(index[a], index[b], w) for (a, b), w in self.weights.items()
+                           if a in index and b in index and a != b]
+            if connections:
+                edges = [(a, b) for a, b, _ in connections]
+                edge_weights = [w for _, _, w in connections]
+
+        new_positions, moved = self.layout_engine.step(positions, movable, edges, edge_weights,
+                                                      strength=strength, threshold=threshold)
+        if moved:
+            for name, is_movable, position in zip(names, movable, new_positions.tolist()):
+                if is_movable:
+                    self.neuron_positions[name] = (position[0], position[1])
+        return moved
 
     def freeze_weights(self):
         self.frozen_weights = self.weights.copy()
@@ -1028,16 +439,6 @@ class BrainWidget(QtWidgets.QWidget):
     def unfreeze_weights(self):
         self.frozen_weights = None
 
-    def strengthen_connection(self, neuron1, neuron2, amount):
-        pair = (neuron1, neuron2)
-        reverse_pair = (neuron2, neuron1)
-        if pair not in self.weights and reverse_pair not in self.weights:
-            self.weights[pair] = 0.0
-        use_pair = pair if pair in self.weights else reverse_pair
-        self.weights[use_pair] += amount
-        self.weights[use_pair] = max(-1, min(1, self.weights[use_pair]))
-        self.update()
-
     def create_neuron(self, neuron_type, trigger_data):
         """Add after all other methods"""
         base_name = {'novelty': 'novel', 'stress': 'defense', 'reward': 'reward'}[neuron_type]
@@ -1057,11 +458,6 @@ class BrainWidget(QtWidgets.QWidget):
         self.neurogenesis_data['last_neuron_time'] = time.time()
         return new_name
 
-    def capture_training_data(self, state):
-        training_sample = [state[neuron] for neuron in self.neuron_positions.keys()]
-        self.training_data.append(training_sample)
-        print("Captured training data:", training_sample)
-
     def train_hebbian(self):
         print("Starting Hebbian training...")
         for sample in self.training_data:
@@ -1076,14 +472,24 @@ class BrainWidget(QtWidgets.QWidget):
         idx2 = list(self.neuron_positions.keys()).index(neuron2)
         return self.associations[idx1][idx2]
 
-    def draw_connections(self, painter, scale):
-        """Draw connections with extended 2-second weight change animations"""
+    def draw_connections(self, painter, scale, animated=None):
+        """
+        Draw connections with extended 2-second weight change animations.
+        animated=True draws only connections with a running weight animation,
+        animated=False only the others, None draws all of them.
+        """
         if not self.show_links:
             return
             
         current_time = time.time()
+        animation_index = self.weight_animation_index
+        if animated:
+            # Only the animating pairs are needed, no need to walk every connection
+            connections = [(pair, self.weights[pair]) for pair in animation_index if pair in self.weights]
+        else:
+            connections = self.weights.items()
         
-        for key, weight in self.weights.items():
+        for key, weight in connections:
             if not isinstance(key, tuple) or len(key) != 2:
                 continue
                 
@@ -1091,6 +497,8 @@ class BrainWidget(QtWidgets.QWidget):
             if (source not in self.neuron_positions or target not in self.neuron_positions or
                 source in self.excluded_neurons or target in self.excluded_neurons):
                 continue
+            if animated is False and key in animation_index:
+                continue
                 
             start = self.neuron_positions[source]
             end = self.neuron_positions[target]
@@ -1120,24 +528,23 @@ class BrainWidget(QtWidgets.QWidget):
             animating = False
             pulse_progress = 0.0
             
-            # Check for active animations (2-second duration)
-            for anim in self.weight_animations:
-                if anim['pair'] == key:
-                    elapsed = current_time - anim['start_time']
-                    if elapsed < anim['duration']:
-                        progress = elapsed / anim['duration']
-                        anim_weight = anim['start_weight'] + progress * (anim['end_weight'] - anim['start_weight'])
-                        
-                        # Adjust line width over full 2-second duration
-                        if progress < 0.5:  # First half - growing phase
-                            line_width = base_width + (6.0 * scale * progress * 2)
-                        else:  # Second half - shrinking phase
-                            line_width = base_width + (6.0 * scale * (1 - progress) * 2)
-                        
-                        # Slower pulse for 2-second duration
-                        pulse_progress = progress * anim['pulse_speed']
-                        animating = True
-                        break
+            # Check for an active animation (2-second duration)
+            anim = animation_index.get(key)
+            if anim is not None:
+                elapsed = current_time - anim['start_time']
+                if elapsed < anim['duration']:
+                    progress = elapsed / anim['duration']
+                    anim_weight = anim['start_weight'] + progress * (anim['end_weight'] - anim['start_weight'])
+                    
+                    # Adjust line width over full 2-second duration
+                    if progress < 0.5:  # First half - growing phase
+                        line_width = base_width + (6.0 * scale * progress * 2)
+                    else:  # Second half - shrinking phase
+                        line_width = base_width + (6.0 * scale * (1 - progress) * 2)
+                    
+                    # Slower pulse for 2-second duration
+                    pulse_progress = progress * anim['pulse_speed']
+                    animating = True
             
             # Set connection color based on weight
             if animating:
@@ -1232,52 +639,73 @@ class BrainWidget(QtWidgets.QWidget):
 
 
     def paintEvent(self, event):
+        key = self._compute_static_layer_key()
+        if self._static_layer is None or key != self._static_layer_key:
+            self._static_layer = self._render_static_layer()
+            self._static_layer_key = key
+
         painter = QtGui.QPainter(self)
+        painter.drawPixmap(0, 0, self._static_layer)
+
+        # Only the animated overlays are drawn every frame
         painter.setRenderHint(QtGui.QPainter.Antialiasing)
-        
-        # Fill background
-        painter.fillRect(self.rect(), QtGui.QColor(240, 240, 240))
+        offset, scale = self._static_layer_transform
+        painter.translate(0, offset)
+        painter.scale(scale, scale)
+        self.draw_animated_overlays(painter, scale)
+        painter.end()
 
-        # --- Start of indicator drawing logic ---
-        indicator_y_position = 10 # Y position for indicators
-        indicator_font = QtGui.QFont("Arial", 10, QtGui.QFont.Bold) # Increased font size
-        painter.setFont(indicator_font)
-        font_metrics = painter.fontMetrics()
-        
+    def _active_indicators(self):
+        """(text, colour) of the status indicators shown above the network, at most 3"""
         active_indicators_data = []
         # Existing indicators
         if self.state.get('is_fleeing', False): 
-            active_indicators_data.append({"text": "Fleeing!", "color": QtGui.QColor(220, 20, 60)})
+            active_indicators_data.append(("Fleeing!", QtGui.QColor(220, 20, 60)))
         if self.state.get('is_startled', False): 
-            active_indicators_data.append({"text": "Startled!", "color": QtGui.QColor(255, 165, 0)})
+            active_indicators_data.append(("Startled!", QtGui.QColor(255, 165, 0)))
         if self.state.get('pursuing_food', False): 
-            active_indicators_data.append({"text": "Pursuing Food", "color": QtGui.QColor(60, 179, 113)})
+            active_indicators_data.append(("Pursuing Food", QtGui.QColor(60, 179, 113)))
 
         # New indicators
         squid_status = self.state.get('status', '').lower()
         if self.state.get('is_eating', False) or 'eating' in squid_status:
-             active_indicators_data.append({"text": "Eating", "color": QtGui.QColor(46, 204, 113)})
+             active_indicators_data.append(("Eating", QtGui.QColor(46, 204, 113)))
         if self.state.get('is_sleeping', False):
-             active_indicators_data.append({"text": "Sleeping", "color": QtGui.QColor(142, 68, 173)})
+             active_indicators_data.append(("Sleeping", QtGui.QColor(142, 68, 173)))
         if 'rock' in squid_status or 'play' in squid_status:
-            active_indicators_data.append({"text": "Playing", "color": QtGui.QColor(241, 196, 15)})
+            active_indicators_data.append(("Playing", QtGui.QColor(241, 196, 15)))
         if 'hiding' in squid_status:
-            active_indicators_data.append({"text": "Hiding", "color": QtGui.QColor(22, 160, 133)})
+            active_indicators_data.append(("Hiding", QtGui.QColor(22, 160, 133)))
         if self.state.get('anxiety', 0) > 70 or 'anxious' in squid_status:
-            active_indicators_data.append({"text": "Anxious", "color": QtGui.QColor(231, 76, 60)})
+            active_indicators_data.append(("Anxious", QtGui.QColor(231, 76, 60)))
         if self.state.get('curiosity', 0) > 80 or 'curious' in squid_status:
-            active_indicators_data.append({"text": "Curious", "color": QtGui.QColor(52, 152, 219)})
+            active_indicators_data.append(("Curious", QtGui.QColor(52, 152, 219)))
         
-        indicators_to_display = active_indicators_data[:3]
+        return active_indicators_data[:3]
+
+    def _render_static_layer(self):
+        """Draw background, indicators, neurons and idle connections into a pixmap"""
+        ratio = self.devicePixelRatioF()
+        layer = QtGui.QPixmap(max(1, int(self.width() * ratio)), max(1, int(self.height() * ratio)))
+        layer.setDevicePixelRatio(ratio)
+        layer.fill(QtGui.QColor(240, 240, 240))
+
+        painter = QtGui.QPainter(layer)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        # --- Start of indicator drawing logic ---
+        indicator_y_position = 10 # Y position for indicators
+        indicator_font = QtGui.QFont("Arial", 10, QtGui.QFont.Bold) # Increased font size
+        painter.setFont(indicator_font)
+        font_metrics = painter.fontMetrics()
+        
+        indicators_to_display = self._active_indicators()
         padding_horizontal, padding_vertical, spacing_between_indicators = 10, 5, 10
         
         rect_height = font_metrics.height() + (2 * padding_vertical)
         current_target_left_edge_x = 15 # Start 15px from the left
 
-        for indicator_details in indicators_to_display:
-            indicator_text_original = indicator_details["text"]
-            indicator_bg_color = indicator_details["color"]
-            
+        for indicator_text_original, indicator_bg_color in indicators_to_display:
             ideal_text_width = font_metrics.horizontalAdvance(indicator_text_original)
             render_rect_width = ideal_text_width + (2 * padding_horizontal)
             
@@ -1294,8 +722,6 @@ class BrainWidget(QtWidgets.QWidget):
             painter.drawText(indicator_rect, QtCore.Qt.AlignCenter, elided_text)
             
             current_target_left_edge_x += render_rect_width + spacing_between_indicators
-            
-        painter.save()
         
         # Calculate space used by indicators to offset neuron drawing area
         fixed_indicator_area_height = rect_height + 10 if indicators_to_display else 30 # Add some padding below indicators
@@ -1315,12 +741,28 @@ class BrainWidget(QtWidgets.QWidget):
         scale_y = max(0.01, scale_y) # Ensure scale is positive
         
         scale = max(0.01, min(scale_x, scale_y)) # Ensure scale is positive
+        self._static_layer_transform = (indicator_space_at_top, scale)
 
         painter.translate(0, indicator_space_at_top) # Translate painter down past the indicator area
         painter.scale(scale, scale)
         
         self.draw_neurons(painter, 1.0) # Pass scale as 1.0 as painter is already scaled
         
+        if self.show_links:
+            self.draw_connections(painter, 1.0, animated=False)
+            
+        painter.end()
+        return layer
+
+    def draw_animated_overlays(self, painter, scale):
+        """Draw activity pulses, highlights and animating connections on top of the static layer"""
+        current_time = time.time()
+        self._overlay_drawn = self._has_active_overlays(current_time)
+        if not self._overlay_drawn:
+            return
+
+        self.draw_neuron_highlights(painter, current_time)
+
         if self.dragging and self.dragged_neuron:
             pos = self.neuron_positions[self.dragged_neuron]
             # When drawing on an already scaled painter, the pen width should be relative to the new scale
@@ -1330,49 +772,23 @@ class BrainWidget(QtWidgets.QWidget):
             
         self.draw_neurogenesis_highlights(painter, 1.0) # Pass scale as 1.0
         
-        if self.show_links:
-            self.draw_connections(painter, 1.0) # Pass scale as 1.0
-            
-        painter.restore()
+        if self.show_links and self.weight_animations:
+            self.draw_connections(painter, 1.0, animated=True)
 
     def draw_neurons(self, painter, scale):
-        """Draw all neurons with activity-based sizing and highlights"""
-        current_time = time.time()
-        
+        """Draw all neurons with activity-based sizing"""
         for name, pos in self.neuron_positions.items():
             if name in self.excluded_neurons:
                 continue
 
             try:
-                # Calculate dynamic size based on activity
-                value = self.get_neuron_value(self.state.get(name, 50))
-                base_size = 25.0
-                size_factor = 0.8 + 0.4 * (abs(value - 50) / 50)
-                target_size = base_size * size_factor * scale
-                
-                # Smooth size transition
-                if name not in self.neuron_sizes:
-                    self.neuron_sizes[name] = target_size
-                else:
-                    current_size = self.neuron_sizes[name]
-                    size_diff = target_size - current_size
-                    self.neuron_sizes[name] = current_size + size_diff * 0.2
-                
-                radius = self.neuron_sizes[name]
+                radius = self.neuron_sizes.get(name)
+                if radius is None:
+                    radius = self._target_neuron_size(name)
+                radius *= scale
                 shape = self.neuron_shapes.get(name, 'circle')
                 color = QtGui.QColor(*self.state_colors.get(name, (200, 200, 200)))
 
-                # Draw activity highlight
-                if name in self.communication_events:
-                    elapsed = current_time - self.communication_events[name]
-                    if elapsed < self.activity_duration:
-                        pulse = 0.5 + 0.5 * math.sin(current_time * 10)
-                        highlight_radius = radius + 3 + 2 * pulse
-                        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 0, 150), 2))
-                        painter.setBrush(QtCore.Qt.NoBrush)
-                        painter.drawEllipse(QtCore.QPointF(pos[0], pos[1]), 
-                                          highlight_radius, highlight_radius)
-
                 # Draw the neuron shape
                 if shape == 'diamond':
                     self.draw_diamond_neuron(painter, pos[0], pos[1], radius, name, scale)
@@ -1386,14 +802,38 @@ class BrainWidget(QtWidgets.QWidget):
                     painter.drawEllipse(QtCore.QPointF(pos[0], pos[1]), radius, radius)
                     self._draw_neuron_label(painter, pos[0], pos[1], name, radius, scale)
 
+            except Exception as e:
+                print(f"Error drawing neuron {name}: {str(e)}")
+
+    def draw_neuron_highlights(self, painter, current_time):
+        """Draw the activity and neurogenesis pulses around neurons"""
+        highlight = self.neurogenesis_highlight
+        for name, pos in self.neuron_positions.items():
+            if name in self.excluded_neurons:
+                continue
+
+            try:
+                radius = self.neuron_sizes.get(name)
+                if radius is None:
+                    radius = self._target_neuron_size(name)
+
+                # Draw activity highlight
+                if name in self.communication_events:
+                    elapsed = current_time - self.communication_events[name]
+                    if elapsed < self.activity_duration:
+                        pulse = 0.5 + 0.5 * math.sin(current_time * 10)
+                        highlight_radius = radius + 3 + 2 * pulse
+                        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 0, 150), 2))
+                        painter.setBrush(QtCore.Qt.NoBrush)
+                        painter.drawEllipse(QtCore.QPointF(pos[0], pos[1]), 
+                                          highlight_radius, highlight_radius)
+
                 # Draw neurogenesis highlight
-                if (self.neurogenesis_highlight['neuron'] == name and 
-                    current_time - self.neurogenesis_highlight['start_time'] < 
-                    self.neurogenesis_highlight['duration']):
+                if (highlight.get('neuron') == name and 
+                    current_time - highlight['start_time'] < highlight['duration']):
                     
-                    progress = (current_time - self.neurogenesis_highlight['start_time']) / \
-                               self.neurogenesis_highlight['duration']
-                    pulse = 0.5 + 0.5 * math.sin(self.neurogenesis_highlight['pulse_phase'])
+                    progress = (current_time - highlight['start_time']) / highlight['duration']
+                    pulse = 0.5 + 0.5 * math.sin(highlight.get('pulse_phase', 0))
                     highlight_radius = radius + 10 + 10 * pulse * (1 - progress)
                     
                     painter.setPen(QtGui.QPen(QtGui.QColor(255, 215, 0, 200), 3))
@@ -1402,7 +842,7 @@ class BrainWidget(QtWidgets.QWidget):
                                       highlight_radius, highlight_radius)
 
             except Exception as e:
-                print(f"Error drawing neuron {name}: {str(e)}")
+                print(f"Error drawing highlight for neuron {name}: {str(e)}")
 
     def draw_binary_neuron(self, painter, x, y, value, label, scale=1.0):
         color = (0, 0, 0) if value else (255, 255, 255)
@@ -1522,7 +962,7 @@ class BrainWidget(QtWidgets.QWidget):
             self.drag_start_pos = None
             self.update()
             # Apply repulsion forces to settle network after drag/click
-            self.apply_repulsion_force()
+            self.relax_layout()
         super().mouseReleaseEvent(event)
 
     def _is_click_on_neuron(self, point, neuron_pos, scale):
@@ -1,7 +1,6 @@
 import configparser
 import os
 import random
-from PyQt5 import QtCore
 from ast import literal_eval
 
 class ConfigManager:
@@ -95,6 +94,27 @@ class ConfigManager:
             'pulse_speed': '0.5'
         }
 
+        # Hebbian learning
+        self.config['Hebbian'] = {
+            'full_coverage': 'False'
+        }
+
+        # Activation propagation
+        self.config['Propagation'] = {
+            'enabled': 'False',
+            'activation': 'linear',
+            'leak': '0.5',
+            'coupling': '0.3'
+        }
+
+        # Save files
+        self.config['Save'] = {
+            'brain_format': 'json',
+            'autosave_interval': '300',
+            'delta_autosave': 'False',
+            'checkpoint_every': '10'
+        }
+
         with open(self.config_path, 'w') as f:
             self.config.write(f)
 
@@ -112,6 +132,31 @@ class ConfigManager:
             'max_rock_memories': int(self.config['RockInteractions']['max_rock_memories'])
         }
     
+    def get_save_config(self):
+        brain_format = self.config.get('Save', 'brain_format', fallback='json').strip().lower()
+        if brain_format not in ('json', 'npz'):
+            print(f"Unknown brain_format '{brain_format}' in config, using json")
+            brain_format = 'json'
+        return {
+            'brain_format': brain_format,
+            'autosave_interval': self.config.getfloat('Save', 'autosave_interval', fallback=300.0),
+            'delta_autosave': self.config.getboolean('Save', 'delta_autosave', fallback=False),
+            'checkpoint_every': self.config.getint('Save', 'checkpoint_every', fallback=10)
+        }
+    
+    def get_hebbian_config(self):
+        return {
+            'full_coverage': self.config.getboolean('Hebbian', 'full_coverage', fallback=False)
+        }
+
+    def get_propagation_config(self):
+        return {
+            'enabled': self.config.getboolean('Propagation', 'enabled', fallback=False),
+            'activation': self.config.get('Propagation', 'activation', fallback='linear').strip().lower(),
+            'leak': self.config.getfloat('Propagation', 'leak', fallback=0.5),
+            'coupling': self.config.getfloat('Propagation', 'coupling', fallback=0.3)
+        }
+    
     def get_poop_config(self):
         return {
             'min_carry_duration': 2.0,
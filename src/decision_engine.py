@@ -9,8 +9,10 @@ from .personality import Personality
 import math
 
 class DecisionEngine:
-    def __init__(self, squid):
+    def __init__(self, squid, rng=None):
         self.squid = squid
+        # Source of randomness; the headless simulation passes a seeded random.Random
+        self.rng = rng or random
 
     def make_decision(self):
         """
@@ -23,18 +25,16 @@ class DecisionEngine:
         # =================================================================
         # This creates a complete snapshot of the squid's current condition.
 
-        # Gather all relevant world objects to check for visibility
-        all_world_objects = []
-        if hasattr(self.squid.tamagotchi_logic, 'food_items'):
-            all_world_objects.extend(self.squid.tamagotchi_logic.food_items)
-        if hasattr(self.squid.tamagotchi_logic, 'poop_items'):
-            all_world_objects.extend(self.squid.tamagotchi_logic.poop_items)
-        if hasattr(self.squid.tamagotchi_logic, 'user_interface') and hasattr(self.squid.tamagotchi_logic.user_interface, 'scene'):
-            all_decorations = [item for item in self.squid.tamagotchi_logic.user_interface.scene.items() if hasattr(item, 'category')]
-            all_world_objects.extend(all_decorations)
-
         # Use the squid's vision to get what it can actually see
-        visible_objects = self.squid.get_visible_objects(all_world_objects)
+        if hasattr(self.squid.tamagotchi_logic, 'user_interface') and hasattr(self.squid.tamagotchi_logic.user_interface, 'scene'):
+            # Food, poop and decorations are all in the scene's spatial index
+            visible_objects = self.squid.get_visible_scene_objects()
+        else:
+            # Headless simulation keeps world objects in plain lists
+            all_world_objects = []
+            for attr in ('food_items', 'poop_items', 'decorations'):
+                all_world_objects.extend(getattr(self.squid.tamagotchi_logic, attr, []))
+            visible_objects = self.squid.get_visible_objects(all_world_objects)
 
         visible_rocks = [obj for obj in visible_objects if getattr(obj, 'category', '') == 'rock']
         visible_poops = [obj for obj in visible_objects if getattr(obj, 'category', '') == 'poop']
@@ -62,7 +62,10 @@ class DecisionEngine:
         }
         
         # The brain's neural network state provides the foundation for desires.
-        brain_state = self.squid.tamagotchi_logic.squid_brain_window.brain_widget.state
+        # Propagated activations (weights feeding back into neurons) take precedence over raw values.
+        brain_widget = self.squid.tamagotchi_logic.squid_brain_window.brain_widget
+        brain_state = dict(brain_widget.state)
+        brain_state.update(getattr(brain_widget, 'activations', None) or {})
         
         # =================================================================
         # 2. APPLY MEMORY INFLUENCE
@@ -173,7 +176,7 @@ class DecisionEngine:
 
         # Add a touch of randomness to prevent behavior from being too deterministic.
         for key in decision_weights:
-            decision_weights[key] *= random.uniform(0.9, 1.1)
+            decision_weights[key] *= self.rng.uniform(0.9, 1.1)
         
         # =================================================================
         # 6. MAKE AND EXECUTE THE FINAL DECISION
@@ -236,7 +239,7 @@ class DecisionEngine:
         
         elif best_decision == "throwing_rock" and self.squid.carrying_rock:
             # Implementation for throwing a rock...
-            if self.squid.throw_rock(random.choice(["left", "right"])):
+            if self.squid.throw_rock(self.rng.choice(["left", "right"])):
                 return "playfully throwing rock"
 
         # --- DEFAULT EXPLORATION BEHAVIOR ---
@@ -251,7 +254,7 @@ class DecisionEngine:
             Personality.ENERGETIC: ["zooming around", "buzzing with energy"]
         }.get(self.squid.personality, ["exploring surroundings", "wandering aimlessly"])
         
-        exploration_style = random.choice(exploration_options)
+        exploration_style = self.rng.choice(exploration_options)
         
         # The chosen exploration style affects its movement pattern.
         if exploration_style in ["resting comfortably", "lounging lazily"]:
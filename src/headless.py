@@ -0,0 +1,420 @@
+# Headless simulation driver
+#
+# Runs the squid's world without a QApplication, a QGraphicsScene or
+# wall-clock timers. The rules themselves live in simulation_core.py and
+# brain_rules.py and are shared with the Qt game; this module only supplies
+# a plain Python world (food, poop, decorations) and simulated time. Every
+# call to step() advances the world by one tick (1 second at 1x speed), so
+# long soak tests can run as fast as the CPU allows with a deterministic seed.
+#
+# Anything that wants to watch the world (a UI, a logger, a test harness)
+# registers itself with add_observer().
+
+import math
+import random
+import time
+from collections import deque
+
+from .personality import Personality
+from .memory_manager import MemoryManager
+from .learning import LearningConfig
+from .simulation_core import SimulationRules, SquidRules
+from .brain_rules import BrainRules
+
+
+class _Point:
+    """Minimal stand-in for QPointF so shared code can call pos().x() / pos().y()"""
+    __slots__ = ('_x', '_y')
+
+    def __init__(self, x, y):
+        self._x = x
+        self._y = y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+
+class WorldObject:
+    """A food, poop or decoration item living in the headless world"""
+
+    def __init__(self, category, x, y, width=64, height=64, is_sushi=False,
+                 filename=None, stat_modifiers=None):
+        self.category = category
+        self.x = float(x)
+        self.y = float(y)
+        self.width = width
+        self.height = height
+        self.is_sushi = is_sushi
+        self.filename = filename
+        self.stat_modifiers = stat_modifiers or {}
+
+    def pos(self):
+        return _Point(self.x, self.y)
+
+    def center(self):
+        return (self.x + self.width / 2, self.y + self.height / 2)
+
+    def collides_with(self, x, y, width, height):
+        return (self.x < x + width and x < self.x + self.width and
+                self.y < y + height and y < self.y + self.height)
+
+
+def _stat_property(name):
+    """Needs are clamped to 0..100 exactly like the Squid property setters"""
+    attr = '_' + name
+
+    def getter(self):
+        return getattr(self, attr)
+
+    def setter(self, value):
+        setattr(self, attr, max(0, min(100, value)))
+
+    return property(getter, setter)
+
+
+class HeadlessMentalStates:
+    """The parts of MentalStateManager the rules use, without icons"""
+
+    def __init__(self):
+        self.mental_states_enabled = False
+        self.active_states = set()
+
+    def set_mental_states_enabled(self, enabled):
+        self.mental_states_enabled = enabled
+
+    def set_state(self, state_name, is_active):
+        if is_active:
+            self.active_states.add(state_name)
+        else:
+            self.active_states.discard(state_name)
+
+    def is_state_active(self, state_name):
+        if state_name == "sick" or self.mental_states_enabled:
+            return state_name in self.active_states
+        return False
+
+
+class HeadlessSquid(SquidRules):
+    """Squid without a scene: the shared SquidRules on plain attributes"""
+
+    hunger = _stat_property('hunger')
+    happiness = _stat_property('happiness')
+    cleanliness = _stat_property('cleanliness')
+    sleepiness = _stat_property('sleepiness')
+    satisfaction = _stat_property('satisfaction')
+    anxiety = _stat_property('anxiety')
+    curiosity = _stat_property('curiosity')
+
+    def __init__(self, simulation, personality):
+        self.ui = simulation
+        self.tamagotchi_logic = simulation
+        self.rng = simulation.rng
+        self.personality = personality
+        self.memory_manager = simulation.memory_manager
+        self.mental_state_manager = HeadlessMentalStates()
+
+        self.squid_width = 253
+        self.squid_height = 147
+        self.base_squid_speed = 90
+        self.base_vertical_speed = self.base_squid_speed // 2
+        self.animation_speed = 1
+        self.center_x = simulation.window_width // 2
+        self.center_y = simulation.window_height // 2
+        self.squid_x = self.center_x
+        self.squid_y = self.center_y
+        self.squid_direction = "left"
+        self.current_frame = 0
+        self.can_move = True
+
+        self.view_cone_angle = math.pi / 2.5
+        self.current_view_angle = self.rng.uniform(0, 2 * math.pi)
+        self.view_cone_change_interval = 2000  # milliseconds
+        self.last_view_cone_change = 0
+
+        self.hunger = 25
+        self.sleepiness = 30
+        self.happiness = 100
+        self.cleanliness = 100
+        self.satisfaction = 50
+        self.anxiety = 10
+        self.curiosity = 55
+        self.health = 100
+        self.is_sick = False
+        self.is_sleeping = False
+        self.is_eating = False
+        self.is_fleeing = False
+        self.pursuing_food = False
+        self.target_food = None
+        self.status = "roaming"
+
+        # Rock/poop carrying is driven by Qt animations in the full game
+        self.carrying_rock = False
+        self.carrying_poop = False
+        self.rock_throw_cooldown = 0
+        self.poop_throw_cooldown = 0
+
+    def current_time_ms(self):
+        return int(self.tamagotchi_logic.sim_time * 1000)
+
+    def start_poop_timer(self):
+        delay = self.rng.randint(11000, 30000) / 1000
+        self.tamagotchi_logic.schedule_poop(self.tamagotchi_logic.sim_time + delay)
+
+
+class HeadlessBrain(BrainRules):
+    """The shared BrainRules with no widget to draw on"""
+
+    quiet = True
+
+    def __init__(self, simulation, config=None):
+        self.rng = simulation.rng
+        self.clock = simulation.clock
+        self.init_brain_state(config or LearningConfig(), simulation)
+        self.neurogenesis_log = []
+        self.thoughts = deque(maxlen=100)
+
+    @property
+    def brain_widget(self):
+        return self
+
+    def update(self):
+        pass
+
+    def relax_layout(self):
+        pass
+
+    def update_brain(self, state):
+        self.update_state(state)
+
+    def add_thought(self, thought):
+        self.thoughts.append(thought)
+
+    def log_neurogenesis_event(self, neuron_name, event_type, reason=None, details=None):
+        # Keep events in memory instead of appending to neurogenesis_log.txt
+        self.neurogenesis_log.append((self.clock(), neuron_name, event_type, reason))
+
+
+class HeadlessSimulation(SimulationRules):
+    """Deterministic, Qt-free driver for a squid and its tank.
+
+    Usage:
+        sim = HeadlessSimulation(personality=Personality.TIMID, seed=42)
+        sim.add_decoration('plant', 300, 600, filename='plant01.png', stat_modifiers={'anxiety': -2})
+        sim.run(100000)
+    """
+
+    def __init__(self, personality=None, seed=None, window_width=1280, window_height=900,
+                 start_time=None, config=None):
+        self.rng = random.Random(seed)
+        self.sim_time = float(start_time if start_time is not None else time.time())
+        self.tick_count = 0
+        self.simulation_speed = 1
+        self.window_width = window_width
+        self.window_height = window_height
+        self.debug_mode = False
+        self.mental_states_enabled = False
+
+        self.food_items = []
+        self.poop_items = []
+        self.decorations = []
+        self.pending_poops = []
+        self.max_food = 3
+        self.max_poop = 3
+        self.base_food_speed = 90
+        self.points = 0
+
+        self.cleanliness_threshold_time = 0
+        self.hunger_threshold_time = 0
+        self.plant_calming_effect_counter = 0
+        self.neurogenesis_triggers = {
+            'novel_objects': 0,
+            'high_stress_cycles': 0,
+            'positive_outcomes': 0
+        }
+        self.new_object_encountered = False
+        self.recent_positive_outcome = False
+        self.is_game_over = False
+        self.messages = deque(maxlen=100)
+
+        self.memory_manager = MemoryManager(memory_dir=None, clock=self.clock)
+        if personality is None:
+            personality = self.rng.choice(list(Personality))
+        self.squid = HeadlessSquid(self, personality)
+        self.brain = HeadlessBrain(self, config)
+        self.brain_window = self.squid_brain_window = self.brain
+        self.hebbian_interval = self.brain.config.hebbian.get('learning_interval', 30000) / 1000
+        self.last_hebbian_time = self.sim_time
+        self._observers = []
+
+    def clock(self):
+        """Simulated wall-clock time, used for memory timestamps and cooldowns"""
+        return self.sim_time
+
+    # ------------------------------------------------------------------
+    # Observers
+    # ------------------------------------------------------------------
+    def add_observer(self, callback):
+        """Register callback(simulation) to be called after every tick"""
+        self._observers.append(callback)
+
+    def remove_observer(self, callback):
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    # ------------------------------------------------------------------
+    # Hooks used by the shared rules
+    # ------------------------------------------------------------------
+    def show_message(self, message):
+        self.messages.append(message)
+
+    def add_thought(self, thought):
+        self.brain.add_thought(thought)
+
+    def game_over(self):
+        self.is_game_over = True
+
+    def squid_touches(self, item):
+        squid = self.squid
+        return item.collides_with(squid.squid_x, squid.squid_y, squid.squid_width, squid.squid_height)
+
+    def move_decoration(self, decoration, dx):
+        decoration.x = max(0, min(decoration.x + dx, self.window_width - decoration.width))
+
+    def get_nearby_decorations(self, x, y, radius=100):
+        nearby = []
+        for item in self.decorations:
+            cx, cy = item.center()
+            if (cx - x) ** 2 + (cy - y) ** 2 <= radius * radius:
+                nearby.append(item)
+        return nearby
+
+    # ------------------------------------------------------------------
+    # World editing
+    # ------------------------------------------------------------------
+    def spawn_food(self, is_sushi=None, x=None):
+        if len(self.food_items) >= self.max_food:
+            return None
+        if is_sushi is None:
+            is_sushi = self.rng.random() < 0.5
+        if x is None:
+            x = self.rng.randint(50, self.window_width - 50 - 64)
+        food = WorldObject('food', x, 50, is_sushi=is_sushi)
+        self.food_items.append(food)
+        return food
+
+    def feed_squid(self):
+        return self.spawn_food()
+
+    def remove_food(self, food_item):
+        if food_item in self.food_items:
+            self.food_items.remove(food_item)
+
+    def schedule_poop(self, due_time):
+        self.pending_poops.append(due_time)
+
+    def spawn_poop(self, x, y):
+        if len(self.poop_items) >= self.max_poop:
+            return None
+        poop = WorldObject('poop', x - 24, y, width=48, height=48)
+        self.poop_items.append(poop)
+        return poop
+
+    def add_decoration(self, category, x, y, width=128, height=128, filename=None, stat_modifiers=None):
+        decoration = WorldObject(category, x, y, width, height,
+                                 filename=filename, stat_modifiers=stat_modifiers)
+        self.decorations.append(decoration)
+        self.new_object_encountered = True
+        return decoration
+
+    def clean_environment(self):
+        self.poop_items.clear()
+        self.squid.cleanliness = 100
+        self.squid.happiness = min(100, self.squid.happiness + 20)
+
+    def give_medicine(self):
+        squid = self.squid
+        if not (squid.is_sick or squid.mental_state_manager.is_state_active('sick')):
+            return False
+        squid.is_sick = False
+        squid.mental_state_manager.set_state("sick", False)
+        squid.happiness = max(0, squid.happiness - 30)
+        squid.sleepiness = min(100, squid.sleepiness + 50)
+        return True
+
+    # ------------------------------------------------------------------
+    # Simulation tick
+    # ------------------------------------------------------------------
+    def run(self, ticks):
+        """Run up to `ticks` ticks, stopping early if the squid dies"""
+        for _ in range(ticks):
+            if self.is_game_over:
+                break
+            self.step()
+        return self.tick_count
+
+    def step(self):
+        """Advance the world by one tick (one simulated second at 1x)"""
+        self.sim_time += 1.0
+        self.tick_count += 1
+
+        # Same order as TamagotchiLogic.update_simulation
+        self.move_objects()
+        self.update_needs()
+        self.update_squid_tick()
+
+        # The decision engine picks the squid's next action while it is awake
+        if not self.squid.is_sleeping:
+            self.squid.status = self.squid.make_decision()
+
+        # Stands in for the brain window's Hebbian learning timer
+        if self.sim_time - self.last_hebbian_time >= self.hebbian_interval:
+            self.brain.perform_hebbian_learning()
+            self.last_hebbian_time = self.sim_time
+
+        for callback in self._observers:
+            callback(self)
+
+    def move_objects(self):
+        squid = self.squid
+        floor = self.window_height - 120
+        for food in self.food_items[:]:
+            food.y = min(food.y + self.base_food_speed * self.simulation_speed, floor - food.height)
+            if food.collides_with(squid.squid_x, squid.squid_y, squid.squid_width, squid.squid_height):
+                squid.eat(food)
+        for poop in self.poop_items:
+            poop.y = min(poop.y + self.base_food_speed * self.simulation_speed, floor - poop.height)
+
+        if self.pending_poops:
+            due = [t for t in self.pending_poops if t <= self.sim_time]
+            if due:
+                self.pending_poops = [t for t in self.pending_poops if t > self.sim_time]
+                for _ in due:
+                    self.spawn_poop(squid.squid_x + squid.squid_width // 2,
+                                    squid.squid_y + squid.squid_height)
+
+    def get_summary(self):
+        squid = self.squid
+        brain = self.brain
+        return {
+            'ticks': self.tick_count,
+            'personality': squid.personality.value,
+            'alive': not self.is_game_over,
+            'hunger': round(squid.hunger, 2),
+            'happiness': round(squid.happiness, 2),
+            'cleanliness': round(squid.cleanliness, 2),
+            'sleepiness': round(squid.sleepiness, 2),
+            'satisfaction': round(squid.satisfaction, 2),
+            'anxiety': round(squid.anxiety, 2),
+            'curiosity': round(squid.curiosity, 2),
+            'health': round(squid.health, 2),
+            'sick': squid.mental_state_manager.is_state_active('sick'),
+            'status': squid.status,
+            'points': self.points,
+            'neurons': len([n for n in brain.neuron_positions if n not in brain.excluded_neurons]),
+            'connections': len(brain.weights),
+            'short_term_memories': len(self.memory_manager.short_term_memory),
+            'long_term_memories': len(self.memory_manager.long_term_memory),
+        }
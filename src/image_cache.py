@@ -1,18 +1,105 @@
-from PyQt5 import QtGui
+import os
+from collections import OrderedDict
+from PyQt5 import QtCore, QtGui
 
 class ImageCache:
-    """Global image cache to prevent duplicate loading"""
-    _cache = {}
-    
+    """
+    Global pixmap cache shared by the game and plugins.
+
+    Entries are keyed by (path, size, transform, tint), so a scaled or tinted
+    variant is built once and reused by every caller that asks for the same
+    one. The cache holds at most `budget_bytes` of pixel data and drops the
+    least recently used entries beyond that.
+    """
+    _cache = OrderedDict()  # key -> QPixmap, least recently used first
+    _cache_bytes = 0
+    budget_bytes = 64 * 1024 * 1024
+    hits = 0
+    misses = 0
+
     @classmethod
-    def get_pixmap(cls, path):
-        """Get a pixmap from cache or load it"""
-        if path not in cls._cache:
+    def get_pixmap(cls, path, size=None, transform=QtCore.Qt.SmoothTransformation, tint=None):
+        """
+        Get a pixmap from cache or load it.
+
+        size: optional (width, height) to scale into, keeping the aspect ratio
+        transform: Qt transformation mode used for scaling
+        tint: optional QColor applied to the white parts of the image
+        """
+        key = cls._key(path, size, transform, tint)
+        pixmap = cls._cache.get(key)
+        if pixmap is not None:
+            cls._cache.move_to_end(key)
+            cls.hits += 1
+            return pixmap
+
+        cls.misses += 1
+        if size is None and tint is None:
             pixmap = QtGui.QPixmap(path)
-            cls._cache[path] = pixmap
-        return cls._cache[path]
-    
+        else:
+            pixmap = cls.get_pixmap(path)
+            if not pixmap.isNull():
+                if size is not None:
+                    pixmap = pixmap.scaled(int(size[0]), int(size[1]), QtCore.Qt.KeepAspectRatio, transform)
+                if tint is not None:
+                    from .sprite_atlas import tint_pixmap
+                    pixmap = tint_pixmap(pixmap, tint)
+
+        if pixmap.isNull():
+            return pixmap  # Missing files are not cached, they may appear later
+
+        cls._cache[key] = pixmap
+        cls._cache_bytes += cls._pixmap_bytes(pixmap)
+        cls._evict()
+        return pixmap
+
+    @classmethod
+    def warm_up(cls, requests):
+        """
+        Load pixmaps ahead of first use.
+
+        requests: iterable of paths or (path, size) tuples
+        """
+        for request in requests:
+            if isinstance(request, (tuple, list)):
+                cls.get_pixmap(request[0], request[1])
+            else:
+                cls.get_pixmap(request)
+
+    @classmethod
+    def stats(cls):
+        return {
+            'entries': len(cls._cache),
+            'bytes': cls._cache_bytes,
+            'budget_bytes': cls.budget_bytes,
+            'hits': cls.hits,
+            'misses': cls.misses,
+        }
+
     @classmethod
     def clear(cls):
         """Clear cache to free memory"""
-        cls._cache.clear()
\ No newline at end of file
+        cls._cache.clear()
+        cls._cache_bytes = 0
+
+    @staticmethod
+    def _key(path, size, transform, tint):
+        path = os.path.normcase(os.path.abspath(path))
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+        else:
+            transform = None  # Unscaled pixmaps do not depend on the mode
+        if tint is not None:
+            tint = QtGui.QColor(tint).rgb()
+        return (path, size, int(transform) if transform is not None else None, tint)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    @classmethod
+    def _evict(cls):
+        # The newest entry always stays, even when it alone exceeds the budget
+        while cls._cache_bytes > cls.budget_bytes and len(cls._cache) > 1:
+            _, pixmap = cls._cache.popitem(last=False)
+            cls._cache_bytes -= cls._pixmap_bytes(pixmap)
@@ -1,5 +1,4 @@
 import random
-from PyQt5 import QtCore
 import csv
 import time
 import json
@@ -580,6 +579,7 @@ class HebbianLearning:
         # Activate neurogenesis boost
         self.neurogenesis_active = True
         self.last_neurogenesis_time = time.time()
+        from PyQt5 import QtCore  # LearningConfig must stay importable without Qt
         QtCore.QTimer.singleShot(10000, self.end_neurogenesis_boost)  # 10 second boost
         
         return new_name
@@ -597,6 +597,7 @@ class LearningConfig:
             'max_weight': 1.0,
             'min_weight': -1.0,
             'learning_interval': 30000,
+            'full_coverage': False,  # Learn on every active pair each cycle instead of 2 random pairs
             'goal_weights': {
                 'organize_decorations': 0.5,
                 'interact_with_rocks': 0.7,
@@ -604,6 +605,14 @@ class LearningConfig:
             }
         }
         
+        # Forward propagation of activations through the weights (see activation.py)
+        self.propagation = {
+            'enabled': False,        # Opt-in: changes the values the DecisionEngine sees
+            'activation': 'linear',  # linear, tanh, sigmoid or relu
+            'leak': 0.5,             # Fraction of the old activation replaced each tick
+            'coupling': 0.3          # How strongly the network nudges stat-driven neurons
+        }
+
         # Initialize neurogenesis with values matching config.ini
         self.neurogenesis = {
             'novelty_threshold': 2.5,  # Match config.ini value
@@ -635,6 +644,12 @@ class LearningConfig:
                 self.neurogenesis['reward_threshold'] = neuro_config['triggers']['reward']['threshold']
                 self.neurogenesis['cooldown'] = neuro_config['general']['cooldown']
                 self.neurogenesis['decay_rate'] = neuro_config['triggers']['novelty']['decay_rate']
+
+            # Hebbian learning mode
+            self.hebbian.update(config_manager.get_hebbian_config())
+
+            # Activation propagation switch and parameters
+            self.propagation.update(config_manager.get_propagation_config())
             
             print("Configuration loaded from config.ini")
         except Exception as e:
@@ -0,0 +1,195 @@
+import atexit
+import copy
+import json
+import os
+import threading
+from datetime import datetime
+
+
+def _serialize_memory(memory):
+    """Copy of a memory item with float timestamps as ISO strings (the snapshot format)"""
+    item = dict(memory)
+    if isinstance(item.get('timestamp'), float):
+        item['timestamp'] = datetime.fromtimestamp(item['timestamp']).isoformat()
+    return item
+
+
+class MemoryJournal:
+    """
+    Append-only persistence for memory lists.
+
+    Every memory file (e.g. ``_memory/ShortTerm.json``) gets a JSON Lines
+    journal next to it (``ShortTerm.jsonl``). A change to a single memory is
+    one small journal line: ``put`` (insert or replace by category/key),
+    ``del`` or ``reset``. Lines are buffered and written by a background
+    thread after `debounce` seconds, so the Qt event loop never waits on
+    disk I/O. Once a journal grows past `compact_after` lines, the full
+    list is written to the snapshot file (same format as before) and the
+    journal is truncated.
+
+    Journals are keyed by file path, so one writer serves every
+    MemoryManager; use MemoryJournal.shared() rather than a new instance.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, debounce=1.0, compact_after=500):
+        self.debounce = debounce
+        self.compact_after = compact_after
+        self._pending = []          # [(file_path, kind, payload)] in order
+        self._line_counts = {}      # file_path -> journal lines queued since the last snapshot
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="MemoryJournal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def shared(cls):
+        """The process-wide journal (one writer thread for all memory files)"""
+        with cls._shared_lock:
+            if cls._shared is None or cls._shared._closed.is_set():
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def journal_path(file_path):
+        return os.path.splitext(file_path)[0] + '.jsonl'
+
+    # ------------------------------------------------------------------
+    # Recording changes (called from the GUI thread)
+    # ------------------------------------------------------------------
+    def put(self, file_path, memory):
+        self._append(file_path, {'op': 'put', 'memory': dict(memory)})
+
+    def delete(self, file_path, category, key):
+        self._append(file_path, {'op': 'del', 'category': category, 'key': key})
+
+    def reset(self, file_path, memories):
+        """Replace the whole list; written as a compacted snapshot"""
+        # Deep copy: memory values are nested dicts the game keeps editing
+        self._queue(file_path, 'snapshot', copy.deepcopy(list(memories)))
+
+    def _append(self, file_path, entry):
+        # Serialize now so later in-place edits can't race with the writer thread
+        self._queue(file_path, 'line', json.dumps(entry, default=str))
+
+    def _queue(self, file_path, kind, payload):
+        if file_path is None:
+            return
+        with self._lock:
+            self._pending.append((file_path, kind, payload))
+            if kind == 'line':
+                self._line_counts[file_path] = self._line_counts.get(file_path, 0) + 1
+            else:
+                self._line_counts[file_path] = 0
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Writing (background thread)
+    # ------------------------------------------------------------------
+    def _run(self):
+        while not self._closed.is_set():
+            self._wakeup.wait()
+            # Debounce: let a burst of writes collect before touching the disk.
+            # close() ends the wait early and does the final flush itself.
+            if self._closed.wait(self.debounce):
+                break
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far (safe to call from any thread)"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        with self._io_lock:
+            lines = {}
+            for file_path, kind, payload in pending:
+                if kind == 'line':
+                    lines.setdefault(file_path, []).append(payload)
+                    continue
+                # A snapshot supersedes everything before it for that file
+                self._write_lines(lines.pop(file_path, []), file_path)
+                self._write_snapshot(file_path, payload)
+
+            for file_path, file_lines in lines.items():
+                self._write_lines(file_lines, file_path)
+
+    def compact(self, file_path, memories):
+        """Queue a snapshot of `memories` if the journal for file_path is getting long"""
+        if self._line_counts.get(file_path, 0) >= self.compact_after:
+            self.reset(file_path, memories)
+
+    def _write_lines(self, lines, file_path):
+        if not lines:
+            return
+        try:
+            os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+            with open(self.journal_path(file_path), 'a') as journal:
+                journal.write('\n'.join(lines) + '\n')
+        except Exception as e:
+            print(f"Error writing memory journal for {file_path}: {e}")
+
+    def _write_snapshot(self, file_path, memories):
+        try:
+            os.makedirs(os.path.dirname(file_path) or '.', exist_ok=True)
+            tmp_path = file_path + '.tmp'
+            with open(tmp_path, 'w') as file:
+                json.dump([_serialize_memory(m) for m in memories], file, indent=4, default=str)
+            os.replace(tmp_path, file_path)
+            # Everything in the journal is now part of the snapshot
+            open(self.journal_path(file_path), 'w').close()
+        except Exception as e:
+            print(f"Error saving memory to {file_path}: {e}")
+
+    def close(self):
+        """Flush synchronously and stop the writer thread"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wakeup.set()
+        atexit.unregister(self.close)
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    @classmethod
+    def replay(cls, file_path, memories):
+        """Apply the journal for file_path on top of the snapshot list `memories`"""
+        journal_file = cls.journal_path(file_path)
+        if not os.path.exists(journal_file):
+            return memories
+
+        try:
+            with open(journal_file, 'r') as journal:
+                for line in journal:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn last line from a crash; everything before it is still valid
+                        continue
+                    op = entry.get('op')
+                    if op == 'put':
+                        memory = entry['memory']
+                        for i, existing in enumerate(memories):
+                            if existing.get('category') == memory.get('category') and existing.get('key') == memory.get('key'):
+                                memories[i] = memory
+                                break
+                        else:
+                            memories.append(memory)
+                    elif op == 'del':
+                        memories = [m for m in memories
+                                    if not (m.get('category') == entry.get('category') and m.get('key') == entry.get('key'))]
+        except Exception as e:
+            print(f"Error replaying memory journal {journal_file}: {e}")
+        return memories
@@ -1,86 +1,163 @@
+import copy
 import json
 import os
 from datetime import datetime
 import time
+from .memory_journal import MemoryJournal
+from .memory_store import MemoryStore
 
 class MemoryManager:
-    def __init__(self):
-        self.memory_dir = '_memory'
-        self.short_term_file = os.path.join(self.memory_dir, 'ShortTerm.json')
-        self.long_term_file = os.path.join(self.memory_dir, 'LongTerm.json')
+    def __init__(self, memory_dir='_memory', clock=None):
+        # memory_dir=None keeps memories in RAM only (used by the headless simulation)
+        self.memory_dir = memory_dir
+        self.clock = clock or time.time
+        if memory_dir is None:
+            self.short_term_file = None
+            self.long_term_file = None
+            self.journal = None
+        else:
+            self.short_term_file = os.path.join(self.memory_dir, 'ShortTerm.json')
+            self.long_term_file = os.path.join(self.memory_dir, 'LongTerm.json')
+            # Writes go to an append-only journal flushed in the background
+            self.journal = MemoryJournal.shared()
         
+        # Saved memory lists handed over by load_saved_memories(), decoded on first use
+        self._saved_short_term = None
+        self._saved_long_term = None
+
         # Load memory and ensure all timestamps are converted to floats
         self.short_term_memory = self._load_and_convert_timestamps(self.short_term_file)
         self.long_term_memory = self._load_and_convert_timestamps(self.long_term_file)
         
         self.short_term_limit = 50
         self.short_term_duration = 300  # 5 minutes in seconds
-        self.last_cleanup_time = time.time()
+        self.last_cleanup_time = self.clock()
+
+    # Memories are kept in MemoryStores indexed by (category, key); assigning a
+    # plain list (e.g. from a save file) re-indexes it.
+    @property
+    def short_term_memory(self):
+        if self._saved_short_term is not None:
+            saved, self._saved_short_term = self._saved_short_term, None
+            memories = saved()
+            if memories:
+                self.short_term_memory = memories
+        return self._short_term_memory
+
+    @short_term_memory.setter
+    def short_term_memory(self, memories):
+        self._saved_short_term = None
+        self._short_term_memory = memories if isinstance(memories, MemoryStore) else MemoryStore(memories or [])
+
+    @property
+    def long_term_memory(self):
+        if self._saved_long_term is not None:
+            saved, self._saved_long_term = self._saved_long_term, None
+            memories = saved()
+            if memories:
+                self.long_term_memory = memories
+        return self._long_term_memory
+
+    @long_term_memory.setter
+    def long_term_memory(self, memories):
+        self._saved_long_term = None
+        self._long_term_memory = memories if isinstance(memories, MemoryStore) else MemoryStore(memories or [])
+
+    def load_saved_memories(self, save_data):
+        """
+        Use the ShortTerm/LongTerm lists of a loaded save. They are only decoded
+        when the memories are first used; a section that is missing or empty
+        keeps the memories loaded from the memory files. The files themselves
+        catch up through the journal and the next save.
+        """
+        self._saved_short_term = lambda: save_data['ShortTerm'] if 'ShortTerm' in save_data else None
+        self._saved_long_term = lambda: save_data['LongTerm'] if 'LongTerm' in save_data else None
 
     def _load_and_convert_timestamps(self, file_path):
-        """Loads memory from JSON and converts all timestamps to floats."""
-        if not os.path.exists(file_path):
+        """Loads memory from the JSON snapshot plus its journal and converts all timestamps to floats."""
+        if file_path is None:
             return []
         try:
-            with open(file_path, 'r') as file:
-                content = file.read()
-                if not content.strip():
-                    return []
-                memory_list = json.loads(content)
+            memory_list = []
+            if os.path.exists(file_path):
+                with open(file_path, 'r') as file:
+                    content = file.read()
+                if content.strip():
+                    memory_list = json.loads(content)
                 if not isinstance(memory_list, list):
-                    return []
-
-                for item in memory_list:
-                    if 'timestamp' in item:
-                        ts = item['timestamp']
-                        if isinstance(ts, str):
-                            try:
-                                # Convert ISO string to float timestamp
-                                item['timestamp'] = datetime.fromisoformat(ts).timestamp()
-                            except (ValueError, TypeError):
-                                # If conversion fails, set a default invalid timestamp
-                                item['timestamp'] = 0
-                        elif not isinstance(ts, (int, float)):
-                            item['timestamp'] = 0 # Mark other invalid types
-                return memory_list
+                    memory_list = []
+            memory_list = MemoryJournal.replay(file_path, memory_list)
+            for item in memory_list:
+                if 'timestamp' in item:
+                    ts = item['timestamp']
+                    if isinstance(ts, str):
+                        try:
+                            # Convert ISO string to float timestamp
+                            item['timestamp'] = datetime.fromisoformat(ts).timestamp()
+                        except (ValueError, TypeError):
+                            # If conversion fails, set a default invalid timestamp
+                            item['timestamp'] = 0
+                    elif not isinstance(ts, (int, float)):
+                        item['timestamp'] = 0 # Mark other invalid types
+            return memory_list
         except (json.JSONDecodeError, Exception) as e:
             print(f"Error processing memory file {file_path}: {e}")
             return []
 
     def save_memory(self, memory, file_path):
-        """Saves memory to JSON, converting float timestamps to ISO strings."""
-        if not memory:
-            # To clear a file, we can write an empty list
-            memory_to_save = []
-        else:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            serializable_memory = []
-            for item in memory:
-                new_item = item.copy()
-                if 'timestamp' in new_item and isinstance(new_item['timestamp'], float):
-                    new_item['timestamp'] = datetime.fromtimestamp(new_item['timestamp']).isoformat()
-                serializable_memory.append(new_item)
-            memory_to_save = serializable_memory
+        """Persists a full memory list. The snapshot is written by the journal's background thread."""
+        if file_path is None or self.journal is None:
+            return
+        self.journal.reset(file_path, memory)
 
-        try:
-            with open(file_path, 'w') as file:
-                json.dump(memory_to_save, file, indent=4)
-        except Exception as e:
-            print(f"Error saving memory to {file_path}: {e}")
+    def load_memory(self, file_path):
+        """Loads a memory list (snapshot + journal) from disk."""
+        return self._load_and_convert_timestamps(file_path)
+
+    def get_memories_data(self):
+        """
+        Copies of both memory lists for a save file. The journals are compacted
+        into the snapshot files as well, so the memory folder matches the save.
+        """
+        short_term = copy.deepcopy(self.short_term_memory.to_list())
+        long_term = copy.deepcopy(self.long_term_memory.to_list())
+        self.save_memory(short_term, self.short_term_file)
+        self.save_memory(long_term, self.long_term_file)
+        return {'ShortTerm': short_term, 'LongTerm': long_term}
+
+    def flush_memory(self):
+        """Writes any buffered memory changes to disk right away."""
+        if self.journal is not None:
+            self.journal.flush()
+
+    def _record_put(self, memory, file_path, memory_list):
+        """Journals a single added/changed memory (O(1) disk I/O)."""
+        if file_path is None or self.journal is None:
+            return
+        self.journal.put(file_path, memory)
+        self.journal.compact(file_path, memory_list)
+
+    def _record_delete(self, memory, file_path):
+        if file_path is None or self.journal is None:
+            return
+        self.journal.delete(file_path, memory.get('category'), memory.get('key'))
 
 
     def add_short_term_memory(self, category, key, value, importance=1.0, related_neurons=None):
         """Adds a memory, using float timestamps."""
-        for memory in self.short_term_memory:
-            if memory.get('key') == key and memory.get('category') == category:
-                memory['importance'] = memory.get('importance', 1.0) + 0.5
-                memory['timestamp'] = time.time()
-                if memory['importance'] >= 3.0:
-                    self.transfer_to_long_term_memory(category, key)
-                return
+        memory = self.short_term_memory.get(category, key)
+        if memory is not None:
+            memory['importance'] = memory.get('importance', 1.0) + 0.5
+            memory['timestamp'] = self.clock()
+            self.short_term_memory.touch(memory)
+            if memory['importance'] >= 3.0:
+                self.transfer_to_long_term_memory(category, key)
+            else:
+                self._record_put(memory, self.short_term_file, self.short_term_memory)
+            return
 
         memory_item = {
-            "timestamp": time.time(),
+            "timestamp": self.clock(),
             "category": category,
             "key": key,
             "value": value,
@@ -90,43 +167,49 @@ class MemoryManager:
         }
         self.short_term_memory.append(memory_item)
         if len(self.short_term_memory) > self.short_term_limit:
-            self.short_term_memory.pop(0)
-        self.save_memory(self.short_term_memory, self.short_term_file)
+            self._record_delete(self.short_term_memory.pop(0), self.short_term_file)
+        self._record_put(memory_item, self.short_term_file, self.short_term_memory)
 
     def cleanup_short_term_memory(self):
-        current_time = time.time()
-        self.short_term_memory = [m for m in self.short_term_memory if isinstance(m.get('timestamp'), (int, float)) and (current_time - m.get('timestamp', 0)) <= self.short_term_duration]
-        if len(self.short_term_memory) > self.short_term_limit:
-            self.short_term_memory.sort(key=lambda x: (x.get('importance', 1), x.get('access_count', 0)), reverse=True)
-            self.short_term_memory = self.short_term_memory[:self.short_term_limit]
+        # Expiry is incremental: only memories older than the cutoff are visited
+        cutoff = self.clock() - self.short_term_duration
+        for memory in self.short_term_memory.expire(cutoff):
+            self._record_delete(memory, self.short_term_file)
+        excess = len(self.short_term_memory) - self.short_term_limit
+        if excess > 0:
+            for memory in self.short_term_memory.lowest(excess):
+                self.short_term_memory.remove(memory)
+                self._record_delete(memory, self.short_term_file)
 
     def add_long_term_memory(self, category, key, value):
         """Adds a memory to long-term storage, preventing duplicates."""
-        for memory in self.long_term_memory:
-            if memory.get('key') == key and memory.get('category') == category:
-                # Memory already exists, so we don't add it again.
-                # Optional: update timestamp to reflect it's a reinforced memory
-                memory['timestamp'] = time.time()
-                self.save_memory(self.long_term_memory, self.long_term_file)
-                return
-
-        memory = {'category': category, 'key': key, 'value': value, 'timestamp': time.time()}
+        memory = self.long_term_memory.get(category, key)
+        if memory is not None:
+            # Memory already exists, so we don't add it again.
+            # Optional: update timestamp to reflect it's a reinforced memory
+            memory['timestamp'] = self.clock()
+            self.long_term_memory.touch(memory)
+            self._record_put(memory, self.long_term_file, self.long_term_memory)
+            return
+
+        memory = {'category': category, 'key': key, 'value': value, 'timestamp': self.clock()}
         self.long_term_memory.append(memory)
-        self.save_memory(self.long_term_memory, self.long_term_file)
+        self._record_put(memory, self.long_term_file, self.long_term_memory)
 
     def get_short_term_memory(self, category, key, default=None):
-        current_time = time.time()
-        for memory in self.short_term_memory:
-            if memory.get('category') == category and memory.get('key') == key:
-                ts = memory.get('timestamp', 0)
-                if isinstance(ts, (int, float)) and (current_time - ts) <= self.short_term_duration:
-                    memory['access_count'] = memory.get('access_count', 0) + 1
-                    return memory.get('value')
+        current_time = self.clock()
+        memory = self.short_term_memory.get(category, key)
+        if memory is not None:
+            ts = memory.get('timestamp', 0)
+            if isinstance(ts, (int, float)) and (current_time - ts) <= self.short_term_duration:
+                memory['access_count'] = memory.get('access_count', 0) + 1
+                self.short_term_memory.touch(memory)
+                return memory.get('value')
         return default
 
     def get_all_short_term_memories(self, raw=False):
         """Retrieves all valid short-term memories."""
-        current_time = time.time()
+        current_time = self.clock()
         valid_memories = [
             m for m in self.short_term_memory
             if isinstance(m.get('timestamp'), (int, float)) and (current_time - m.get('timestamp', 0)) <= self.short_term_duration
@@ -142,50 +225,55 @@ class MemoryManager:
 
     def get_active_memories_data(self, count=None):
         """Gets active memories, ensuring timestamps are floats before use."""
-        current_time = time.time()
-        active_memories = []
-        for memory in self.short_term_memory:
+        cutoff = self.clock() - self.short_term_duration
+
+        def is_active(memory):
             timestamp = memory.get('timestamp')
-            # Now we can reliably expect a float
-            if isinstance(timestamp, (int, float)) and (current_time - timestamp) <= self.short_term_duration:
-                formatted_memory = {
-                    'category': memory.get('category'),
-                    'key': memory.get('key'),
-                    'formatted_value': memory.get('value'),
-                    'raw_value': memory.get('value'),
-                    'timestamp': datetime.fromtimestamp(timestamp),
-                    'importance': memory.get('importance', 1),
-                    'access_count': memory.get('access_count', 0)
-                }
-                active_memories.append(formatted_memory)
-        
-        active_memories.sort(key=lambda x: (x.get('importance', 1), x.get('access_count', 0)), reverse=True)
-        return active_memories[:count] if count is not None else active_memories
+            return isinstance(timestamp, (int, float)) and timestamp >= cutoff
+
+        # Already ordered by (importance, access_count) via the store's priority heap
+        active_memories = []
+        for memory in self.short_term_memory.top(count, is_active):
+            active_memories.append({
+                'category': memory.get('category'),
+                'key': memory.get('key'),
+                'formatted_value': memory.get('value'),
+                'raw_value': memory.get('value'),
+                'timestamp': datetime.fromtimestamp(memory['timestamp']),
+                'importance': memory.get('importance', 1),
+                'access_count': memory.get('access_count', 0)
+            })
+        return active_memories
 
     def review_and_transfer_memories(self):
-        current_time = time.time()
-        # Iterate over a copy as we may modify the list
-        for memory in list(self.short_term_memory):
-            timestamp = memory.get('timestamp', 0)
-            if isinstance(timestamp, (int, float)) and (current_time - timestamp) > self.short_term_duration:
-                if self.should_transfer_to_long_term(memory):
-                    self.transfer_to_long_term_memory(memory['category'], memory['key'])
-                else:
-                    self.short_term_memory.remove(memory)
+        # Only memories that have reached the front of the expiry queue are visited
+        cutoff = self.clock() - self.short_term_duration
+        for memory in self.short_term_memory.expired(cutoff):
+            if self.should_transfer_to_long_term(memory):
+                self.transfer_to_long_term_memory(memory['category'], memory['key'])
+            else:
+                self.short_term_memory.remove(memory)
+                self._record_delete(memory, self.short_term_file)
         self.cleanup_short_term_memory()
         
+    def age_memories(self, seconds):
+        """Make short-term memories `seconds` older (used when fast-forwarding the simulation)."""
+        if seconds <= 0:
+            return
+        for memory in self.short_term_memory:
+            if isinstance(memory.get('timestamp'), (int, float)):
+                memory['timestamp'] -= seconds
+        self.short_term_memory.reindex()
+        self.save_memory(self.short_term_memory, self.short_term_file)
+
     def periodic_memory_management(self):
-        if (time.time() - self.last_cleanup_time) > 30:
-            self.last_cleanup_time = time.time()
+        if (self.clock() - self.last_cleanup_time) > 30:
+            self.last_cleanup_time = self.clock()
             self.review_and_transfer_memories()
 
     def transfer_to_long_term_memory(self, category, key):
         """Transfers an important memory from short-term to long-term storage."""
-        memory_to_transfer = None
-        for mem in self.short_term_memory:
-             if mem.get('category') == category and mem.get('key') == key:
-                  memory_to_transfer = mem
-                  break
+        memory_to_transfer = self.short_term_memory.get(category, key)
         if memory_to_transfer:
             # Use the new add_long_term_memory to handle duplicates
             self.add_long_term_memory(
@@ -195,7 +283,7 @@ class MemoryManager:
             )
             # Remove from short-term memory to prevent re-transfer
             self.short_term_memory.remove(memory_to_transfer)
-            self.save_memory(self.short_term_memory, self.short_term_file)
+            self._record_delete(memory_to_transfer, self.short_term_file)
 
     def should_transfer_to_long_term(self, memory):
         return (memory.get('importance', 1) >= 7 or
@@ -208,11 +296,11 @@ class MemoryManager:
         self.save_memory(self.short_term_memory, self.short_term_file)
 
     def update_memory_importance(self, category, key, importance_change):
-        for memory in self.short_term_memory:
-            if memory.get('category') == category and memory.get('key') == key:
-                memory['importance'] = max(1, min(10, memory.get('importance', 1) + importance_change))
-                self.save_memory(self.short_term_memory, self.short_term_file)
-                break
+        memory = self.short_term_memory.get(category, key)
+        if memory is not None:
+            memory['importance'] = max(1, min(10, memory.get('importance', 1) + importance_change))
+            self.short_term_memory.touch(memory)
+            self._record_put(memory, self.short_term_file, self.short_term_memory)
 
     def clear_all_memories(self):
         self.short_term_memory = []
@@ -0,0 +1,208 @@
+import heapq
+import itertools
+
+
+class MemoryStore:
+    """
+    Memory items indexed by (category, key).
+
+    Iterates in insertion order like the old list of dicts, but lookups,
+    inserts and removals are O(1). Two lazy heaps sit on top of the index:
+      - priority heap ordered by (importance, access_count), for top-N queries
+      - expiry queue ordered by timestamp, for incremental expiry
+    Heap entries carry a per-memory version; entries made stale by later
+    changes are dropped when they reach the top. Call touch() after changing
+    a memory's importance, access_count or timestamp in place (stale
+    priorities are also detected and repaired on the fly).
+    """
+
+    def __init__(self, memories=()):
+        self._items = {}       # (category, key) -> memory dict, insertion ordered
+        self._order = {}       # (category, key) -> insertion sequence (tie-break like a stable sort)
+        self._version = {}     # (category, key) -> current heap entry version
+        self._priority = []    # [(-importance, -access_count, seq, mem_key, version)]
+        self._expiry = []      # [(timestamp, seq, mem_key, version)]
+        self._counter = itertools.count()
+        self._versions = itertools.count(1)  # Never reused, so entries of removed memories can't come back to life
+        for memory in memories:
+            self.add(memory)
+
+    @staticmethod
+    def key_of(memory):
+        return (memory.get('category'), memory.get('key'))
+
+    @staticmethod
+    def _timestamp(memory):
+        ts = memory.get('timestamp', 0)
+        return ts if isinstance(ts, (int, float)) else 0
+
+    # ------------------------------------------------------------------
+    # List-like interface
+    # ------------------------------------------------------------------
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __getitem__(self, index):
+        return list(self._items.values())[index]
+
+    def __contains__(self, memory):
+        mem_key = self.key_of(memory)
+        return self._items.get(mem_key) is memory
+
+    def __repr__(self):
+        return f"MemoryStore({list(self._items.values())!r})"
+
+    def to_list(self):
+        return list(self._items.values())
+
+    def append(self, memory):
+        self.add(memory)
+
+    def remove(self, memory):
+        mem_key = self.key_of(memory)
+        if self._items.get(mem_key) is not memory:
+            raise ValueError("memory not in store")
+        self.discard(*mem_key)
+
+    def pop(self, index=-1):
+        if not self._items:
+            raise IndexError("pop from empty MemoryStore")
+        if index == 0:
+            mem_key = next(iter(self._items))
+        elif index == -1:
+            mem_key = next(reversed(self._items))
+        else:
+            mem_key = self.key_of(self[index])
+        return self.discard(*mem_key)
+
+    # ------------------------------------------------------------------
+    # Indexed access
+    # ------------------------------------------------------------------
+    def get(self, category, key):
+        return self._items.get((category, key))
+
+    def add(self, memory):
+        """Insert a memory, replacing any existing one with the same (category, key)"""
+        mem_key = self.key_of(memory)
+        if mem_key not in self._items:
+            self._order[mem_key] = next(self._counter)
+        self._items[mem_key] = memory
+        self.touch(memory)
+        return memory
+
+    def discard(self, category, key):
+        """Remove and return the memory for (category, key), or None"""
+        mem_key = (category, key)
+        memory = self._items.pop(mem_key, None)
+        if memory is not None:
+            self._order.pop(mem_key, None)
+            self._version.pop(mem_key, None)
+        return memory
+
+    def touch(self, memory):
+        """Re-index a memory after its importance, access_count or timestamp changed"""
+        if self._push(memory) and len(self._priority) > 4 * len(self._items) + 64:
+            # Keep the lazy heaps from growing without bound
+            self.reindex()
+
+    def _push(self, memory):
+        mem_key = self.key_of(memory)
+        if self._items.get(mem_key) is not memory:
+            return False
+        version = next(self._versions)
+        self._version[mem_key] = version
+        seq = self._order[mem_key]
+        heapq.heappush(self._priority, (-memory.get('importance', 1), -memory.get('access_count', 0),
+                                        seq, mem_key, version))
+        heapq.heappush(self._expiry, (self._timestamp(memory), seq, mem_key, version))
+        return True
+
+    def reindex(self):
+        """Rebuild both heaps from scratch (after bulk in-place edits)"""
+        self._priority = []
+        self._expiry = []
+        self._version = {}
+        for mem_key, memory in self._items.items():
+            version = next(self._versions)
+            self._version[mem_key] = version
+            seq = self._order[mem_key]
+            self._priority.append((-memory.get('importance', 1), -memory.get('access_count', 0),
+                                   seq, mem_key, version))
+            self._expiry.append((self._timestamp(memory), seq, mem_key, version))
+        heapq.heapify(self._priority)
+        heapq.heapify(self._expiry)
+
+    def _is_current(self, mem_key, version):
+        return mem_key in self._items and self._version.get(mem_key) == version
+
+    # ------------------------------------------------------------------
+    # Priority queries
+    # ------------------------------------------------------------------
+    def top(self, count=None, predicate=None):
+        """
+        Memories ordered by (importance, access_count) descending, ties in insertion order.
+        Only memories passing `predicate` are returned; at most `count` of them.
+        """
+        if count is None:
+            count = len(self._items)
+        result = []
+        popped = []
+        heap = self._priority
+        while heap and len(result) < count:
+            entry = heapq.heappop(heap)
+            neg_importance, neg_access, seq, mem_key, version = entry
+            if not self._is_current(mem_key, version):
+                continue  # Stale entry: superseded or removed
+            memory = self._items[mem_key]
+            if (-neg_importance, -neg_access) != (memory.get('importance', 1), memory.get('access_count', 0)):
+                # Changed in place without touch(): re-queue with the current priority
+                self._push(memory)
+                continue
+            popped.append(entry)
+            if predicate is None or predicate(memory):
+                result.append(memory)
+        for entry in popped:
+            heapq.heappush(heap, entry)
+        return result
+
+    def lowest(self, count):
+        """The `count` least important memories (used when trimming to a size limit)"""
+        ordered = sorted(self._items.values(),
+                         key=lambda m: (m.get('importance', 1), m.get('access_count', 0)))
+        return ordered[:count]
+
+    # ------------------------------------------------------------------
+    # Expiry
+    # ------------------------------------------------------------------
+    def expired(self, cutoff):
+        """
+        Memories with timestamp < cutoff, oldest first. Their expiry entries are consumed,
+        so callers must remove them (or touch() them to re-queue).
+        """
+        result = []
+        heap = self._expiry
+        while heap and heap[0][0] < cutoff:
+            timestamp, seq, mem_key, version = heapq.heappop(heap)
+            if not self._is_current(mem_key, version):
+                continue
+            memory = self._items[mem_key]
+            current_ts = self._timestamp(memory)
+            if current_ts != timestamp:
+                # Timestamp changed in place without touch(): re-queue at the right spot
+                self._push(memory)
+                continue
+            result.append(memory)
+        return result
+
+    def expire(self, cutoff):
+        """Remove and return every memory with timestamp < cutoff"""
+        expired = self.expired(cutoff)
+        for memory in expired:
+            self.discard(*self.key_of(memory))
+        return expired
@@ -2,6 +2,7 @@
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 import os
+from .image_cache import ImageCache
 
 class MentalState:
     def __init__(self, name, icon_filename):
@@ -24,6 +25,9 @@ class MentalStateManager:
             "curious": MentalState("curious", "curious.png")        #   CURIOUS
         }
 
+        # Load the icons now so the first state change does not hit the disk
+        ImageCache.warm_up(os.path.join("images", state.icon_filename) for state in self.mental_states.values())
+
     def set_mental_states_enabled(self, enabled):
         self.mental_states_enabled = enabled
         if not enabled:
@@ -43,7 +47,7 @@ class MentalStateManager:
     def update_icon_state(self, state):
         if state.is_active:
             if state.icon_item is None:
-                icon_pixmap = QtGui.QPixmap(os.path.join("images", state.icon_filename))
+                icon_pixmap = ImageCache.get_pixmap(os.path.join("images", state.icon_filename))
                 state.icon_item = QtWidgets.QGraphicsPixmapItem(icon_pixmap)
                 self.scene.addItem(state.icon_item)
             self.update_icon_position(state.icon_item)
@@ -0,0 +1,122 @@
+import numpy as np
+
+
+def _neighbour_pairs(positions, cell_size):
+    """
+    Index pairs (i, j), i != j, of points in the same or adjacent grid cells.
+
+    With `cell_size` at least the repulsion cut-off, every pair close enough
+    to interact is included, so the grid gives the same forces as comparing
+    all pairs while only looking at nearby points.
+    """
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0) - 1  # Keep neighbour cells non-negative
+    stride = int(cells[:, 1].max()) + 2
+    keys = cells[:, 0] * stride + cells[:, 1]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    rows, cols = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbour_keys = keys + dx * stride + dy
+            lo = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+            hi = np.searchsorted(sorted_keys, neighbour_keys, side='right')
+            counts = hi - lo
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # Expand each point's [lo, hi) range of sorted neighbours
+            starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+            rows.append(np.repeat(np.arange(len(positions)), counts))
+            cols.append(order[starts + np.arange(total)])
+
+    if not rows:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    distinct = rows != cols
+    return rows[distinct], cols[distinct]
+
+
+class ForceLayout:
+    """
+    Force-directed layout for neuron positions, one relaxation step at a time.
+
+    Neurons closer than `threshold` push each other apart; with `spring` > 0,
+    weighted connections also pull their neurons toward `rest_length` apart.
+    Small networks compare every pair at once; from `grid_min_neurons` on,
+    only neurons in neighbouring grid cells are compared. Repulsion has a
+    finite range, so the grid is exact rather than an approximation.
+    """
+
+    def __init__(self, strength=0.6, threshold=120.0, damping=0.5, spring=0.0,
+                 rest_length=200.0, bounds=(50, 50, 974, 668), grid_min_neurons=64):
+        self.strength = strength
+        self.threshold = threshold
+        self.damping = damping
+        self.spring = spring
+        self.rest_length = rest_length
+        self.bounds = bounds
+        self.grid_min_neurons = grid_min_neurons
+
+    def forces(self, positions, edges=None, edge_weights=None, strength=None, threshold=None):
+        """Displacement of every neuron for one step, as an (N, 2) array"""
+        strength = self.strength if strength is None else strength
+        threshold = self.threshold if threshold is None else threshold
+        n = len(positions)
+        displacement = np.zeros((n, 2), dtype=np.float64)
+        if n < 2:
+            return displacement
+
+        if n >= self.grid_min_neurons:
+            rows, cols = _neighbour_pairs(positions, threshold)
+        else:
+            rows, cols = np.nonzero(~np.eye(n, dtype=bool))
+
+        delta = positions[rows] - positions[cols]
+        dist_sq = np.einsum('ij,ij->i', delta, delta)
+        close = (dist_sq > 0) & (dist_sq < threshold * threshold)
+        if close.any():
+            delta, dist_sq, rows = delta[close], dist_sq[close], rows[close]
+            distance = np.sqrt(dist_sq)
+            # (dx / d) * strength * (threshold - d) / d
+            push = delta * (strength * (threshold - distance) / dist_sq)[:, None]
+            displacement[:, 0] += np.bincount(rows, weights=push[:, 0], minlength=n)
+            displacement[:, 1] += np.bincount(rows, weights=push[:, 1], minlength=n)
+
+        if self.spring > 0 and edges is not None and len(edges):
+            edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+            weights = np.abs(np.asarray(edge_weights, dtype=np.float64)) if edge_weights is not None \
+                else np.ones(len(edges))
+            source, target = edges[:, 0], edges[:, 1]
+            delta = positions[target] - positions[source]
+            distance = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 1e-9)
+            pull = delta * (self.spring * weights * (distance - self.rest_length) / distance)[:, None]
+            displacement[:, 0] += np.bincount(source, weights=pull[:, 0], minlength=n)
+            displacement[:, 1] += np.bincount(source, weights=pull[:, 1], minlength=n)
+            displacement[:, 0] -= np.bincount(target, weights=pull[:, 0], minlength=n)
+            displacement[:, 1] -= np.bincount(target, weights=pull[:, 1], minlength=n)
+
+        return displacement
+
+    def step(self, positions, movable, edges=None, edge_weights=None, strength=None, threshold=None):
+        """
+        One relaxation step.
+
+        positions: (N, 2) array; movable: (N,) bools for neurons allowed to move
+        edges/edge_weights: optional (M, 2) index pairs and weights for springs
+        Returns (new_positions, moved).
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        displacement = self.forces(positions, edges, edge_weights, strength, threshold)
+        moving = np.asarray(movable, dtype=bool) & (np.abs(displacement) > 0.1).any(axis=1)
+        if not moving.any():
+            return positions, False
+
+        left, top, right, bottom = self.bounds
+        new_positions = positions.copy()
+        new_positions[moving] = np.clip(positions[moving] + displacement[moving] * self.damping,
+                                        (left, top), (right, bottom))
+        return new_positions, True
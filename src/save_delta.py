@@ -0,0 +1,100 @@
+import base64
+
+# Save sections diffed item by item; everything else is stored whole when it changes.
+# brain_state is split so single weights, positions and neuron states can change alone.
+KEYED_SECTIONS = (
+    'brain_state.weights',
+    'brain_state.neuron_positions',
+    'brain_state.neuron_states',
+    'ShortTerm',
+    'LongTerm',
+    'assets',
+)
+
+
+def to_view(save_data):
+    """
+    Flatten save data into sections that can be compared between autosaves.
+    Keyed sections become {key: item} dicts; the rest are kept as-is.
+    """
+    view = {}
+    for section, data in save_data.items():
+        if section == 'brain_state' and isinstance(data, dict):
+            brain = dict(data)
+            view['brain_state.weights'] = {
+                f"{source}\t{target}": weight for source, target, weight in brain.pop('weights_list', [])
+            }
+            view['brain_state.neuron_positions'] = {
+                str(name): list(xy) for name, xy in brain.pop('neuron_positions', {}).items()
+            }
+            view['brain_state.neuron_states'] = dict(brain.pop('neuron_states', {}))
+            view['brain_state'] = brain
+        elif section in ('ShortTerm', 'LongTerm'):
+            view[section] = {f"{m.get('category')}\t{m.get('key')}": m for m in data}
+        elif section == 'assets':
+            view[section] = dict(data)
+        else:
+            view[section] = data
+    return view
+
+
+def from_view(view):
+    """Inverse of to_view()"""
+    save_data = {}
+    for section, data in view.items():
+        if section.startswith('brain_state.'):
+            continue
+        if section == 'brain_state':
+            brain = dict(data)
+            brain['weights_list'] = [key.split('\t', 1) + [weight]
+                                     for key, weight in view.get('brain_state.weights', {}).items()]
+            brain['neuron_positions'] = {name: tuple(xy) for name, xy
+                                         in view.get('brain_state.neuron_positions', {}).items()}
+            brain['neuron_states'] = dict(view.get('brain_state.neuron_states', {}))
+            save_data['brain_state'] = brain
+        elif section in ('ShortTerm', 'LongTerm'):
+            save_data[section] = list(data.values())
+        else:
+            save_data[section] = data
+    return save_data
+
+
+def diff_views(old, new):
+    """
+    Changes that turn view `old` into view `new`:
+    {'sections': {name: whole value}, 'changes': {name: {'set': {...}, 'del': [...]}},
+     'removed': [names of sections no longer in the save]}
+    """
+    sections = {}
+    changes = {}
+    for section, data in new.items():
+        previous = old.get(section)
+        if section in KEYED_SECTIONS:
+            previous = previous or {}
+            changed = {key: item for key, item in data.items()
+                       if key not in previous or previous[key] != item}
+            removed = [key for key in previous if key not in data]
+            if section == 'assets':
+                removed = []  # Unused images are dropped at the next checkpoint
+                changed = {key: base64.b64encode(item).decode('ascii') for key, item in changed.items()}
+            if changed or removed:
+                changes[section] = {'set': changed, 'del': removed}
+        elif section not in old or previous != data:
+            sections[section] = data
+    removed = [section for section in old if section not in new]
+    return {'sections': sections, 'changes': changes, 'removed': removed}
+
+
+def apply_delta(view, delta):
+    """Apply one diff_views() result (as read back from JSON) to `view` in place"""
+    for section in delta.get('removed', []):
+        view.pop(section, None)
+    for section, data in delta.get('sections', {}).items():
+        view[section] = data
+    for section, change in delta.get('changes', {}).items():
+        items = view.setdefault(section, {})
+        for key in change.get('del', []):
+            items.pop(key, None)
+        for key, item in change.get('set', {}).items():
+            items[key] = base64.b64decode(item) if section == 'assets' else item
+    return view
@@ -1,8 +1,21 @@
+import io
 import json
 import os
+import threading
 import zipfile
+from collections.abc import Mapping, MutableMapping
 from datetime import datetime
-import shutil
+import uuid
+
+import numpy as np
+
+from .save_delta import apply_delta, diff_views, from_view, to_view
+
+# Folder inside the save zip holding decoration images named by content hash
+ASSET_DIR = "assets"
+
+# Version of the binary brain_state.npz layout; bump when the arrays change
+BRAIN_SCHEMA_VERSION = 1
 
 class DateTimeEncoder(json.JSONEncoder):
     """Custom JSON encoder that handles datetime objects."""
@@ -11,30 +24,173 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
+def snapshot_data(data):
+    """
+    Copy of nested dicts/lists so a save can be serialized on another thread
+    while the game keeps mutating the originals. Leaf values are shared.
+    """
+    if isinstance(data, dict):
+        return {key: snapshot_data(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [snapshot_data(value) for value in data]
+    return data
+
+def pack_brain_state(brain_state):
+    """
+    Encode a get_brain_state() dict as .npz bytes.
+
+    Weights and positions become flat arrays indexed into a shared neuron
+    name table; the small remaining dicts (states, neurogenesis data, colors)
+    are kept as one JSON string.
+    """
+    weights_list = brain_state.get('weights_list', [])
+    positions = brain_state.get('neuron_positions', {})
+
+    index = {}
+    def slot(name):
+        if name not in index:
+            index[name] = len(index)
+        return index[name]
+
+    weight_pairs = np.array([(slot(str(a)), slot(str(b))) for a, b, _ in weights_list],
+                            dtype=np.int32).reshape(-1, 2)
+    weight_values = np.array([w for _, _, w in weights_list], dtype=np.float64)
+    position_names = np.array([slot(str(name)) for name in positions], dtype=np.int32)
+    position_xy = np.array([tuple(xy)[:2] for xy in positions.values()], dtype=np.float64).reshape(-1, 2)
+
+    meta = {key: value for key, value in brain_state.items()
+            if key not in ('weights_list', 'neuron_positions')}
+
+    buffer = io.BytesIO()
+    np.savez(buffer,
+             schema_version=np.array(BRAIN_SCHEMA_VERSION, dtype=np.int32),
+             neurons=np.array(list(index), dtype=str),
+             weight_pairs=weight_pairs,
+             weight_values=weight_values,
+             position_names=position_names,
+             position_xy=position_xy,
+             meta=np.array(json.dumps(meta, cls=DateTimeEncoder)))
+    return buffer.getvalue()
+
+def unpack_brain_state(data):
+    """Decode pack_brain_state() bytes back into the dict set_brain_state expects"""
+    with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+        version = int(arrays['schema_version'])
+        if version > BRAIN_SCHEMA_VERSION:
+            raise ValueError(f"brain_state.npz schema {version} is newer than supported ({BRAIN_SCHEMA_VERSION})")
+
+        neurons = arrays['neurons'].tolist()
+        pairs = arrays['weight_pairs'].tolist()
+        values = arrays['weight_values'].tolist()
+        brain_state = json.loads(str(arrays['meta']))
+        brain_state['weights_list'] = [[neurons[a], neurons[b], w] for (a, b), w in zip(pairs, values)]
+        brain_state['neuron_positions'] = {
+            neurons[i]: tuple(xy)
+            for i, xy in zip(arrays['position_names'].tolist(), arrays['position_xy'].tolist())
+        }
+    return brain_state
+
+class _LazyAssets(Mapping):
+    """Decoration images in a save zip, read only when a decoration asks for one"""
+    def __init__(self, zipf, members):
+        self._zip = zipf
+        self._members = members  # content hash -> zip member name
+
+    def __getitem__(self, asset_hash):
+        return self._zip.read(self._members[asset_hash])
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+
+class LazySaveData(MutableMapping):
+    """
+    Contents of a save zip, decoded section by section on first access.
+
+    The file is read into memory once (so a background autosave replacing it
+    can't mix two saves), but a section such as brain_state or LongTerm is
+    only parsed when the game asks for it, and decoration images only when
+    the decoration is built.
+    """
+
+    def __init__(self, raw):
+        self._zip = zipfile.ZipFile(io.BytesIO(raw), 'r')
+        self._members = {}   # section -> zip member name
+        self._decoded = {}
+        self.checkpoint = {}
+        assets = {}
+        for filename in self._zip.namelist():
+            if filename.startswith(ASSET_DIR + '/'):
+                assets[os.path.splitext(os.path.basename(filename))[0]] = filename
+                continue
+            key = os.path.splitext(filename)[0]
+            if key == 'checkpoint':
+                self.checkpoint = json.loads(self._zip.read(filename).decode('utf-8'))
+                continue
+            self._members[key] = filename
+        if assets:
+            self._decoded['assets'] = _LazyAssets(self._zip, assets)
+
+    def __getitem__(self, key):
+        if key not in self._decoded:
+            filename = self._members[key]  # KeyError for missing sections, like a dict
+            data = self._zip.read(filename)
+            if filename.endswith('.npz'):
+                self._decoded[key] = unpack_brain_state(data)
+            else:
+                self._decoded[key] = json.loads(data.decode('utf-8'))
+        return self._decoded[key]
+
+    def __setitem__(self, key, value):
+        self._decoded[key] = value
+
+    def __delitem__(self, key):
+        found = self._members.pop(key, None) is not None
+        found = self._decoded.pop(key, None) is not None or found
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(list(dict.fromkeys(list(self._members) + list(self._decoded))))
+
+    def __len__(self):
+        return len(set(self._members) | set(self._decoded))
+
+    def __contains__(self, key):
+        return key in self._members or key in self._decoded
+
+
 class SaveManager:
-    def __init__(self, save_directory="saves"):
+    def __init__(self, save_directory="saves", brain_format="json", delta_autosave=False, checkpoint_every=10):
         self.save_directory = save_directory
+        # 'json' (readable) or 'npz' (binary arrays, much faster for large brains)
+        self.brain_format = brain_format
+        # Delta autosaves: append only what changed since the last autosave to a
+        # log next to autosave.zip, and rewrite the full zip every `checkpoint_every` deltas
+        self.delta_autosave = delta_autosave
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self._checkpoint_id = None   # id of the autosave.zip the delta log builds on
+        self._baseline = None        # to_view() of everything written so far (checkpoint + deltas)
+        self._delta_count = 0
+        self._pending = {}      # filepath -> (save_data, on_complete) waiting for the worker
+        self._worker = None
+        self._lock = threading.Lock()
+        # Held across each autosave write and the checkpoint/delta state update,
+        # since both the worker and synchronous save_game() write autosaves
+        self._autosave_lock = threading.Lock()
         if not os.path.exists(save_directory):
             os.makedirs(save_directory)
         self.autosave_path = os.path.join(save_directory, "autosave.zip")
         self.manual_save_path = os.path.join(save_directory, "save_data.zip")
+        self.delta_log_path = os.path.join(save_directory, "autosave.delta.jsonl")
 
     def save_exists(self):
         """Check if any save file exists."""
         return os.path.exists(self.autosave_path) or os.path.exists(self.manual_save_path)
     
-    def extract_memories(self, zip_path, memory_dir):
-        with zipfile.ZipFile(zip_path, 'r') as zipf:
-            # Remove existing memory files
-            if os.path.exists(memory_dir):
-                shutil.rmtree(memory_dir)
-            os.makedirs(memory_dir)
-
-            # Extract new memory files
-            for filename in ['ShortTerm.json', 'LongTerm.json']:
-                if filename in zipf.namelist():
-                    zipf.extract(filename, memory_dir)
-
     def get_latest_save(self):
         """Get the path of the most recent save file."""
         if os.path.exists(self.autosave_path):
@@ -46,9 +202,11 @@ class SaveManager:
     def save_game(self, save_data, is_autosave=False):
         filepath = self.autosave_path if is_autosave else self.manual_save_path
         try:
-            with zipfile.ZipFile(filepath, 'w') as zipf:
-                for key, data in save_data.items():
-                    zipf.writestr(f"{key}.json", json.dumps(data, indent=4, cls=DateTimeEncoder))
+            if is_autosave:
+                with self._autosave_lock:
+                    self._write_checkpoint(save_data)
+            else:
+                self._write_save(filepath, save_data)
             return filepath
         except Exception as e:
             print(f"Error saving game: {str(e)}")
@@ -56,19 +214,164 @@ class SaveManager:
             traceback.print_exc()
             return None
 
+    def save_game_async(self, save_data, is_autosave=False, on_complete=None):
+        """
+        Serialize and write a save on a worker thread.
+
+        `save_data` must not be touched by the game afterwards (see snapshot_data).
+        `on_complete(filepath_or_None)` is called from the worker thread. If a
+        save for the same file is still waiting, the newer snapshot replaces it.
+        """
+        filepath = self.autosave_path if is_autosave else self.manual_save_path
+        with self._lock:
+            self._pending[filepath] = (save_data, on_complete)
+            if self._worker is None:
+                # Not a daemon: a save in progress finishes before the interpreter exits
+                self._worker = threading.Thread(target=self._write_pending, name="SaveWorker")
+                self._worker.start()
+        return filepath
+
+    def wait_for_saves(self, timeout=None):
+        """Block until background saves are written"""
+        with self._lock:
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def _write_pending(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                filepath = next(iter(self._pending))
+                save_data, on_complete = self._pending.pop(filepath)
+
+            result = None
+            try:
+                if filepath == self.autosave_path:
+                    self._write_autosave(save_data)
+                else:
+                    self._write_save(filepath, save_data)
+                result = filepath
+            except Exception as e:
+                print(f"Error saving game: {str(e)}")
+                import traceback
+                traceback.print_exc()
+
+            if on_complete is not None:
+                try:
+                    on_complete(result)
+                except Exception as e:
+                    print(f"Error in save completion callback: {e}")
+
+    def _write_autosave(self, save_data):
+        """Append a delta, or write a full checkpoint when one is due"""
+        with self._autosave_lock:
+            if (not self.delta_autosave or self._baseline is None
+                    or self._delta_count >= self.checkpoint_every):
+                self._write_checkpoint(save_data)
+            else:
+                self._write_delta(save_data)
+
+    def _write_delta(self, save_data):
+        """Append what changed since the last autosave to the delta log (caller holds _autosave_lock)"""
+        view = to_view(save_data)
+        delta = diff_views(self._baseline, view)
+        delta['base'] = self._checkpoint_id
+        delta['seq'] = self._delta_count + 1
+        line = json.dumps(delta, cls=DateTimeEncoder)
+        # No fsync: losing the last delta in a crash only costs one autosave
+        # interval, and a torn line is skipped on load
+        with open(self.delta_log_path, 'a') as log:
+            log.write(line + '\n')
+        self._baseline = view
+        self._delta_count += 1
+
+    def _write_checkpoint(self, save_data):
+        """Rewrite autosave.zip in full and start a new delta log (caller holds _autosave_lock)"""
+        checkpoint_id = uuid.uuid4().hex
+        self._write_save(self.autosave_path, save_data, checkpoint={'id': checkpoint_id})
+        # Deltas on disk belong to the previous checkpoint; their 'base' no longer
+        # matches, so even if truncating fails they are skipped on load
+        if os.path.exists(self.delta_log_path):
+            open(self.delta_log_path, 'w').close()
+        self._checkpoint_id = checkpoint_id
+        self._baseline = to_view(save_data) if self.delta_autosave else None
+        self._delta_count = 0
+
+    def _replay_deltas(self, save_data, checkpoint_id):
+        """
+        Apply the delta log written on top of checkpoint `checkpoint_id`.
+        Only the sections the deltas touch are decoded.
+        """
+        if checkpoint_id is None or not os.path.exists(self.delta_log_path):
+            return save_data
+
+        deltas = []
+        with open(self.delta_log_path, 'r') as log:
+            for line in log:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    delta = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from a crash
+                if delta.get('base') == checkpoint_id:
+                    deltas.append(delta)
+        if not deltas:
+            return save_data
+
+        touched = set()
+        for delta in deltas:
+            for name in (list(delta.get('sections', {})) + list(delta.get('changes', {}))
+                         + delta.get('removed', [])):
+                touched.add(name.split('.', 1)[0])
+        view = to_view({section: save_data[section] for section in touched if section in save_data})
+        for delta in deltas:
+            apply_delta(view, delta)
+        replayed = from_view(view)
+        for section in touched:
+            if section in replayed:
+                save_data[section] = replayed[section]
+            elif section in save_data:
+                del save_data[section]  # Removed after the checkpoint was written
+        print(f"Replayed {len(deltas)} autosave deltas")
+        return save_data
+
+    def _write_save(self, filepath, save_data, checkpoint=None):
+        # Write to a temp file and swap it in, so a crash mid-save never leaves a torn zip
+        tmp_path = filepath + '.tmp'
+        with zipfile.ZipFile(tmp_path, 'w') as zipf:
+            if checkpoint is not None:
+                zipf.writestr("checkpoint.json", json.dumps(checkpoint))
+            for key, data in save_data.items():
+                if key == 'assets':
+                    # Binary assets keyed by content hash: one PNG per distinct image
+                    for asset_hash, asset_data in data.items():
+                        zipf.writestr(f"{ASSET_DIR}/{asset_hash}.png", asset_data)
+                    continue
+                if key == 'brain_state' and self.brain_format == 'npz':
+                    zipf.writestr(f"{key}.npz", pack_brain_state(data))
+                    continue
+                zipf.writestr(f"{key}.json", json.dumps(data, indent=4, cls=DateTimeEncoder))
+        os.replace(tmp_path, filepath)
+
     def load_game(self):
+        """
+        Open the latest save as a LazySaveData: sections are decoded when first
+        used, so the squid and brain can be restored before anything else.
+        The memory lists are handed to the memory manager as they are.
+        """
         latest_save = self.get_latest_save()
         if latest_save:
-            save_data = {}
-            with zipfile.ZipFile(latest_save, 'r') as zipf:
-                for filename in zipf.namelist():
-                    with zipf.open(filename) as f:
-                        key = os.path.splitext(filename)[0]
-                        save_data[key] = json.loads(f.read().decode('utf-8'))
-            
-            # Extract memory files one directory level above
-                extract_path = os.path.join(os.path.dirname(os.path.dirname(latest_save)), '_memory')
-                self.extract_memories(latest_save, extract_path)
+            with open(latest_save, 'rb') as f:
+                save_data = LazySaveData(f.read())
+
+            # Autosaves may have changes logged since their last full checkpoint
+            if latest_save == self.autosave_path:
+                save_data = self._replay_deltas(save_data, save_data.checkpoint.get('id'))
             
             return save_data
         return None
@@ -76,6 +379,18 @@ class SaveManager:
     def delete_save(self, is_autosave=False):
         """Delete a save file."""
         filepath = self.autosave_path if is_autosave else self.manual_save_path
+        if is_autosave:
+            with self._autosave_lock:
+                if os.path.exists(self.delta_log_path):
+                    os.remove(self.delta_log_path)
+                # The next autosave starts a fresh checkpoint
+                self._checkpoint_id = None
+                self._baseline = None
+                self._delta_count = 0
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+                    return True
+                return False
         if os.path.exists(filepath):
             os.remove(filepath)
             return True
@@ -85,6 +400,8 @@ class SaveManager:
         """Get the timestamp of a save file."""
         filepath = self.autosave_path if is_autosave else self.manual_save_path
         if os.path.exists(filepath):
+            if is_autosave and os.path.exists(self.delta_log_path):
+                return max(os.path.getmtime(filepath), os.path.getmtime(self.delta_log_path))
             return os.path.getmtime(filepath)
         return None
 
@@ -92,5 +409,7 @@ class SaveManager:
         """Get the size of a save file in bytes."""
         filepath = self.autosave_path if is_autosave else self.manual_save_path
         if os.path.exists(filepath):
+            if is_autosave and os.path.exists(self.delta_log_path):
+                return os.path.getsize(filepath) + os.path.getsize(self.delta_log_path)
             return os.path.getsize(filepath)
         return None
\ No newline at end of file
@@ -0,0 +1,866 @@
+import math
+import random
+import time
+
+from .personality import Personality
+from .decision_engine import DecisionEngine
+from .vision_cone import cone_mask
+
+
+class SimulationRules:
+    """
+    Per-tick rules of the squid's world, without Qt.
+
+    TamagotchiLogic and HeadlessSimulation both inherit these, so needs,
+    sickness, decoration effects and neurogenesis triggers follow one set of
+    rules in the game and in headless runs. The host provides `squid`,
+    `brain_window`, `simulation_speed`, `points`, the threshold timers and
+    neurogenesis trigger counters, plus get_nearby_decorations(),
+    squid_touches(), move_decoration(), show_message(), add_thought() and
+    game_over().
+    """
+
+    rng = random                     # Hosts may swap in a seeded random.Random
+    clock = staticmethod(time.time)  # Wall clock, or simulated time when headless
+
+    def update_mental_states(self):
+        """Startle and curiosity checks; only the Qt game has mental states to show"""
+
+    def update_squid_tick(self):
+        """Squid half of a simulation tick, after the world objects have moved"""
+        # 2. Core squid updates
+        self.squid.move_squid()
+        self.check_for_decoration_attraction()
+        self.check_for_sickness()
+
+        # 3. Mental state updates
+        self.update_mental_states()
+
+        # 4. Neurogenesis tracking
+        self.track_neurogenesis_triggers()
+
+        # 5. Memory management
+        # During sleep, consolidate short-term memories to long-term
+        if self.squid.is_sleeping:
+            self.squid.memory_manager.review_and_transfer_memories()
+        else:
+            self.squid.memory_manager.periodic_memory_management()
+
+        # 6. + 7. Update brain (will trigger neurogenesis checks)
+        self.brain_window.update_brain(self.get_brain_state())
+
+        # 8. Reset frame-specific flags
+        self.new_object_encountered = False
+        self.recent_positive_outcome = False
+
+    def get_brain_state(self):
+        """Brain inputs for this tick, including the neurogenesis trigger counters"""
+        return {
+            "hunger": self.squid.hunger,
+            "happiness": self.squid.happiness,
+            "cleanliness": self.squid.cleanliness,
+            "sleepiness": self.squid.sleepiness,
+            "satisfaction": self.squid.satisfaction,
+            "anxiety": self.squid.anxiety,
+            "curiosity": self.squid.curiosity,
+            "is_sick": self.squid.is_sick,
+            "is_sleeping": self.squid.is_sleeping,
+            "pursuing_food": self.squid.pursuing_food,
+            "direction": self.squid.squid_direction,
+            "position": (self.squid.squid_x, self.squid.squid_y),
+
+            # Neurogenesis-specific additions
+            "novelty_exposure": self.neurogenesis_triggers['novel_objects'],
+            "sustained_stress": self.neurogenesis_triggers['high_stress_cycles'] / 10.0,
+            "recent_rewards": self.neurogenesis_triggers['positive_outcomes'],
+            "personality": self.squid.personality.value
+        }
+
+    def update_needs(self, seconds=1, now=None, quiet=False, near_plant=None):
+        """
+        Needs decay, health, sleep and points for one tick.
+
+        fast_forward batches `seconds` ticks into one call: rates are scaled
+        by `seconds` and sickness and sleep are checked once, at the end of
+        the step. `now` stamps the health history (default self.clock()),
+        quiet=True skips messages and thoughts, and `near_plant` can stand in
+        for squid.is_near_plant() while the squid holds still.
+        """
+        if self.squid is None:
+            return
+
+        rate = self.simulation_speed * seconds
+
+        # Update squid needs
+        if not self.squid.is_sleeping:
+            self.squid.hunger = min(100, self.squid.hunger + (0.1 * rate))
+            self.squid.sleepiness = min(100, self.squid.sleepiness + (0.25 * rate))
+            self.squid.happiness = max(0, self.squid.happiness - (0.1 * rate))
+            self.squid.cleanliness = max(0, self.squid.cleanliness - (0.1 * rate))
+
+            # Update new neurons
+            self.update_satisfaction(seconds)
+            self.update_anxiety(seconds, near_plant)
+            self.update_curiosity(seconds)
+
+            # Check for special status effects on anxiety reduction.
+            if self.squid.status == "hiding behind plant":
+                # Hiding among plants actively reduces anxiety over time.
+                # This makes it a tangible calming behavior for the squid.
+                previous_anxiety = self.squid.anxiety
+                self.squid.anxiety = max(0, self.squid.anxiety - (0.5 * rate))
+
+                if self.squid.anxiety < previous_anxiety:
+                    # Form a memory of the calming effect
+                    memory_value = "Being near plants is calming (Anxiety reduction)"
+                    self.squid.memory_manager.add_short_term_memory(
+                        'environment',
+                        'plant_calming_effect',
+                        memory_value,
+                        importance=1.5  # Higher importance
+                    )
+
+                    # Increment counter and check for long-term memory transfer
+                    self.plant_calming_effect_counter += 1
+                    if self.plant_calming_effect_counter >= 5:
+                        self.squid.memory_manager.transfer_to_long_term_memory(
+                            'environment',
+                            'plant_calming_effect'
+                        )
+                        self.plant_calming_effect_counter = 0 # Reset counter
+
+            # Check if cleanliness has been too low for too long
+            if self.squid.cleanliness < 20:
+                self.cleanliness_threshold_time += seconds
+            else:
+                self.cleanliness_threshold_time = 0
+
+            # Check if hunger has been too high for too long
+            if self.squid.hunger > 80:
+                self.hunger_threshold_time += seconds
+            else:
+                self.hunger_threshold_time = 0
+
+            # Check if squid becomes sick (80% chance)
+            if (self.cleanliness_threshold_time >= 10 * self.simulation_speed and self.cleanliness_threshold_time <= 60 * self.simulation_speed) or \
+            (self.hunger_threshold_time >= 10 * self.simulation_speed and self.hunger_threshold_time <= 50 * self.simulation_speed):
+                if self.rng.random() < 0.8:
+                    self.squid.mental_state_manager.set_state("sick", True)
+            else:
+                self.squid.mental_state_manager.set_state("sick", False)
+
+            # New logic for health decrease based on happiness and cleanliness
+            if self.squid.happiness < 20 and self.squid.cleanliness < 20:
+                health_decrease = 0.2 * rate  # Rapid decrease
+            else:
+                health_decrease = 0.1 * rate  # Normal decrease when sick
+
+            # Store previous health for change detection
+            previous_health = self.squid.health
+
+            if self.squid.is_sick:
+                self.squid.health = max(0, self.squid.health - health_decrease)
+                self.squid.show_sick_icon()
+                if self.squid.health == 0:
+                    self.game_over()
+            else:
+                self.squid.health = min(100, self.squid.health + (0.1 * rate))
+                self.squid.hide_sick_icon()
+
+            # Track health history
+            if not hasattr(self, '_health_history'):
+                self._health_history = []
+
+            # Add current health data point with timestamp
+            # Only record if health actually changed or if we haven't recorded in a while
+            if now is None:
+                now = self.clock()
+            if (previous_health != self.squid.health or
+                not self._health_history or
+                now - self._health_history[-1][0] > 60):  # Record at least every 60 seconds
+                self._health_history.append((now, self.squid.health))
+
+                # Limit history size to prevent memory issues
+                if len(self._health_history) > 1000:
+                    self._health_history = self._health_history[-1000:]
+
+            # Check if squid should go to sleep
+            if self.squid.sleepiness >= 100:
+                self.squid.go_to_sleep(quiet=quiet)
+                if not quiet:
+                    self.show_message("Squid is very tired and went to sleep!")
+                    # Add thoughts
+                    self.add_thought("I am exhausted and going to sleep")
+        else:
+            self.squid.sleepiness = max(0, self.squid.sleepiness - (0.5 * rate))
+            if self.squid.sleepiness == 0:
+                self.squid.wake_up(quiet=quiet)
+
+        # Update points based on squid's status
+        if not self.squid.is_sick and self.squid.happiness >= 80 and self.squid.cleanliness >= 80:
+            self.points += seconds
+        elif self.squid.is_sick or self.squid.hunger >= 80 or self.squid.happiness <= 20:
+            self.points = max(0, self.points - seconds)
+
+    def check_for_sickness(self, quiet=False):
+        # Existing sickness logic
+        if (self.cleanliness_threshold_time >= 10 * self.simulation_speed and self.cleanliness_threshold_time <= 60 * self.simulation_speed) or \
+        (self.hunger_threshold_time >= 10 * self.simulation_speed and self.hunger_threshold_time <= 50 * self.simulation_speed):
+            if self.rng.random() < 0.8:
+                self.squid.mental_state_manager.set_state("sick", True)
+
+                # Set more descriptive sick status
+                if self.squid.health < 30:
+                    self.squid.status = "suffering"
+                elif self.squid.health < 50:
+                    self.squid.status = "feeling ill"
+                else:
+                    self.squid.status = "feeling sick"
+
+                if not quiet:
+                    self.show_message("Squid is feeling sick!")
+        else:
+            if self.squid.mental_state_manager.is_state_active("sick") and self.squid.health > 80:
+                self.squid.status = "recuperating"
+            self.squid.mental_state_manager.set_state("sick", False)
+
+    def update_satisfaction(self, seconds=1):
+        # Update satisfaction based on hunger, happiness, and cleanliness
+        hunger_factor = max(0, 1 - self.squid.hunger / 100)
+        happiness_factor = self.squid.happiness / 100
+        cleanliness_factor = self.squid.cleanliness / 100
+
+        satisfaction_change = (hunger_factor + happiness_factor + cleanliness_factor) / 3
+        satisfaction_change = (satisfaction_change - 0.5) * 2  # Scale to range from -1 to 1
+
+        self.squid.satisfaction += satisfaction_change * self.simulation_speed * seconds
+        self.squid.satisfaction = max(0, min(100, self.squid.satisfaction))
+
+    def update_anxiety(self, seconds=1, near_plant=None):
+        # Update anxiety based on hunger, cleanliness, and health
+        hunger_factor = self.squid.hunger / 100
+        cleanliness_factor = 1 - self.squid.cleanliness / 100
+        health_factor = 1 - self.squid.health / 100
+
+        if self.squid.personality == Personality.GREEDY:
+            hunger_factor *= 1.5  # Greedy squids get more anxious when hungry
+
+        anxiety_change = (hunger_factor + cleanliness_factor + health_factor) / 3
+
+        if self.squid.personality == Personality.TIMID and \
+                (self.squid.is_near_plant() if near_plant is None else near_plant):
+            anxiety_change *= 0.5  # Timid squids are less anxious near plants
+
+        self.squid.anxiety += anxiety_change * self.simulation_speed * seconds
+        self.squid.anxiety = max(0, min(100, self.squid.anxiety))
+
+    def update_curiosity(self, seconds=1):
+        # Update curiosity based on satisfaction and anxiety
+        if self.squid.satisfaction > 70 and self.squid.anxiety < 30:
+            curiosity_change = 0.2 * self.simulation_speed * seconds
+        else:
+            curiosity_change = -0.1 * self.simulation_speed * seconds
+
+        # Adjust curiosity change based on personality
+        if self.squid.personality == Personality.TIMID:
+            curiosity_change *= 0.5  # Timid squids are less curious
+        elif self.squid.personality == Personality.ADVENTUROUS:
+            curiosity_change *= 1.5  # Adventurous squids are more curious
+
+        self.squid.curiosity += curiosity_change
+        self.squid.curiosity = max(0, min(100, self.squid.curiosity))
+
+    def track_neurogenesis_triggers(self, seconds=1, quiet=False):
+        """Update counters for neurogenesis triggers (over `seconds` ticks when batched)"""
+        # Novelty tracking
+        if self.new_object_encountered:
+            self.neurogenesis_triggers['novel_objects'] = min(
+                self.neurogenesis_triggers['novel_objects'] + 1,
+                10  # Max cap
+            )
+            # Add thought about novelty
+            if not quiet:
+                self.add_thought("Encountered something new!")
+        else:
+            # Gradual decay when no novelty
+            self.neurogenesis_triggers['novel_objects'] *= 0.95 ** seconds
+
+        # Stress tracking
+        if self.squid.anxiety > 70:
+            self.neurogenesis_triggers['high_stress_cycles'] += seconds
+            # Add thought about stress if threshold crossed
+            if self.neurogenesis_triggers['high_stress_cycles'] > 5 and not quiet:
+                self.add_thought("Feeling stressed for a while...")
+        else:
+            self.neurogenesis_triggers['high_stress_cycles'] = max(
+                0,
+                self.neurogenesis_triggers['high_stress_cycles'] - 0.5 * seconds
+            )
+
+        # Reward tracking (positive outcomes like eating, playing)
+        if self.recent_positive_outcome:
+            self.neurogenesis_triggers['positive_outcomes'] = min(
+                self.neurogenesis_triggers['positive_outcomes'] + 1,
+                5  # Max cap
+            )
+            # Add thought about positive experience
+            if self.rng.random() < 0.3 and not quiet:  # 30% chance to comment
+                self.add_thought("That was enjoyable!")
+        else:
+            # Gradual decay when no rewards
+            self.neurogenesis_triggers['positive_outcomes'] = max(
+                0,
+                self.neurogenesis_triggers['positive_outcomes'] - 0.2 * seconds
+            )
+
+        # Debug output if in debug mode
+        if self.debug_mode:
+            print(f"Neurogenesis triggers: {self.neurogenesis_triggers}")
+
+    def check_for_decoration_attraction(self):
+        squid_x = self.squid.squid_x
+        squid_y = self.squid.squid_y
+
+        active_decorations = self.get_nearby_decorations(squid_x, squid_y)
+
+        if active_decorations:
+            self.apply_decoration_effects(active_decorations)
+
+            # Check for plant contact and update status
+            is_hiding = False
+            for decoration in active_decorations:
+                if hasattr(decoration, 'category') and decoration.category == 'plant':
+                    if self.squid_touches(decoration):
+                        self.squid.status = "hiding behind plant"
+                        is_hiding = True
+                        break  # Squid can only hide behind one plant at a time
+
+            if not is_hiding and self.squid.status == "hiding behind plant":
+                self.squid.status = "roaming" # Or another default status
+
+            # Move decorations
+            for decoration in active_decorations:
+                decoration_pos = decoration.pos()
+                if decoration_pos.x() < squid_x:
+                    self.move_decoration(decoration, 5)  # Move right
+                else:
+                    self.move_decoration(decoration, -5)  # Move left
+
+    def apply_decoration_effects(self, active_decorations):
+        """Apply effects from nearby decorations"""
+        if not active_decorations:
+            return
+
+        effects = {}
+        strongest_effect = 0
+        strongest_decoration = None
+
+        for decoration in active_decorations:
+            if not hasattr(decoration, 'filename') or decoration.filename is None:
+                continue
+            if not hasattr(decoration, 'stat_modifiers') or not decoration.stat_modifiers:
+                continue
+
+            # Find the decoration with the strongest effect (absolute value)
+            max_modifier = max(abs(val) for val in decoration.stat_modifiers.values())
+            if max_modifier > strongest_effect:
+                strongest_effect = max_modifier
+                strongest_decoration = decoration
+
+        if strongest_decoration:
+            # Apply stat modifiers additively
+            for stat, modifier in strongest_decoration.stat_modifiers.items():
+                if hasattr(self.squid, stat):
+                    current_value = getattr(self.squid, stat)
+                    new_value = current_value + modifier
+                    # Clamp the value between 0 and 100
+                    new_value = max(0, min(100, new_value))
+                    setattr(self.squid, stat, new_value)
+                    effects[stat] = modifier
+
+            # Apply category-specific effects
+            if strongest_decoration.category == 'plant':
+                old_cleanliness = self.squid.cleanliness
+                self.squid.cleanliness = min(self.squid.cleanliness + 5, 100)
+                effects['cleanliness'] = effects.get('cleanliness', 0) + (self.squid.cleanliness - old_cleanliness)
+            elif strongest_decoration.category == 'rock':
+                old_satisfaction = self.squid.satisfaction
+                self.squid.satisfaction = min(self.squid.satisfaction + 5, 100)
+                effects['satisfaction'] = effects.get('satisfaction', 0) + (self.squid.satisfaction - old_satisfaction)
+
+        if strongest_decoration and hasattr(strongest_decoration, 'filename') and strongest_decoration.filename is not None:
+            self.squid.memory_manager.add_short_term_memory('decorations', strongest_decoration.filename, effects)
+        else:
+            if effects:
+                self.squid.memory_manager.add_short_term_memory('decorations', 'nearby_decorations', effects)
+
+        if effects:
+            self.update_decoration_learning(effects)
+
+    def update_decoration_learning(self, effects):
+        if not effects:
+            return
+
+        # Get the current state of the squid
+        current_state = {
+            "hunger": self.squid.hunger,
+            "happiness": self.squid.happiness,
+            "cleanliness": self.squid.cleanliness,
+            "sleepiness": self.squid.sleepiness,
+            "satisfaction": self.squid.satisfaction,
+            "anxiety": self.squid.anxiety,
+            "curiosity": self.squid.curiosity
+        }
+
+        # Update the brain based on the decoration effects
+        for stat, boost in effects.items():
+            if stat in current_state:
+                # Increase the connection strength between the affected stat and satisfaction
+                self.brain_window.brain_widget.strengthen_connection(stat, 'satisfaction', boost * 0.01)
+
+                # If the boost is significant, also strengthen connection with happiness
+                if boost > 5:
+                    self.brain_window.brain_widget.strengthen_connection(stat, 'happiness', boost * 0.005)
+
+        # Update the squid's memory
+        now = self.clock()
+        decoration_memory = {
+            "category": "decorations",
+            "effects": effects,
+            "timestamp": now
+        }
+        self.squid.memory_manager.add_short_term_memory('decorations', str(now), decoration_memory)
+
+        # If this is a significant effect, consider transferring to long-term memory
+        if any(boost > 10 for boost in effects.values()):
+            self.squid.memory_manager.transfer_to_long_term_memory('decorations', str(now))
+
+
+class SquidRules:
+    """
+    Movement, vision, eating and sleep rules of the squid, without Qt.
+
+    Squid and HeadlessSquid both inherit these. The host provides the stats,
+    position and size attributes, `ui` (anything with window_width and
+    window_height), `tamagotchi_logic`, `memory_manager`, start_poop_timer()
+    and current_time_ms(). The drawing hooks below do
+    nothing unless the host has a scene to draw in.
+    """
+
+    rng = random
+
+    def set_squid_pos(self):
+        pass
+
+    def update_squid_image(self):
+        pass
+
+    def update_view_cone(self):
+        pass
+
+    def update_sick_icon_position(self):
+        pass
+
+    def show_sick_icon(self):
+        pass
+
+    def hide_sick_icon(self):
+        pass
+
+    def show_eating_effect(self):
+        pass
+
+    def schedule_finish_eating(self):
+        pass
+
+    def check_boundary_exit(self):
+        pass
+
+    def make_decision(self):
+        """Delegate to the decision engine for emergent behavior"""
+        if not hasattr(self, '_decision_engine'):
+            self._decision_engine = DecisionEngine(self, rng=self.rng)
+
+        return self._decision_engine.make_decision()
+
+    def move_squid(self):
+        """
+        Move the squid with comprehensive debug logging and boundary check
+        """
+        # Check if movement is allowed
+        if not getattr(self, 'can_move', True):
+            return
+
+        # Check if multiplayer is available and enabled
+        if hasattr(self.tamagotchi_logic, 'plugin_manager'):
+            pm = self.tamagotchi_logic.plugin_manager
+            multiplayer_enabled = 'multiplayer' in pm.get_enabled_plugins()
+        else:
+            multiplayer_enabled = False
+
+        if self.animation_speed == 0:
+            #print("Animation speed is 0, no movement")
+            return
+
+        if self.is_sleeping:
+            #print("Squid is sleeping, limited movement")
+            if self.squid_y < self.ui.window_height - 120 - self.squid_height:
+                self.squid_y += self.base_vertical_speed * self.animation_speed
+                self.set_squid_pos()
+            self.current_frame = (self.current_frame + 1) % 2
+            self.update_squid_image()
+            return
+
+        current_time = self.current_time_ms()
+
+        visible_food = self.get_visible_food()
+
+        if visible_food:
+            closest_food = min(visible_food, key=lambda f: self.distance_to(f[0], f[1]))
+            self.pursuing_food = True
+            self.target_food = closest_food
+            self.move_towards(closest_food[0], closest_food[1])
+        elif self.pursuing_food:
+            self.pursuing_food = False
+            self.target_food = None
+            self.move_randomly()
+        else:
+            if current_time - self.last_view_cone_change > self.view_cone_change_interval:
+                self.change_view_cone_direction()
+                self.last_view_cone_change = current_time
+            self.move_randomly()
+
+        # Calculate new position
+        squid_x_new = self.squid_x
+        squid_y_new = self.squid_y
+
+        if self.squid_direction == "left":
+            squid_x_new -= self.base_squid_speed * self.animation_speed
+        elif self.squid_direction == "right":
+            squid_x_new += self.base_squid_speed * self.animation_speed
+        elif self.squid_direction == "up":
+            squid_y_new -= self.base_vertical_speed * self.animation_speed
+        elif self.squid_direction == "down":
+            squid_y_new += self.base_vertical_speed * self.animation_speed
+
+        # Boundary handling for single-player and multiplayer modes
+        if not multiplayer_enabled:
+            # Original boundary restrictions for single-player mode
+            if squid_x_new < 50:
+                squid_x_new = 50
+                self.change_direction()
+            elif squid_x_new > self.ui.window_width - 50 - self.squid_width:
+                squid_x_new = self.ui.window_width - 50 - self.squid_width
+                self.change_direction()
+
+            if squid_y_new < 50:
+                squid_y_new = 50
+                self.change_direction()
+            elif squid_y_new > self.ui.window_height - 120 - self.squid_height:
+                squid_y_new = self.ui.window_height - 120 - self.squid_height
+                self.change_direction()
+        else:
+            # Extended boundary check for multiplayer
+            print("Multiplayer mode: Extended boundary check")
+
+        # Update squid position
+        self.squid_x = squid_x_new
+        self.squid_y = squid_y_new
+
+        # Update animation frame and image
+        if self.squid_direction in ["left", "right", "up", "down"]:
+            self.current_frame = (self.current_frame + 1) % 2
+            self.update_squid_image()
+
+        # Set new position and update related elements
+        self.set_squid_pos()
+        self.update_view_cone()
+        self.update_sick_icon_position()
+
+        # Comprehensive boundary exit check in multiplayer mode
+        if multiplayer_enabled:
+            self.check_boundary_exit()
+
+    def move_towards(self, x, y):
+        dx = x - (self.squid_x + self.squid_width // 2)
+        dy = y - (self.squid_y + self.squid_height // 2)
+
+        if abs(dx) > abs(dy):
+            self.squid_direction = "right" if dx > 0 else "left"
+        else:
+            self.squid_direction = "down" if dy > 0 else "up"
+
+    def move_randomly(self):
+        if self.rng.random() < 0.20:
+            self.change_direction()
+
+    def move_erratically(self):
+        directions = ["left", "right", "up", "down"]
+        self.squid_direction = self.rng.choice(directions)
+        self.move_squid()
+
+    def move_slowly(self):
+        self.base_squid_speed = self.base_squid_speed // 2
+        self.base_vertical_speed = self.base_vertical_speed // 2
+        self.move_squid()
+
+    def distance_to(self, x, y):
+        return math.sqrt((self.squid_x - x)**2 + (self.squid_y - y)**2)
+
+    def change_direction(self):
+        directions = ["left", "right", "up", "down"]
+        new_direction = self.rng.choice(directions)
+        while new_direction == self.squid_direction:
+            new_direction = self.rng.choice(directions)
+        self.squid_direction = new_direction
+
+    def change_view_cone_direction(self):
+        self.current_view_angle = self.rng.uniform(0, 2 * math.pi)
+
+    def get_vision_cone(self):
+        """
+        The squid's current vision cone.
+
+        Returns:
+            tuple: (origin_x, origin_y, view_angle, half_angle, length)
+        """
+        # Cone starts at the squid's center
+        squid_center_x = self.squid_x + self.squid_width // 2
+        squid_center_y = self.squid_y + self.squid_height // 2
+
+        # Define vision cone length
+        cone_length = max(self.ui.window_width, self.ui.window_height)
+
+        # Get current view angle (use current_view_angle if available, otherwise derive from direction)
+        if hasattr(self, 'current_view_angle'):
+            current_angle = self.current_view_angle
+        else:
+            direction_map = {
+                'right': 0,
+                'up': math.pi * 1.5,
+                'left': math.pi,
+                'down': math.pi * 0.5
+            }
+            current_angle = direction_map.get(self.squid_direction, 0)
+
+        # Get cone angle (half of the total view cone angle)
+        if hasattr(self, 'view_cone_angle'):
+            cone_angle = self.view_cone_angle / 2
+        else:
+            cone_angle = math.pi / 5  # Default 36-degree half-angle
+
+        return squid_center_x, squid_center_y, current_angle, cone_angle, cone_length
+
+    def get_visible_objects(self, object_list):
+        """
+        Finds objects from a given list that are within the squid's vision cone.
+        This is a generic helper method.
+        """
+        if not object_list:
+            return []
+        visible, _ = self.check_visibility(object_list)
+        return [item for item, is_visible in zip(object_list, visible) if is_visible]
+
+    def check_visibility(self, object_list):
+        """
+        Vision-cone test for a list of scene items in one batch.
+
+        Returns:
+            tuple: (visible, distances) lists parallel to object_list
+        """
+        if not object_list:
+            return [], []
+        positions = [(item.pos().x(), item.pos().y()) for item in object_list]
+        mask, distances = cone_mask(positions, *self.get_vision_cone())
+        return mask.tolist(), distances.tolist()
+
+    def get_visible_food(self):
+        """
+        Returns the positions of visible food items, prioritized by type (sushi first).
+        This method is now refactored to use the generic get_visible_objects.
+        """
+        if self.tamagotchi_logic is None:
+            return []
+
+        # Use the new generic method to find all food items in view
+        all_visible_food_items = self.get_visible_objects(self.tamagotchi_logic.food_items)
+
+        if not all_visible_food_items:
+            return []
+
+        # Sort visible food to prioritize sushi
+        sushi_items = [item for item in all_visible_food_items if getattr(item, 'is_sushi', False)]
+        other_food_items = [item for item in all_visible_food_items if not getattr(item, 'is_sushi', False)]
+
+        # Return sorted positions
+        sorted_positions = [(food.pos().x(), food.pos().y()) for food in sushi_items]
+        sorted_positions.extend([(food.pos().x(), food.pos().y()) for food in other_food_items])
+
+        return sorted_positions
+
+    def is_near_plant(self):
+        if self.tamagotchi_logic is None:
+            return False
+
+        nearby_decorations = self.tamagotchi_logic.get_nearby_decorations(self.squid_x, self.squid_y)
+        return any(decoration.category == 'plant' for decoration in nearby_decorations)
+
+    def eat(self, food_item):
+        effects = {}
+
+        # Basic effects for all food types
+        effects['hunger'] = max(-20, -self.hunger)
+        effects['happiness'] = min(10, 100 - self.happiness)
+
+        # Determine food type and effects
+        is_sushi = getattr(food_item, 'is_sushi', False)
+        food_name = "sushi" if is_sushi else "cheese"
+
+        # Satisfaction boost (stronger for sushi)
+        effects['satisfaction'] = min(15 if is_sushi else 10, 100 - self.satisfaction)
+
+        # Personality-based reward points
+        reward_points = 2  # Default for all food
+        if is_sushi and self.personality in [Personality.GREEDY, Personality.STUBBORN]:
+            reward_points = 3  # Extra reward for favorite food
+            effects['satisfaction'] = min(20, 100 - self.satisfaction)  # Even bigger boost
+
+        # Trigger hook if tamagotchi_logic exists
+        if hasattr(self, 'tamagotchi_logic') and self.tamagotchi_logic:
+            if hasattr(self.tamagotchi_logic, 'plugin_manager'):
+                self.tamagotchi_logic.plugin_manager.trigger_hook(
+                    "on_feed",
+                    squid=self,
+                    food_item=food_item,
+                    food_type=food_name,
+                    effects=effects
+                )
+
+        self.is_eating = True
+        self.status = "eating"
+        # Apply all stat changes
+        for attr, change in effects.items():
+            setattr(self, attr, getattr(self, attr) + change)
+
+        # Reset the status after 1 second
+        self.schedule_finish_eating()
+
+        # Memory system
+        formatted_effects = ', '.join(f"{attr.capitalize()} {'+' if val >= 0 else ''}{val:.2f}"
+                            for attr, val in effects.items())
+        self.memory_manager.add_short_term_memory('food', food_name,
+            f"Ate {food_name}: {formatted_effects}")
+
+        # Neurogenesis tracking
+        if hasattr(self.tamagotchi_logic, 'neurogenesis_triggers'):
+            current = self.tamagotchi_logic.neurogenesis_triggers['positive_outcomes']
+            self.tamagotchi_logic.neurogenesis_triggers['positive_outcomes'] = min(current + reward_points, 5)
+
+        # Visual/behavioral effects
+        self.status = f"Eating {food_name}"
+        self.tamagotchi_logic.remove_food(food_item)
+        self.show_eating_effect()
+        self.start_poop_timer()
+        self.pursuing_food = False
+        self.target_food = None
+        self.is_eating = False
+
+        # Personality reactions (with enhanced messages)
+        if self.personality == Personality.GREEDY:
+            self.eat_greedily(food_item)
+            if is_sushi:
+                self.tamagotchi_logic.show_message("Greedy squid devours sushi voraciously!")
+        elif self.personality == Personality.STUBBORN:
+            if not is_sushi:
+                self.react_stubborn_eating()
+            else:
+                self.tamagotchi_logic.show_message("Stubborn squid happily accepts sushi")
+
+    def eat_greedily(self, food_item):
+        self.status = "Eating greedily"
+
+        # Reduce hunger more than usual
+        self.hunger = max(0, self.hunger - 25)
+
+        # Increase happiness more
+        self.happiness = min(100, self.happiness + 15)
+
+        # Increase satisfaction significantly
+        self.satisfaction = min(100, self.satisfaction + 20)
+
+        # Slightly increase anxiety (from overeating)
+        self.anxiety = min(100, self.anxiety + 5)
+
+        self.tamagotchi_logic.remove_food(food_item)
+        self.show_eating_effect()
+        self.start_poop_timer()
+        self.pursuing_food = False
+        self.target_food = None
+
+        # Occasionally show a message
+        if self.rng.random() < 0.2:  # 20% chance to show a message
+            self.tamagotchi_logic.show_message("Nom nom! Greedy squid devours the food!")
+
+        # Check if there's more food nearby
+        if self.check_for_more_food():
+            if self.rng.random() < 0.1:  # 10% chance to show this message
+                self.tamagotchi_logic.show_message("Greedy squid looks around for more food...")
+        else:
+            if self.rng.random() < 0.1:  # 10% chance to show this message
+                self.tamagotchi_logic.show_message("Greedy squid is satisfied... for now.")
+
+    def react_stubborn_eating(self):
+        if self.hunger > 80:  # Extremely hungry
+            self.happiness = max(0, self.happiness - 5)
+            self.tamagotchi_logic.show_message("Stubborn squid reluctantly eats non-sushi food.")
+        else:
+            self.tamagotchi_logic.show_message("Stubborn squid ignores non-sushi food.")
+
+    def check_for_more_food(self):
+        for food_item in self.tamagotchi_logic.food_items:
+            if self.is_food_nearby(food_item):
+                return True
+        return False
+
+    def is_food_nearby(self, food_item):
+        food_x, food_y = food_item.pos().x(), food_item.pos().y()
+        squid_center_x = self.squid_x + self.squid_width // 2
+        squid_center_y = self.squid_y + self.squid_height // 2
+        distance = math.sqrt((squid_center_x - food_x)**2 + (squid_center_y - food_y)**2)
+        return distance < 100  # Adjust the distance threshold as needed
+
+    def go_to_sleep(self, quiet=False):
+        if not self.is_sleeping:
+            self.is_sleeping = True
+            self.squid_direction = "down"
+            self.status = "sleeping"
+
+            # Trigger hook if tamagotchi_logic exists
+            if hasattr(self, 'tamagotchi_logic') and self.tamagotchi_logic:
+                if hasattr(self.tamagotchi_logic, 'plugin_manager'):
+                    self.tamagotchi_logic.plugin_manager.trigger_hook(
+                        "on_sleep",
+                        squid=self
+                    )
+
+            # Clear all short-term memories when the squid goes to sleep
+            self.memory_manager.clear_short_term_memory()
+
+            if not quiet:
+                self.tamagotchi_logic.show_message("Squid is sleeping...")
+
+    def wake_up(self, quiet=False):
+        self.is_sleeping = False
+        self.sleepiness = 0
+        self.happiness = min(100, self.happiness + 20)
+        self.status = "roaming"
+        self.squid_direction = "left"
+        self.update_squid_image()
+        if not quiet:
+            self.tamagotchi_logic.show_message("Squid woke up!")
+
+    def throw_rock(self, direction):
+        """Delegate to interaction manager"""
+        if not hasattr(self.tamagotchi_logic, 'rock_interaction'):
+            return False
+        return self.tamagotchi_logic.rock_interaction.throw_rock(direction)
@@ -0,0 +1,225 @@
+import itertools
+import math
+
+
+def _scene_bounds(item):
+    rect = item.sceneBoundingRect()
+    return rect.left(), rect.top(), rect.right(), rect.bottom()
+
+
+def _wrap_angle(angle):
+    """Wrap an angle into (-pi, pi]"""
+    angle = math.fmod(angle, 2 * math.pi)
+    if angle > math.pi:
+        angle -= 2 * math.pi
+    elif angle <= -math.pi:
+        angle += 2 * math.pi
+    return angle
+
+
+def _cone_bounds(x, y, direction, half_angle, length):
+    """Bounding box of a cone: its origin, both edge end points and any axis extremes of its arc"""
+    xs, ys = [x], [y]
+    angles = [direction - half_angle, direction + half_angle]
+    angles += [axis for axis in (0.0, math.pi / 2, math.pi, -math.pi / 2)
+               if abs(_wrap_angle(axis - direction)) <= half_angle]
+    for angle in angles:
+        xs.append(x + length * math.cos(angle))
+        ys.append(y + length * math.sin(angle))
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+class SpatialIndex:
+    """
+    Uniform grid over scene objects (food, poop, rocks, plants, decorations).
+
+    Every item is registered in each `cell_size` cell its bounding rect
+    overlaps, so radius and vision-cone queries only look at the cells they
+    can reach instead of walking scene.items(). The index does not watch
+    items by itself: call update() after an item moves or changes size
+    (ResizablePixmapItem does this from itemChange).
+    """
+
+    def __init__(self, cell_size=128, bounds=None):
+        self.cell_size = float(cell_size)
+        self._bounds = bounds or _scene_bounds
+        self._cells = {}        # (cx, cy) -> set of items
+        self._item_cells = {}   # item -> (cx0, cy0, cx1, cy1)
+        self._order = {}        # item -> insertion sequence (keeps results stable)
+        self._counter = itertools.count()
+
+    def __contains__(self, item):
+        return item in self._item_cells
+
+    def __len__(self):
+        return len(self._item_cells)
+
+    def __iter__(self):
+        return iter(self._sorted(self._item_cells))
+
+    def _sorted(self, items):
+        order = self._order
+        return sorted(items, key=order.__getitem__)
+
+    def _cell_range(self, item):
+        x1, y1, x2, y2 = self._bounds(item)
+        size = self.cell_size
+        return (int(math.floor(x1 / size)), int(math.floor(y1 / size)),
+                int(math.floor(x2 / size)), int(math.floor(y2 / size)))
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def insert(self, item):
+        self.update(item)
+
+    def update(self, item):
+        """Add an item or re-file it after a move/resize (cheap when it stays in the same cells)"""
+        try:
+            cell_range = self._cell_range(item)
+        except RuntimeError:
+            # Underlying C++ item already deleted
+            self.remove(item)
+            return
+        old_range = self._item_cells.get(item)
+        if old_range == cell_range:
+            return
+        if old_range is not None:
+            self._unlink(item, old_range)
+        else:
+            self._order[item] = next(self._counter)
+        self._item_cells[item] = cell_range
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self._cells.setdefault((cx, cy), set()).add(item)
+
+    def remove(self, item):
+        cell_range = self._item_cells.pop(item, None)
+        if cell_range is not None:
+            self._unlink(item, cell_range)
+        self._order.pop(item, None)
+
+    def clear(self):
+        self._cells.clear()
+        self._item_cells.clear()
+        self._order.clear()
+
+    def _unlink(self, item, cell_range):
+        cx0, cy0, cx1, cy1 = cell_range
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(item)
+                    if not cell:
+                        del self._cells[(cx, cy)]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    @staticmethod
+    def category_of(item):
+        category = getattr(item, 'category', None)
+        if category is None and hasattr(item, 'is_sushi'):
+            return 'food'
+        return category
+
+    def _matches(self, item, categories):
+        return categories is None or self.category_of(item) in categories
+
+    def items(self, categories=None):
+        """All indexed items, optionally limited to some categories"""
+        return [item for item in self if self._matches(item, categories)]
+
+    def query_rect(self, x1, y1, x2, y2, categories=None):
+        """Items whose cells overlap the rectangle (candidates, not an exact test)"""
+        size = self.cell_size
+        cx0, cy0 = int(math.floor(x1 / size)), int(math.floor(y1 / size))
+        cx1, cy1 = int(math.floor(x2 / size)), int(math.floor(y2 / size))
+        found = set()
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Query larger than the occupied area: walk the occupied cells instead
+            for (cx, cy), cell in self._cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found.update(cell)
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    cell = self._cells.get((cx, cy))
+                    if cell:
+                        found.update(cell)
+        return [item for item in self._sorted(found) if self._matches(item, categories)]
+
+    def query_radius(self, x, y, radius, categories=None):
+        """Items whose bounding-rect centre lies within `radius` of (x, y)"""
+        result = []
+        radius_sq = radius * radius
+        for item in self.query_rect(x - radius, y - radius, x + radius, y + radius, categories):
+            try:
+                x1, y1, x2, y2 = self._bounds(item)
+            except RuntimeError:
+                continue
+            dx = (x1 + x2) / 2 - x
+            dy = (y1 + y2) / 2 - y
+            if dx * dx + dy * dy <= radius_sq:
+                result.append(item)
+        return result
+
+    def query_cone(self, x, y, direction, half_angle, length, categories=None):
+        """
+        Candidates for a vision cone starting at (x, y) and pointing at `direction`.
+        Only cells inside the cone's bounding box are looked up, and of those only
+        the ones that intersect the cone are kept; callers still apply their own
+        exact point-in-cone test to the returned items.
+        """
+        if half_angle >= math.pi:
+            return self.query_radius_cells(x, y, length, categories)
+
+        size = self.cell_size
+        x1, y1, x2, y2 = _cone_bounds(x, y, direction, half_angle, length)
+        cx0, cy0 = int(math.floor(x1 / size)), int(math.floor(y1 / size))
+        cx1, cy1 = int(math.floor(x2 / size)), int(math.floor(y2 / size))
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self._cells):
+            # Box larger than the occupied area: walk the occupied cells instead
+            candidates = [(key, cell) for key, cell in self._cells.items()
+                          if cx0 <= key[0] <= cx1 and cy0 <= key[1] <= cy1]
+        else:
+            candidates = [((cx, cy), self._cells[(cx, cy)])
+                          for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)
+                          if (cx, cy) in self._cells]
+
+        found = set()
+        for (cx, cy), cell in candidates:
+            if self._cell_in_cone(cx, cy, x, y, direction, half_angle, length):
+                found.update(cell)
+        return [item for item in self._sorted(found) if self._matches(item, categories)]
+
+    def _cell_in_cone(self, cx, cy, x, y, direction, half_angle, length):
+        size = self.cell_size
+        left, top = cx * size, cy * size
+        right, bottom = left + size, top + size
+
+        # Nearest point of the cell to the cone origin
+        near_x = min(max(x, left), right)
+        near_y = min(max(y, top), bottom)
+        if (near_x - x) ** 2 + (near_y - y) ** 2 > length * length:
+            return False
+        if near_x == x and near_y == y:
+            return True  # Origin inside the cell
+
+        # Angular extent of the cell as seen from the origin (< pi, since the
+        # cell is convex and does not contain the origin)
+        centre_angle = math.atan2((top + bottom) / 2 - y, (left + right) / 2 - x)
+        offsets = [_wrap_angle(math.atan2(cy_ - y, cx_ - x) - centre_angle)
+                   for cx_, cy_ in ((left, top), (right, top), (left, bottom), (right, bottom))]
+        delta = _wrap_angle(centre_angle - direction)
+        low, high = delta + min(offsets), delta + max(offsets)
+        for shift in (0.0, 2 * math.pi, -2 * math.pi):
+            if low + shift <= half_angle and high + shift >= -half_angle:
+                return True
+        return False
+
+    def query_radius_cells(self, x, y, radius, categories=None):
+        """Candidates within `radius` of (x, y) by cell (no exact test)"""
+        return self.query_rect(x - radius, y - radius, x + radius, y + radius, categories)
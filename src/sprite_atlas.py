@@ -0,0 +1,71 @@
+import numpy as np
+from PyQt5 import QtGui
+
+WHITE_THRESHOLD = 240
+
+
+def tint_pixmap(pixmap, color, white_threshold=WHITE_THRESHOLD):
+    """
+    Copy of `pixmap` with its white parts recoloured to `color`.
+
+    A pixel counts as white when it is not fully transparent and its red,
+    green and blue are all above `white_threshold`. Tinted pixels keep their
+    own alpha so edges stay smooth; every other pixel is copied unchanged.
+    """
+    image = pixmap.toImage().convertToFormat(QtGui.QImage.Format_ARGB32)
+    width, height = image.width(), image.height()
+    if width == 0 or height == 0:
+        return QtGui.QPixmap(pixmap)
+
+    buffer = image.constBits()
+    buffer.setsize(image.byteCount())
+    # One 0xAARRGGBB word per pixel, independent of byte order
+    rows = np.frombuffer(buffer, dtype=np.uint32).reshape(height, image.bytesPerLine() // 4)
+    pixels = rows[:, :width].copy()
+
+    alpha = pixels >> 24
+    red = (pixels >> 16) & 0xFF
+    green = (pixels >> 8) & 0xFF
+    blue = pixels & 0xFF
+    white = (alpha > 0) & (red > white_threshold) & (green > white_threshold) & (blue > white_threshold)
+
+    tint_rgb = np.uint32(color.rgb() & 0xFFFFFF)
+    pixels[white] = (alpha[white] << 24) | tint_rgb
+
+    tinted = QtGui.QImage(pixels.data, width, height, width * 4, QtGui.QImage.Format_ARGB32)
+    # copy() detaches the image from the numpy buffer before it goes away
+    return QtGui.QPixmap.fromImage(tinted.copy())
+
+
+class SpriteAtlas:
+    """
+    Every squid frame, tinted once per tint colour.
+
+    Frames are looked up by name ('left1', 'sleep2', 'startled', ...). With
+    no tint the original pixmaps are returned; with a tint the whole set is
+    built in one pass the first time it is asked for, and thrown away when
+    the tint changes, so switching animation frames is a dict lookup.
+    """
+
+    def __init__(self, frames):
+        self.frames = dict(frames)
+        self._tint_key = None
+        self._tinted = {}
+
+    def frame(self, name, tint_color=None):
+        if not tint_color:
+            return self.frames[name]
+
+        tint_key = tint_color.rgb()
+        if tint_key != self._tint_key:
+            self._tinted = {
+                frame_name: tint_pixmap(pixmap, tint_color)
+                for frame_name, pixmap in self.frames.items()
+            }
+            self._tint_key = tint_key
+        return self._tinted[name]
+
+    def clear(self):
+        """Drop the tinted frames"""
+        self._tint_key = None
+        self._tinted = {}
@@ -9,10 +9,12 @@ from PyQt5.QtCore import QTimer
 from .mental_states import MentalStateManager
 from .memory_manager import MemoryManager
 from .personality import Personality
-from .decision_engine import DecisionEngine
 from .image_cache import ImageCache
+from .spatial_index import SpatialIndex
+from .sprite_atlas import SpriteAtlas
+from .simulation_core import SquidRules
 
-class Squid:
+class Squid(SquidRules):
 
     def __init__(self, user_interface, tamagotchi_logic=None, personality=None, neuro_cooldown=None):
         self.ui = user_interface
@@ -370,29 +372,20 @@ class Squid:
         self.original_width = original_images["left1"].width()
         self.original_height = original_images["left1"].height()
         
-        # Scale images for current resolution
+        # Scale images for current resolution (scaled copies are cached too)
         self.images = {}
         for name, pixmap in original_images.items():
-            # Calculate scaled size
-            scaled_width = int(pixmap.width() * image_scale)
-            scaled_height = int(pixmap.height() * image_scale)
-            
-            # Create scaled pixmap
-            self.images[name] = pixmap.scaled(
-                scaled_width, scaled_height,
-                QtCore.Qt.KeepAspectRatio, 
-                QtCore.Qt.SmoothTransformation
-            )
+            scaled_size = (int(pixmap.width() * image_scale), int(pixmap.height() * image_scale))
+            self.images[name] = ImageCache.get_pixmap(os.path.join("images", f"{name}.png"), scaled_size)
         
         # Scale startled image
-        original_startled = ImageCache.get_pixmap(os.path.join("images", "startled.png"))
-        startled_width = int(original_startled.width() * image_scale)
-        startled_height = int(original_startled.height() * image_scale)
-        self.startled_image = original_startled.scaled(
-            startled_width, startled_height,
-            QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation
-        )
+        startled_path = os.path.join("images", "startled.png")
+        original_startled = ImageCache.get_pixmap(startled_path)
+        startled_size = (int(original_startled.width() * image_scale), int(original_startled.height() * image_scale))
+        self.startled_image = ImageCache.get_pixmap(startled_path, startled_size)
+
+        # Tinted copies of every frame are built on demand from these
+        self.sprite_atlas = SpriteAtlas(dict(self.images, startled=self.startled_image))
         
         # Update squid dimensions to match scaled size
         self.squid_width = self.images["left1"].width()
@@ -469,14 +462,6 @@ class Squid:
         # This method was moved to TamagotchiLogic 26/07/2024
         pass
 
-    def make_decision(self):
-        """Delegate to the decision engine for emergent behavior"""
-        if not hasattr(self, '_decision_engine'):
-            from .decision_engine import DecisionEngine
-            self._decision_engine = DecisionEngine(self)
-        
-        return self._decision_engine.make_decision()
-    
     def handle_squid_click(self, event):
         """Handle mouse click on the squid"""
         if self.is_sleeping:
@@ -884,16 +869,6 @@ class Squid:
             
         return self.tamagotchi_logic.rock_interaction.start_rock_test(target_rock)
 
-    def move_erratically(self):
-        directions = ["left", "right", "up", "down"]
-        self.squid_direction = random.choice(directions)
-        self.move_squid()
-
-    def move_slowly(self):
-        self.base_squid_speed = self.base_squid_speed // 2
-        self.base_vertical_speed = self.base_vertical_speed // 2
-        self.move_squid()
-
     def explore_environment(self):
         if random.random() < 0.3:
             self.change_direction()
@@ -913,56 +888,38 @@ class Squid:
             self.status = "searching for food"
             self.move_randomly()
 
-    def get_visible_objects(self, object_list):
-        """
-        Finds objects from a given list that are within the squid's vision cone.
-        This is a generic helper method.
-        """
-        visible_objects = []
-        for item in object_list:
-            item_x, item_y = item.pos().x(), item.pos().y()
-            if self.is_in_vision_cone(item_x, item_y):
-                visible_objects.append(item)
-        return visible_objects
-
-    def get_visible_food(self):
-        """
-        Returns the positions of visible food items, prioritized by type (sushi first).
-        This method is now refactored to use the generic get_visible_objects.
-        """
+    def get_visible_plants(self):
+        """Finds plant decorations that are within the squid's vision cone."""
         if self.tamagotchi_logic is None:
             return []
-        
-        # Use the new generic method to find all food items in view
-        all_visible_food_items = self.get_visible_objects(self.tamagotchi_logic.food_items)
 
-        if not all_visible_food_items:
-            return []
+        return self.get_visible_scene_objects(('plant',))
 
-        # Sort visible food to prioritize sushi
-        sushi_items = [item for item in all_visible_food_items if getattr(item, 'is_sushi', False)]
-        other_food_items = [item for item in all_visible_food_items if not getattr(item, 'is_sushi', False)]
-        
-        # Return sorted positions
-        sorted_positions = [(food.pos().x(), food.pos().y()) for food in sushi_items]
-        sorted_positions.extend([(food.pos().x(), food.pos().y()) for food in other_food_items])
-        
-        return sorted_positions
-    
-    def get_visible_plants(self):
-        """Finds plant decorations that are within the squid's vision cone."""
-        if self.tamagotchi_logic is None:
+    def get_visible_scene_objects(self, categories=None):
+        """
+        Scene objects (decorations, rocks, poop, food) inside the vision cone,
+        optionally limited to some categories. Uses the scene's spatial index
+        so only grid cells the cone reaches are checked.
+        """
+        if self.tamagotchi_logic is None or not hasattr(self.tamagotchi_logic, 'user_interface'):
             return []
 
-        # Get all items in the scene that are categorized as 'plant'
-        all_plants = []
-        for item in self.tamagotchi_logic.user_interface.scene.items():
-            if hasattr(item, 'category') and item.category == 'plant':
-                all_plants.append(item)
+        # Inside a simulation tick, test the whole snapshot in one batch
+        snapshot = getattr(self.tamagotchi_logic, 'world_snapshot', None)
+        if snapshot is not None:
+            return snapshot.visible(self.get_vision_cone(), categories)
+
+        scene = self.tamagotchi_logic.user_interface.scene
 
-        # Use the existing generic vision function to see which plants are visible
-        visible_plants = self.get_visible_objects(all_plants)
-        return visible_plants
+        index = getattr(scene, 'spatial_index', None)
+        if index is not None:
+            candidates = index.query_cone(*self.get_vision_cone(), categories=categories)
+        else:
+            candidates = [item for item in scene.items()
+                          if (hasattr(item, 'category') or hasattr(item, 'is_sushi'))
+                          and (categories is None or SpatialIndex.category_of(item) in categories)]
+
+        return self.get_visible_objects(candidates)
 
     def is_in_vision_cone(self, x, y):
         """
@@ -975,10 +932,8 @@ class Squid:
         Returns:
             bool: True if the point is in vision cone, False otherwise
         """
-        # Get squid center position
-        squid_center_x = self.squid_x + self.squid_width // 2
-        squid_center_y = self.squid_y + self.squid_height // 2
-        
+        squid_center_x, squid_center_y, current_angle, cone_angle, cone_length = self.get_vision_cone()
+
         # Calculate vector to target
         dx = x - squid_center_x
         dy = y - squid_center_y
@@ -986,9 +941,6 @@ class Squid:
         # Calculate distance
         distance = math.sqrt(dx**2 + dy**2)
         
-        # Define vision cone length
-        cone_length = max(self.ui.window_width, self.ui.window_height)
-        
         # If target is beyond detection range, return false
         if distance > cone_length:
             return False
@@ -996,146 +948,12 @@ class Squid:
         # Calculate angle to target point
         angle_to_target = math.atan2(dy, dx)
         
-        # Get current view angle (use current_view_angle if available, otherwise derive from direction)
-        if hasattr(self, 'current_view_angle'):
-            current_angle = self.current_view_angle
-        else:
-            direction_map = {
-                'right': 0,
-                'up': math.pi * 1.5,
-                'left': math.pi,
-                'down': math.pi * 0.5
-            }
-            current_angle = direction_map.get(self.squid_direction, 0)
-        
-        # Get cone angle (half of the total view cone angle)
-        if hasattr(self, 'view_cone_angle'):
-            cone_angle = self.view_cone_angle / 2
-        else:
-            cone_angle = math.pi / 5  # Default 36-degree half-angle
-        
-        # Calculate angle difference (accounting for wrap-around)
-        angle_diff = abs(angle_to_target - current_angle)
-        while angle_diff > math.pi:
-            angle_diff = 2 * math.pi - angle_diff
+        # Calculate angle difference (accounting for wrap-around, so it is always in 0..pi)
+        angle_diff = abs((angle_to_target - current_angle + math.pi) % (2 * math.pi) - math.pi)
         
         # Check if the target is within the cone angle
         return angle_diff <= cone_angle
     
-    def change_view_cone_direction(self):
-        self.current_view_angle = random.uniform(0, 2 * math.pi)
-
-    def move_squid(self):
-        """
-        Move the squid with comprehensive debug logging and boundary check
-        """
-        # Check if movement is allowed
-        if not getattr(self, 'can_move', True):
-            return
-        
-        # Check if multiplayer is available and enabled
-        if hasattr(self.tamagotchi_logic, 'plugin_manager'):
-            pm = self.tamagotchi_logic.plugin_manager
-            multiplayer_enabled = 'multiplayer' in pm.get_enabled_plugins()
-        else:
-            multiplayer_enabled = False
-        
-        if self.animation_speed == 0:
-            #print("Animation speed is 0, no movement")
-            return
-
-        if self.is_sleeping:
-            #print("Squid is sleeping, limited movement")
-            if self.squid_y < self.ui.window_height - 120 - self.squid_height:
-                self.squid_y += self.base_vertical_speed * self.animation_speed
-                self.squid_item.setPos(self.squid_x, self.squid_y)
-            self.current_frame = (self.current_frame + 1) % 2
-            self.update_squid_image()
-            return
-
-        current_time = QtCore.QTime.currentTime().msecsSinceStartOfDay()
-
-        visible_food = self.get_visible_food()
-
-        if visible_food:
-            closest_food = min(visible_food, key=lambda f: self.distance_to(f[0], f[1]))
-            self.pursuing_food = True
-            self.target_food = closest_food
-            self.move_towards(closest_food[0], closest_food[1])
-        elif self.pursuing_food:
-            self.pursuing_food = False
-            self.target_food = None
-            self.move_randomly()
-        else:
-            if current_time - self.last_view_cone_change > self.view_cone_change_interval:
-                self.change_view_cone_direction()
-                self.last_view_cone_change = current_time
-            self.move_randomly()
-
-        # Calculate new position
-        squid_x_new = self.squid_x
-        squid_y_new = self.squid_y
-
-        if self.squid_direction == "left":
-            squid_x_new -= self.base_squid_speed * self.animation_speed
-        elif self.squid_direction == "right":
-            squid_x_new += self.base_squid_speed * self.animation_speed
-        elif self.squid_direction == "up":
-            squid_y_new -= self.base_vertical_speed * self.animation_speed
-        elif self.squid_direction == "down":
-            squid_y_new += self.base_vertical_speed * self.animation_speed
-
-        # Boundary handling for single-player and multiplayer modes
-        if not multiplayer_enabled:
-            # Original boundary restrictions for single-player mode
-            if squid_x_new < 50:
-                squid_x_new = 50
-                self.change_direction()
-            elif squid_x_new > self.ui.window_width - 50 - self.squid_width:
-                squid_x_new = self.ui.window_width - 50 - self.squid_width
-                self.change_direction()
-
-            if squid_y_new < 50:
-                squid_y_new = 50
-                self.change_direction()
-            elif squid_y_new > self.ui.window_height - 120 - self.squid_height:
-                squid_y_new = self.ui.window_height - 120 - self.squid_height
-                self.change_direction()
-        else:
-            # Extended boundary check for multiplayer
-            print("Multiplayer mode: Extended boundary check")
-            squid_right = squid_x_new + self.squid_width
-            squid_bottom = squid_y_new + self.squid_height
-
-        # Update squid position
-        self.squid_x = squid_x_new
-        self.squid_y = squid_y_new
-
-        # Update animation frame and image
-        if self.squid_direction in ["left", "right", "up", "down"]:
-            self.current_frame = (self.current_frame + 1) % 2
-            self.squid_item.setPixmap(self.current_image())
-
-        # Set new position and update related elements
-        self.squid_item.setPos(self.squid_x, self.squid_y)
-        self.update_view_cone()
-        self.update_sick_icon_position()
-
-        # Comprehensive boundary exit check in multiplayer mode
-        if multiplayer_enabled:
-            #print("Triggering boundary exit check in multiplayer mode")
-            exit_result = self.check_boundary_exit()
-            #print(f"Boundary Exit Result: {exit_result}")
-
-    def move_towards(self, x, y):
-        dx = x - (self.squid_x + self.squid_width // 2)
-        dy = y - (self.squid_y + self.squid_height // 2)
-
-        if abs(dx) > abs(dy):
-            self.squid_direction = "right" if dx > 0 else "left"
-        else:
-            self.squid_direction = "down" if dy > 0 else "up"
-
     def move_towards_position(self, target_pos):
         dx = target_pos.x() - (self.squid_x + self.squid_width // 2)
         dy = target_pos.y() - (self.squid_y + self.squid_height // 2)
@@ -1147,132 +965,6 @@ class Squid:
 
         self.move_squid()
 
-    def eat(self, food_item):
-        effects = {}
-
-        # Basic effects for all food types
-        effects['hunger'] = max(-20, -self.hunger)
-        effects['happiness'] = min(10, 100 - self.happiness)
-
-        # Determine food type and effects
-        is_sushi = getattr(food_item, 'is_sushi', False)
-        food_name = "sushi" if is_sushi else "cheese"
-        
-        # Satisfaction boost (stronger for sushi)
-        effects['satisfaction'] = min(15 if is_sushi else 10, 100 - self.satisfaction)
-
-        # Personality-based reward points
-        reward_points = 2  # Default for all food
-        if is_sushi and self.personality in [Personality.GREEDY, Personality.STUBBORN]:
-            reward_points = 3  # Extra reward for favorite food
-            effects['satisfaction'] = min(20, 100 - self.satisfaction)  # Even bigger boost
-
-        # Trigger hook if tamagotchi_logic exists
-        if hasattr(self, 'tamagotchi_logic') and self.tamagotchi_logic:
-            if hasattr(self.tamagotchi_logic, 'plugin_manager'):
-                self.tamagotchi_logic.plugin_manager.trigger_hook(
-                    "on_feed", 
-                    squid=self,
-                    food_item=food_item,
-                    food_type=food_name,
-                    effects=effects
-                )
-        
-        self.is_eating = True
-        self.status = "eating"
-        # Apply all stat changes
-        for attr, change in effects.items():
-            setattr(self, attr, getattr(self, attr) + change)
-
-        # Start a timer to reset the status after 1 second
-        QTimer.singleShot(1000, self.finish_eating)
-
-        # Memory system
-        formatted_effects = ', '.join(f"{attr.capitalize()} {'+' if val >= 0 else ''}{val:.2f}" 
-                            for attr, val in effects.items())
-        self.memory_manager.add_short_term_memory('food', food_name, 
-            f"Ate {food_name}: {formatted_effects}")
-
-        # Neurogenesis tracking
-        if hasattr(self.tamagotchi_logic, 'neurogenesis_triggers'):
-            current = self.tamagotchi_logic.neurogenesis_triggers['positive_outcomes']
-            self.tamagotchi_logic.neurogenesis_triggers['positive_outcomes'] = min(current + reward_points, 5)
-
-        # Visual/behavioral effects
-        self.status = f"Eating {food_name}"
-        self.tamagotchi_logic.remove_food(food_item)
-        self.show_eating_effect()
-        self.start_poop_timer()
-        self.pursuing_food = False
-        self.target_food = None
-        self.is_eating = False
-
-        # Personality reactions (with enhanced messages)
-        if self.personality == Personality.GREEDY:
-            self.eat_greedily(food_item)
-            if is_sushi:
-                self.tamagotchi_logic.show_message("Greedy squid devours sushi voraciously!")
-        elif self.personality == Personality.STUBBORN:
-            if not is_sushi:
-                self.react_stubborn_eating()
-            else:
-                self.tamagotchi_logic.show_message("Stubborn squid happily accepts sushi")
-
-    def eat_greedily(self, food_item):
-        self.status = "Eating greedily"
-        food_type = "sushi" if getattr(food_item, 'is_sushi', False) else "cheese"
-
-        # Reduce hunger more than usual
-        self.hunger = max(0, self.hunger - 25)
-
-        # Increase happiness more
-        self.happiness = min(100, self.happiness + 15)
-
-        # Increase satisfaction significantly
-        self.satisfaction = min(100, self.satisfaction + 20)
-
-        # Slightly increase anxiety (from overeating)
-        self.anxiety = min(100, self.anxiety + 5)
-
-        self.tamagotchi_logic.remove_food(food_item)
-        #print(f"The greedy squid enthusiastically ate the {food_type}")
-        self.show_eating_effect()
-        self.start_poop_timer()
-        self.pursuing_food = False
-        self.target_food = None
-
-        # Occasionally show a message
-        if random.random() < 0.2:  # 20% chance to show a message
-            self.tamagotchi_logic.show_message("Nom nom! Greedy squid devours the food!")
-
-        # Check if there's more food nearby
-        if self.check_for_more_food():
-            if random.random() < 0.1:  # 10% chance to show this message
-                self.tamagotchi_logic.show_message("Greedy squid looks around for more food...")
-        else:
-            if random.random() < 0.1:  # 10% chance to show this message
-                self.tamagotchi_logic.show_message("Greedy squid is satisfied... for now.")
-
-    def react_stubborn_eating(self):
-        if self.hunger > 80:  # Extremely hungry
-            self.happiness = max(0, self.happiness - 5)
-            self.tamagotchi_logic.show_message("Stubborn squid reluctantly eats non-sushi food.")
-        else:
-            self.tamagotchi_logic.show_message("Stubborn squid ignores non-sushi food.")
-
-    def check_for_more_food(self):
-        for food_item in self.tamagotchi_logic.food_items:
-            if self.is_food_nearby(food_item):
-                return True
-        return False
-
-    def is_food_nearby(self, food_item):
-        food_x, food_y = food_item.pos().x(), food_item.pos().y()
-        squid_center_x = self.squid_x + self.squid_width // 2
-        squid_center_y = self.squid_y + self.squid_height // 2
-        distance = math.sqrt((squid_center_x - food_x)**2 + (squid_center_y - food_y)**2)
-        return distance < 100  # Adjust the distance threshold as needed
-    
     def process_squid_detection(self, remote_node_id, is_visible=True):
         """
         Process the detection of another squid in this squid's vision cone
@@ -1486,102 +1178,33 @@ class Squid:
             return "hoarding"
         return "nothing_to_hoard"
 
-    def go_to_sleep(self):
-        if not self.is_sleeping:
-            self.is_sleeping = True
-            self.squid_direction = "down"
-            self.status = "sleeping"
-            
-            # Trigger hook if tamagotchi_logic exists
-            if hasattr(self, 'tamagotchi_logic') and self.tamagotchi_logic:
-                if hasattr(self.tamagotchi_logic, 'plugin_manager'):
-                    self.tamagotchi_logic.plugin_manager.trigger_hook(
-                        "on_sleep", 
-                        squid=self
-                    )
-            
-            # Clear all short-term memories when the squid goes to sleep
-            self.memory_manager.clear_short_term_memory()
+    def update_squid_image(self):
+        self.squid_item.setPixmap(self.current_image())
 
-            self.tamagotchi_logic.show_message("Squid is sleeping...")
+    def set_squid_pos(self):
+        self.squid_item.setPos(self.squid_x, self.squid_y)
 
-    def wake_up(self):
-        self.is_sleeping = False
-        self.sleepiness = 0
-        self.happiness = min(100, self.happiness + 20)
-        self.status = "roaming"
-        self.squid_direction = "left"
-        self.update_squid_image()
-        self.tamagotchi_logic.show_message("Squid woke up!")
+    def current_time_ms(self):
+        return QtCore.QTime.currentTime().msecsSinceStartOfDay()
 
-    def update_squid_image(self):
-        self.squid_item.setPixmap(self.current_image())
+    def schedule_finish_eating(self):
+        QTimer.singleShot(1000, self.finish_eating)
 
     def current_image(self):
         """Return the current image of the squid, with tint applied only to white parts."""
-        # Base image selection logic (same as before)
         if hasattr(self, 'startled_transition') and self.startled_transition:
-            base_image = self.startled_image
+            frame = "startled"
         elif hasattr(self, 'status') and self.status == "startled" and not self.is_sleeping:
             direction = "left" if random.random() < 0.5 else "right"
-            base_image = self.images[f"{direction}{self.current_frame + 1}"]
+            frame = f"{direction}{self.current_frame + 1}"
         elif self.is_sleeping:
-            base_image = self.images[f"sleep{self.current_frame + 1}"]
-        elif self.squid_direction == "left":
-            base_image = self.images[f"left{self.current_frame + 1}"]
-        elif self.squid_direction == "right":
-            base_image = self.images[f"right{self.current_frame + 1}"]
-        elif self.squid_direction == "up":
-            base_image = self.images[f"up{self.current_frame + 1}"]
+            frame = f"sleep{self.current_frame + 1}"
+        elif self.squid_direction in ("left", "right", "up"):
+            frame = f"{self.squid_direction}{self.current_frame + 1}"
         else:
-            base_image = self.images["left1"]
-
-        # If no tint color is set, return the original image
-        if not self.tint_color:
-            return base_image
-
-        # --- Corrected Tinting Logic ---
-
-        # Convert the QPixmap to a QImage for pixel-level access
-        source_image = base_image.toImage()
+            frame = "left1"
 
-        # Create a new QImage to draw our modified squid onto.
-        # Using Format_ARGB32 is crucial for handling transparency correctly
-        # and preventing the black background issue.
-        output_image = QtGui.QImage(source_image.size(), QtGui.QImage.Format_ARGB32)
-        output_image.fill(QtCore.Qt.transparent)  # Start with a fully transparent canvas
-
-        white_threshold = 240
-
-        # Iterate over every pixel in the source image
-        for y in range(source_image.height()):
-            for x in range(source_image.width()):
-                # Get the color of the current pixel from the source
-                pixel_color = QtGui.QColor(source_image.pixel(x, y))
-
-                # Check if the pixel is 'white enough' and not fully transparent
-                if (pixel_color.alpha() > 0 and
-                    pixel_color.red() > white_threshold and
-                    pixel_color.green() > white_threshold and
-                    pixel_color.blue() > white_threshold):
-                    
-                    # If it's a white pixel, apply the tint color
-                    new_color = QtGui.QColor(self.tint_color)
-                    # Preserve the original pixel's alpha value to keep smooth edges
-                    new_color.setAlpha(pixel_color.alpha())
-                    output_image.setPixelColor(x, y, new_color)
-                else:
-                    # For any other pixel (the outline, or fully transparent areas),
-                    # just copy it directly from the source. This ensures the background
-                    # remains transparent.
-                    output_image.setPixel(x, y, source_image.pixel(x, y))
-
-        # Convert the modified QImage back to a QPixmap and return it
-        return QtGui.QPixmap.fromImage(output_image)
-
-    def move_randomly(self):
-        if random.random() < 0.20:
-            self.change_direction()
+        return self.sprite_atlas.frame(frame, self.tint_color)
 
     def get_food_position(self):
         if self.tamagotchi_logic.food_items:
@@ -1591,16 +1214,6 @@ class Squid:
         else:
             return -1, -1
 
-    def distance_to(self, x, y):
-        return math.sqrt((self.squid_x - x)**2 + (self.squid_y - y)**2)
-
-    def change_direction(self):
-        directions = ["left", "right", "up", "down"]
-        new_direction = random.choice(directions)
-        while new_direction == self.squid_direction:
-            new_direction = random.choice(directions)
-        self.squid_direction = new_direction
-
     def toggle_view_cone(self):
         self.view_cone_visible = not self.view_cone_visible
         if self.view_cone_visible:
@@ -1661,13 +1274,6 @@ class Squid:
             self.sick_icon_item.setPos(self.squid_x + self.squid_width // 2 - self.sick_icon_item.pixmap().width() // 2 + self.sick_icon_offset.x(),
                                        self.squid_y + self.sick_icon_offset.y())
 
-    def is_near_plant(self):
-        if self.tamagotchi_logic is None:
-            return False
-
-        nearby_decorations = self.tamagotchi_logic.get_nearby_decorations(self.squid_x, self.squid_y)
-        return any(decoration.category == 'plant' for decoration in nearby_decorations)
-
     def move_towards_plant(self):
         if self.tamagotchi_logic is None:
             return
@@ -1741,13 +1347,6 @@ class Squid:
             return False
         return self.tamagotchi_logic.rock_interaction.attach_rock_to_squid(item)
 
-    def throw_rock(self, direction):
-        """Delegate to interaction manager"""
-        if not hasattr(self.tamagotchi_logic, 'rock_interaction'):
-            return False
-        return self.tamagotchi_logic.rock_interaction.throw_rock(direction)
-
-
     def update_rock_throw(self):
         if not self.rock_being_thrown or not self.rock_being_thrown.scene():
             self.rock_animation_timer.stop()
@@ -6,18 +6,25 @@ import time
 import json
 import math
 from .statistics_window import StatisticsWindow
-from .save_manager import SaveManager
+from .save_manager import SaveManager, snapshot_data
 from .rps_game import RPSGame
 from .squid import Personality, Squid
 from .ui import ResizablePixmapItem
+from .world_snapshot import WorldSnapshot
 from .brain_tool import SquidBrainWindow
 from .learning import HebbianLearning
 from .interactions import RockInteractionManager
 from .interactions2 import PoopInteractionManager
 from .config_manager import ConfigManager
 from .plugin_manager import PluginManager
+from .simulation_core import SimulationRules
 
-class TamagotchiLogic:
+class SaveNotifier(QtCore.QObject):
+    """Carries background save results back to the GUI thread"""
+    finished = QtCore.pyqtSignal(object)  # filepath, or None on failure
+
+
+class TamagotchiLogic(SimulationRules):
     def __init__(self, user_interface, squid, brain_window):
         self.config_manager = ConfigManager()
         self._propagating_debug_mode = False
@@ -38,6 +45,8 @@ class TamagotchiLogic:
         self.squid = squid
         self.brain_window = brain_window
         self.window_resize_cooldown = 0
+        self.tick_count = 0
+        self.world_snapshot = None  # Only set while update_simulation runs
         self.window_resize_cooldown_max = 30  # 30 updates before another resize can startle
         self.has_been_resized = False
         self.was_big = False
@@ -59,6 +68,8 @@ class TamagotchiLogic:
 
         # Initialize core attributes first
         self.simulation_speed = 1  # Default to 1x speed
+        self.max_catch_up_seconds = 24 * 60 * 60  # Longest absence fast_forward replays on load
+        self.fast_forward_step = 30  # Seconds of needs decay batched into one fast_forward step
         self.base_interval = 1000  # 1000ms = 1 second base interval
         self.base_food_speed = 90  # pixels per update at 1x speed
 
@@ -102,7 +113,14 @@ class TamagotchiLogic:
             self.add_thought = self._log_thought
 
         # Initialize save manager
-        self.save_manager = SaveManager()
+        save_config = self.config_manager.get_save_config()
+        self.autosave_interval = save_config['autosave_interval']
+        self.save_manager = SaveManager(brain_format=save_config['brain_format'],
+                                        delta_autosave=save_config['delta_autosave'],
+                                        checkpoint_every=save_config['checkpoint_every'])
+        # load_game may catch up on time away, which runs the squid's rules
+        if self.squid is not None:
+            self.squid.tamagotchi_logic = self
         self.load_game()
 
         # Connect menu actions
@@ -138,6 +156,8 @@ class TamagotchiLogic:
 
         self.autosave_timer = QtCore.QTimer()
         self.autosave_timer.timeout.connect(self.autosave)
+        self.save_notifier = SaveNotifier()
+        self.save_notifier.finished.connect(self.on_autosave_finished)
 
         # Initialize goal neurons
         self.squid.satisfaction = 50
@@ -384,78 +404,27 @@ class TamagotchiLogic:
         self.user_interface.scene.update()
 
 
-    def update_decoration_learning(self, effects):
-        if not effects:
-            return
-
-        # Get the current state of the squid
-        current_state = {
-            "hunger": self.squid.hunger,
-            "happiness": self.squid.happiness,
-            "cleanliness": self.squid.cleanliness,
-            "sleepiness": self.squid.sleepiness,
-            "satisfaction": self.squid.satisfaction,
-            "anxiety": self.squid.anxiety,
-            "curiosity": self.squid.curiosity
-        }
-
-        # Update the brain based on the decoration effects
-        for stat, boost in effects.items():
-            if stat in current_state:
-                # Increase the connection strength between the affected stat and satisfaction
-                self.brain_window.brain_widget.strengthen_connection(stat, 'satisfaction', boost * 0.01)
-                
-                # If the boost is significant, also strengthen connection with happiness
-                if boost > 5:
-                    self.brain_window.brain_widget.strengthen_connection(stat, 'happiness', boost * 0.005)
-
-        # Update the squid's memory
-        decoration_memory = {
-            "category": "decorations",
-            "effects": effects,
-            "timestamp": time.time()
-        }
-        self.squid.memory_manager.add_short_term_memory('decorations', str(time.time()), decoration_memory)
-
-        # If this is a significant effect, consider transferring to long-term memory
-        if any(boost > 10 for boost in effects.values()):
-            self.squid.memory_manager.transfer_to_long_term_memory('decorations', str(time.time()))
-
-
     def _log_thought(self, thought):
         self.thought_log.append(thought)
         print(f"Squid thought: {thought}")
 
-    def check_for_decoration_attraction(self):
-        squid_x = self.squid.squid_x
-        squid_y = self.squid.squid_y
-        
-        active_decorations = self.get_nearby_decorations(squid_x, squid_y)
-        
-        if active_decorations:
-            self.apply_decoration_effects(active_decorations)
-            
-            # NEW: Check for plant contact and update status
-            is_hiding = False
-            for decoration in active_decorations:
-                if hasattr(decoration, 'category') and decoration.category == 'plant':
-                    if decoration.collidesWithItem(self.squid.squid_item):
-                        self.squid.status = "hiding behind plant"
-                        is_hiding = True
-                        break  # Squid can only hide behind one plant at a time
-            
-            if not is_hiding and self.squid.status == "hiding behind plant":
-                self.squid.status = "roaming" # Or another default status
-                
-            # Move decorations
-            for decoration in active_decorations:
-                decoration_pos = decoration.pos()
-                if decoration_pos.x() < squid_x:
-                    self.move_decoration(decoration, 5)  # Move right
-                else:
-                    self.move_decoration(decoration, -5)  # Move left
+    def squid_touches(self, item):
+        return item.collidesWithItem(self.squid.squid_item)
+
+    def update_mental_states(self):
+        if self.mental_states_enabled:
+            self.check_for_startle()
+            self.check_for_curiosity()
 
     def get_nearby_decorations(self, x, y, radius=100):
+        if self.world_snapshot is not None:
+            return self.world_snapshot.near(x, y, radius, decorations_only=True)
+
+        index = getattr(self.user_interface.scene, 'spatial_index', None)
+        if index is not None:
+            return [item for item in index.query_radius(x, y, radius)
+                    if isinstance(item, ResizablePixmapItem)]
+
         nearby_decorations = []
         for item in self.user_interface.scene.items():
             if isinstance(item, ResizablePixmapItem):
@@ -520,57 +489,6 @@ class TamagotchiLogic:
         # Start the animation and have it delete itself when finished
         animation.start(QtCore.QAbstractAnimation.DeleteWhenStopped)
 
-    def apply_decoration_effects(self, active_decorations):
-        """Apply effects from nearby decorations"""
-        if not active_decorations:
-            return
-
-        effects = {}
-        strongest_effect = 0
-        strongest_decoration = None
-
-        for decoration in active_decorations:
-            if not hasattr(decoration, 'filename') or decoration.filename is None:
-                continue
-            if not hasattr(decoration, 'stat_modifiers') or not decoration.stat_modifiers:
-                continue
-
-            # Find the decoration with the strongest effect (absolute value)
-            max_modifier = max(abs(val) for val in decoration.stat_modifiers.values())
-            if max_modifier > strongest_effect:
-                strongest_effect = max_modifier
-                strongest_decoration = decoration
-
-        if strongest_decoration:
-            # Apply stat modifiers additively
-            for stat, modifier in strongest_decoration.stat_modifiers.items():
-                if hasattr(self.squid, stat):
-                    current_value = getattr(self.squid, stat)
-                    new_value = current_value + modifier
-                    # Clamp the value between 0 and 100
-                    new_value = max(0, min(100, new_value))
-                    setattr(self.squid, stat, new_value)
-                    effects[stat] = modifier
-
-            # Apply category-specific effects
-            if strongest_decoration.category == 'plant':
-                old_cleanliness = self.squid.cleanliness
-                self.squid.cleanliness = min(self.squid.cleanliness + 5, 100)
-                effects['cleanliness'] = effects.get('cleanliness', 0) + (self.squid.cleanliness - old_cleanliness)
-            elif strongest_decoration.category == 'rock':
-                old_satisfaction = self.squid.satisfaction
-                self.squid.satisfaction = min(self.squid.satisfaction + 5, 100)
-                effects['satisfaction'] = effects.get('satisfaction', 0) + (self.squid.satisfaction - old_satisfaction)
-
-        if strongest_decoration and hasattr(strongest_decoration, 'filename') and strongest_decoration.filename is not None:
-            self.squid.memory_manager.add_short_term_memory('decorations', strongest_decoration.filename, effects)
-        else:
-            if effects:
-                self.squid.memory_manager.add_short_term_memory('decorations', 'nearby_decorations', effects)
-
-        if effects:
-            self.update_decoration_learning(effects)
-
     def check_decoration_startle(self, active_decorations):
         if not self.mental_states_enabled:
             return
@@ -965,97 +883,119 @@ class TamagotchiLogic:
             self.brain_window.add_thought("No longer startled")
 
     def update_simulation(self):
-        # Trigger pre-update hook
-        self.plugin_manager.trigger_hook("pre_update", 
-                                        tamagotchi_logic=self, 
-                                        squid=self.squid)
-        # 1. Handle existing simulation updates
-        self.move_objects()
-        self.animate_poops()
-        self.update_statistics()
+        self.tick_count += 1
 
-        # Add poop interaction check
-        self.check_poop_interaction()
-        
-        if self.squid:
-            # 2. Core squid updates
-            self.squid.move_squid()
-            self.check_for_decoration_attraction()
-            self.check_for_sickness()
-            
-            # 3. Mental state updates
-            if self.mental_states_enabled:
-                self.check_for_startle()
-                self.check_for_curiosity()
-            
-            # 4. Neurogenesis tracking
-            self.track_neurogenesis_triggers()
-            
-            # 5. Memory management
-            # During sleep, consolidate short-term memories to long-term
-            if self.squid.is_sleeping:
-                self.squid.memory_manager.review_and_transfer_memories()
-            else:
-                self.squid.memory_manager.periodic_memory_management() # Existing periodic management
-            
-            # 6. Prepare brain state with neurogenesis data
-            brain_state = {
-                "hunger": self.squid.hunger,
-                "happiness": self.squid.happiness,
-                "cleanliness": self.squid.cleanliness,
-                "sleepiness": self.squid.sleepiness,
-                "satisfaction": self.squid.satisfaction,
-                "anxiety": self.squid.anxiety,
-                "curiosity": self.squid.curiosity,
-                "is_sick": self.squid.is_sick,
-                "is_sleeping": self.squid.is_sleeping,
-                "pursuing_food": self.squid.pursuing_food,
-                "direction": self.squid.squid_direction,
-                "position": (self.squid.squid_x, self.squid.squid_y),
-                
-                # Neurogenesis-specific additions
-                "novelty_exposure": self.neurogenesis_triggers['novel_objects'],
-                "sustained_stress": self.neurogenesis_triggers['high_stress_cycles'] / 10.0,
-                "recent_rewards": self.neurogenesis_triggers['positive_outcomes'],
-                "personality": self.squid.personality.value
-            }
-            
-            # 7. Update brain (will trigger neurogenesis checks)
-            self.brain_window.update_brain(brain_state)
+        # Snapshot world objects once; movement, decisions and plugin hooks read
+        # it via self.world_snapshot until the end of the tick
+        self.world_snapshot = WorldSnapshot.capture(self.user_interface.scene, self.tick_count,
+                                                    ResizablePixmapItem)
+        try:
+            # Trigger pre-update hook
+            self.plugin_manager.trigger_hook("pre_update", 
+                                            tamagotchi_logic=self, 
+                                            squid=self.squid)
+            # 1. Handle existing simulation updates
+            self.move_objects()
+            self.animate_poops()
+            self.update_statistics()
+
+            # Add poop interaction check
+            self.check_poop_interaction()
             
-            # 8. Reset frame-specific flags
-            self.new_object_encountered = False
-            self.recent_positive_outcome = False
-
-        # 9. Handle RPS game state if active
-        if hasattr(self, 'rps_game') and self.rps_game.game_window:
-            self.rps_game.update_state()
-            # Trigger post-update hook at the end
-        self.plugin_manager.trigger_hook("post_update", 
-                                        tamagotchi_logic=self, 
-                                        squid=self.squid)
-
-    def check_for_sickness(self):
-        # Existing sickness logic
-        if (self.cleanliness_threshold_time >= 10 * self.simulation_speed and self.cleanliness_threshold_time <= 60 * self.simulation_speed) or \
-        (self.hunger_threshold_time >= 10 * self.simulation_speed and self.hunger_threshold_time <= 50 * self.simulation_speed):
-            if random.random() < 0.8:
-                self.squid.mental_state_manager.set_state("sick", True)
-                
-                # Set more descriptive sick status
-                if self.squid.health < 30:
-                    self.squid.status = "suffering"
-                elif self.squid.health < 50:
-                    self.squid.status = "feeling ill"
-                else:
-                    self.squid.status = "feeling sick"
-                    
-                self.show_message("Squid is feeling sick!")
-        else:
-            if self.squid.mental_state_manager.is_state_active("sick") and self.squid.health > 80:
-                self.squid.status = "recuperating"
-            self.squid.mental_state_manager.set_state("sick", False)
-    
+            if self.squid:
+                # 2. - 8. Squid, memory and brain updates
+                self.update_squid_tick()
+
+            # 9. Handle RPS game state if active
+            if hasattr(self, 'rps_game') and self.rps_game.game_window:
+                self.rps_game.update_state()
+                # Trigger post-update hook at the end
+            self.plugin_manager.trigger_hook("post_update", 
+                                            tamagotchi_logic=self, 
+                                            squid=self.squid)
+        finally:
+            # A failed tick must not leave a stale snapshot behind
+            self.world_snapshot = None
+
+    def fast_forward(self, seconds, age_memories=True):
+        """
+        Advance the simulation by `seconds` of game time without rendering.
+
+        The skipped time runs in batched steps of `fast_forward_step` seconds:
+        each step scales the needs, health and trigger rates by the step length
+        and checks sickness, sleep and neurogenesis once, at its end, on a
+        simulated clock that ends at the current time. The squid is held in
+        place. Hebbian learning runs as one batched pass per learning interval.
+        Messages and thoughts from the skipped time are not shown; the squid's
+        state afterwards and one summary message stand in for them.
+        Pass age_memories=False when the time has already passed in the real
+        world (e.g. since a save was written), since the memories' timestamps
+        are then already that old.
+        Returns the number of simulated seconds actually processed.
+        """
+        if not self.squid or seconds <= 0:
+            return 0
+
+        squid = self.squid
+        brain_widget = getattr(self.brain_window, 'brain_widget', None)
+
+        # Pause the real-time timers while we catch up
+        was_running = self.simulation_timer.isActive()
+        self.simulation_timer.stop()
+        self.brain_update_timer.stop()
+
+        hebbian_interval = 30
+        if brain_widget is not None and hasattr(brain_widget, 'config'):
+            hebbian_interval = max(1, int(brain_widget.config.hebbian.get('learning_interval', 30000) / 1000))
+        step = max(1, min(int(self.fast_forward_step), hebbian_interval))
+
+        # The simulated clock runs over the skipped span and ends now
+        total = int(seconds)
+        start_time = time.time() - total
+        saved_speed = self.simulation_speed
+        self.simulation_speed = 1
+        elapsed = 0
+        next_hebbian = hebbian_interval
+        near_plant = squid.is_near_plant()  # The squid holds still while we catch up
+
+        try:
+            while elapsed < total and squid.health > 0:
+                batch = min(step, total - elapsed)
+                elapsed += batch
+                now = start_time + elapsed
+
+                self.update_needs(batch, now=now, quiet=True, near_plant=near_plant)
+                self.check_for_sickness(quiet=True)
+                self.track_neurogenesis_triggers(batch, quiet=True)
+                self.recent_positive_outcome = False
+
+                if brain_widget is not None:
+                    brain_widget.update_state(self.get_brain_state(), now=now)
+                    if elapsed >= next_hebbian:
+                        brain_widget.batch_hebbian_learning(brain_widget.get_active_neurons(), now=now)
+                        next_hebbian += hebbian_interval
+        finally:
+            self.simulation_speed = saved_speed
+
+        if age_memories:
+            squid.memory_manager.age_memories(elapsed)
+        squid.memory_manager.review_and_transfer_memories()
+
+        self.user_interface.update_points(self.points)
+        self.update_squid_brain()
+        squid.update_squid_image()
+
+        if squid.health == 0:
+            return elapsed  # update_needs has already ended the game
+
+        hours, minutes = divmod(elapsed // 60, 60)
+        self.show_message(f"Caught up on {hours}h {minutes}m of squid life")
+
+        self.brain_update_timer.start(1000)
+        if was_running:
+            self.update_timers()
+        return elapsed
+
     def check_for_curiosity(self):
         if self.curious_cooldown > 0:
             self.curious_cooldown -= 1
@@ -1072,52 +1012,6 @@ class TamagotchiLogic:
         if random.random() < curious_chance:
             self.make_squid_curious()
 
-    def track_neurogenesis_triggers(self):
-        """Update counters for neurogenesis triggers"""
-        # Novelty tracking
-        if self.new_object_encountered:
-            self.neurogenesis_triggers['novel_objects'] = min(
-                self.neurogenesis_triggers['novel_objects'] + 1,
-                10  # Max cap
-            )
-            # Add thought about novelty
-            self.add_thought("Encountered something new!")
-        else:
-            # Gradual decay when no novelty
-            self.neurogenesis_triggers['novel_objects'] *= 0.95
-        
-        # Stress tracking
-        if self.squid.anxiety > 70:
-            self.neurogenesis_triggers['high_stress_cycles'] += 1
-            # Add thought about stress if threshold crossed
-            if self.neurogenesis_triggers['high_stress_cycles'] > 5:
-                self.add_thought("Feeling stressed for a while...")
-        else:
-            self.neurogenesis_triggers['high_stress_cycles'] = max(
-                0,
-                self.neurogenesis_triggers['high_stress_cycles'] - 0.5
-            )
-        
-        # Reward tracking (positive outcomes like eating, playing)
-        if self.recent_positive_outcome:
-            self.neurogenesis_triggers['positive_outcomes'] = min(
-                self.neurogenesis_triggers['positive_outcomes'] + 1,
-                5  # Max cap
-            )
-            # Add thought about positive experience
-            if random.random() < 0.3:  # 30% chance to comment
-                self.add_thought("That was enjoyable!")
-        else:
-            # Gradual decay when no rewards
-            self.neurogenesis_triggers['positive_outcomes'] = max(
-                0,
-                self.neurogenesis_triggers['positive_outcomes'] - 0.2
-            )
-        
-        # Debug output if in debug mode
-        if self.debug_mode:
-            print(f"Neurogenesis triggers: {self.neurogenesis_triggers}")
-
     def make_squid_curious(self):
         self.squid.mental_state_manager.set_state("curious", True)
         self.curious_cooldown = self.curious_cooldown_max
@@ -1159,26 +1053,6 @@ class TamagotchiLogic:
                 
                 self.curious_interaction_cooldown = self.curious_interaction_cooldown_max
 
-    def update_curiosity(self):
-        # Update curiosity based on satisfaction and anxiety
-        if self.squid.satisfaction > 70 and self.squid.anxiety < 30:
-            curiosity_change = 0.2 * self.simulation_speed
-        else:
-            curiosity_change = -0.1 * self.simulation_speed
-
-        # Adjust curiosity change based on personality
-        if self.squid.personality == Personality.TIMID:
-            curiosity_change *= 0.5  # Timid squids are less curious
-        elif self.squid.personality == Personality.ADVENTUROUS:
-            curiosity_change *= 1.5  # Adventurous squids are more curious
-
-        self.squid.curiosity += curiosity_change
-        self.squid.curiosity = max(0, min(100, self.squid.curiosity))
-
-        # Check if the squid should enter the curious state
-        if self.squid.curiosity > 80 and self.mental_states_enabled:
-            self.check_for_curiosity()
-
     def move_objects(self):
         self.move_foods()
         self.move_poops()
@@ -1321,6 +1195,7 @@ class TamagotchiLogic:
             cheese_y = self.user_interface.window_height - 120 - self.food_height
 
         cheese_item.setPos(cheese_x, cheese_y)
+        self._update_spatial_index(cheese_item)
 
         # Directly check collision without redundant checks
         if self.squid and cheese_item.collidesWithItem(self.squid.squid_item):
@@ -1337,11 +1212,18 @@ class TamagotchiLogic:
             sushi_y = self.user_interface.window_height - 120 - self.food_height
 
         sushi_item.setPos(sushi_x, sushi_y)
+        self._update_spatial_index(sushi_item)
 
         if self.squid is not None and sushi_item.collidesWithItem(self.squid.squid_item):
             self.squid.eat(sushi_item)  # Pass the sushi_item as an argument
             self.remove_food(sushi_item)
 
+    def _update_spatial_index(self, item):
+        # Plain pixmap items (food) don't report their moves themselves
+        index = getattr(self.user_interface.scene, 'spatial_index', None)
+        if index is not None and item in index:
+            index.update(item)
+
     def is_sushi(self, food_item):
         return getattr(food_item, 'is_sushi', False)     
 
@@ -1349,6 +1231,9 @@ class TamagotchiLogic:
         if food_item in self.food_items:
             self.user_interface.scene.removeItem(food_item)
             self.food_items.remove(food_item)
+            # Later phases of this tick must not see or chase it
+            if self.world_snapshot is not None:
+                self.world_snapshot.discard(food_item)
 
     def move_poops(self):
         for poop_item in self.poop_items[:]:
@@ -1365,115 +1250,7 @@ class TamagotchiLogic:
         self.update_cleanliness_overlay()
 
         if self.squid is not None:
-            # Update squid needs
-            if not self.squid.is_sleeping:
-                self.squid.hunger = min(100, self.squid.hunger + (0.1 * self.simulation_speed))
-                self.squid.sleepiness = min(100, self.squid.sleepiness + (0.25 * self.simulation_speed))
-                self.squid.happiness = max(0, self.squid.happiness - (0.1 * self.simulation_speed))
-                self.squid.cleanliness = max(0, self.squid.cleanliness - (0.1 * self.simulation_speed))
-
-                # Update new neurons
-                self.update_satisfaction()
-                self.update_anxiety()
-                self.update_curiosity()
-
-                # --- NEWLY ADDED ---
-                # Check for special status effects on anxiety reduction.
-                if self.squid.status == "hiding behind plant":
-                    # Hiding among plants actively reduces anxiety over time.
-                    # This makes it a tangible calming behavior for the squid.
-                    previous_anxiety = self.squid.anxiety
-                    self.squid.anxiety = max(0, self.squid.anxiety - (0.5 * self.simulation_speed))
-                    
-                    if self.squid.anxiety < previous_anxiety:
-                        # Form a memory of the calming effect
-                        memory_value = "Being near plants is calming (Anxiety reduction)"
-                        self.squid.memory_manager.add_short_term_memory(
-                            'environment', 
-                            'plant_calming_effect', 
-                            memory_value,
-                            importance=1.5  # Higher importance
-                        )
-
-                        # Increment counter and check for long-term memory transfer
-                        self.plant_calming_effect_counter += 1
-                        if self.plant_calming_effect_counter >= 5:
-                            self.squid.memory_manager.transfer_to_long_term_memory(
-                                'environment', 
-                                'plant_calming_effect'
-                            )
-                            self.plant_calming_effect_counter = 0 # Reset counter
-
-                # Check if cleanliness has been too low for too long
-                if self.squid.cleanliness < 20:
-                    self.cleanliness_threshold_time += 1
-                else:
-                    self.cleanliness_threshold_time = 0
-
-                # Check if hunger has been too high for too long
-                if self.squid.hunger > 80:
-                    self.hunger_threshold_time += 1
-                else:
-                    self.hunger_threshold_time = 0
-
-                # Check if squid becomes sick (80% chance)
-                if (self.cleanliness_threshold_time >= 10 * self.simulation_speed and self.cleanliness_threshold_time <= 60 * self.simulation_speed) or \
-                (self.hunger_threshold_time >= 10 * self.simulation_speed and self.hunger_threshold_time <= 50 * self.simulation_speed):
-                    if random.random() < 0.8:
-                        self.squid.mental_state_manager.set_state("sick", True)
-                else:
-                    self.squid.mental_state_manager.set_state("sick", False)
-
-                # New logic for health decrease based on happiness and cleanliness
-                if self.squid.happiness < 20 and self.squid.cleanliness < 20:
-                    health_decrease = 0.2 * self.simulation_speed  # Rapid decrease
-                else:
-                    health_decrease = 0.1 * self.simulation_speed  # Normal decrease when sick
-
-                # Store previous health for change detection
-                previous_health = self.squid.health
-
-                if self.squid.is_sick:
-                    self.squid.health = max(0, self.squid.health - health_decrease)
-                    self.squid.show_sick_icon()
-                    if self.squid.health == 0:
-                        self.game_over()
-                else:
-                    self.squid.health = min(100, self.squid.health + (0.1 * self.simulation_speed))
-                    self.squid.hide_sick_icon()
-                
-                # Track health history
-                if not hasattr(self, '_health_history'):
-                    self._health_history = []
-                
-                # Add current health data point with timestamp
-                # Only record if health actually changed or if we haven't recorded in a while
-                if (previous_health != self.squid.health or 
-                    not self._health_history or 
-                    time.time() - self._health_history[-1][0] > 60):  # Record at least every 60 seconds
-                    self._health_history.append((time.time(), self.squid.health))
-                    
-                    # Limit history size to prevent memory issues
-                    if len(self._health_history) > 1000:
-                        self._health_history = self._health_history[-1000:]
-
-                # Check if squid should go to sleep
-                if self.squid.sleepiness >= 100:
-                    self.squid.go_to_sleep()
-                    self.show_message("Squid is very tired and went to sleep!")
-                    # Add thoughts
-                    self.brain_window.add_thought("I am exhausted and going to sleep")
-            else:
-                self.squid.sleepiness = max(0, self.squid.sleepiness - (0.5 * self.simulation_speed))
-                if self.squid.sleepiness == 0:
-                    self.squid.wake_up()
-
-            # Update points based on squid's status
-            if not self.squid.is_sick and self.squid.happiness >= 80 and self.squid.cleanliness >= 80:
-                self.points += 1
-            elif self.squid.is_sick or self.squid.hunger >= 80 or self.squid.happiness <= 20:
-                self.points = max(0, self.points - 1)
-
+            self.update_needs()
             self.user_interface.update_points(self.points)
 
     def handle_window_resize(self, event):
@@ -1859,31 +1636,9 @@ class TamagotchiLogic:
             # Load brain state
             self.brain_window.set_brain_state(save_data['brain_state'])
 
-            # Load memories - first try from save_data
-            if 'ShortTerm' in save_data and save_data['ShortTerm']:
-                self.squid.memory_manager.short_term_memory = save_data['ShortTerm']
-            if 'LongTerm' in save_data and save_data['LongTerm']:
-                self.squid.memory_manager.long_term_memory = save_data['LongTerm']
-
-            # If empty or not in save_data, try loading from extracted files
-            if not self.squid.memory_manager.short_term_memory:
-                self.squid.memory_manager.short_term_memory = self.squid.memory_manager.load_memory(
-                    self.squid.memory_manager.short_term_file) or []
-            if not self.squid.memory_manager.long_term_memory:
-                self.squid.memory_manager.long_term_memory = self.squid.memory_manager.load_memory(
-                    self.squid.memory_manager.long_term_file) or []
-
-            # Make sure they are lists
-            if not isinstance(self.squid.memory_manager.short_term_memory, list):
-                self.squid.memory_manager.short_term_memory = []
-            if not isinstance(self.squid.memory_manager.long_term_memory, list):
-                self.squid.memory_manager.long_term_memory = []
-
-            # Save loaded memories to disk to ensure consistency
-            self.squid.memory_manager.save_memory(self.squid.memory_manager.short_term_memory, 
-                                                self.squid.memory_manager.short_term_file)
-            self.squid.memory_manager.save_memory(self.squid.memory_manager.long_term_memory, 
-                                                self.squid.memory_manager.long_term_file)
+            # Load memories from save_data (decoded on first use); empty or missing
+            # sections keep what the memory files hold
+            self.squid.memory_manager.load_saved_memories(save_data)
 
             print(f"\033[33;1m >>Loaded personality: {self.squid.personality.value}\033[0m")
 
@@ -1895,8 +1650,8 @@ class TamagotchiLogic:
                 for item in list(self.user_interface.scene.items()):
                     if hasattr(item, 'category') and item.category in ['rock', 'plant', 'decoration']:
                         self.user_interface.scene.removeItem(item)
-                # Now load the decorations
-                self.user_interface.load_decorations_data(decorations_data)
+                # Now load the decorations, a few at a time once the game is running
+                self.user_interface.load_decorations_deferred(decorations_data, save_data.get('assets'))
             else:
                 print("No decorations found in save data")
 
@@ -1926,6 +1681,17 @@ class TamagotchiLogic:
 
             print("Game loaded successfully")
             self.set_simulation_speed(1)  # Set simulation speed to 1x after loading
+
+            # Catch up on the time the squid spent alone since the save was written
+            saved_at = tamagotchi_logic_data.get('save_time')
+            if saved_at is None:
+                # Older saves: fall back to the file's modification time
+                latest_save = self.save_manager.get_latest_save()
+                if latest_save:
+                    saved_at = self.save_manager.get_save_timestamp(latest_save == self.save_manager.autosave_path)
+            if saved_at is not None:
+                absence = min(time.time() - saved_at, self.max_catch_up_seconds)
+                self.fast_forward(absence, age_memories=False)
         else:
             print("No save data found")
 
@@ -1987,6 +1753,7 @@ class TamagotchiLogic:
                         plugin_data[plugin_name] = data
             
             brain_state = self.brain_window.get_brain_state()
+            decorations, assets = self.user_interface.get_decorations_with_assets()
             print("Debug: Brain State")
             # print(json.dumps(brain_state, indent=2))
             
@@ -2011,30 +1778,29 @@ class TamagotchiLogic:
                         'cleanliness_threshold_time': self.cleanliness_threshold_time,
                         'hunger_threshold_time': self.hunger_threshold_time,
                         'last_clean_time': self.last_clean_time,
-                        'points': self.points
+                        'points': self.points,
+                        'save_time': time.time()
                     },
-                    'decorations': [
-                        {
-                            'pixmap_data': self.user_interface.get_pixmap_data(item),
-                            'pos': [item.pos().x(), item.pos().y()],
-                            'scale': item.scale(),
-                            'filename': item.filename
-                        }
-                        for item in self.user_interface.scene.items()
-                        if isinstance(item, ResizablePixmapItem)
-                    ]
+                    'decorations': decorations
                 },
+                'assets': assets,  # Decoration images by content hash, stored once each
                 'brain_state': brain_state,
-                'ShortTerm': squid.memory_manager.short_term_memory,
-                'LongTerm': squid.memory_manager.long_term_memory,
                 'plugin_data': plugin_data
             }
+            save_data.update(squid.memory_manager.get_memories_data())
 
             #print("Debug: Short Term Memory")
             #print(json.dumps(save_data['ShortTerm'], indent=2))
             #print("Debug: Long Term Memory")
             #print(json.dumps(save_data['LongTerm'], indent=2))
 
+            if is_autosave:
+                # Only the snapshot is taken here; serializing and writing happen on a
+                # worker thread and report back through save_notifier
+                self.save_manager.save_game_async(snapshot_data(save_data), True,
+                                                  self.save_notifier.finished.emit)
+                return
+
             filepath = self.save_manager.save_game(save_data, is_autosave)
             print(f"Game {'autosaved' if is_autosave else 'saved'} successfully to {filepath}")
         except Exception as e:
@@ -2042,60 +1808,21 @@ class TamagotchiLogic:
             import traceback
             traceback.print_exc()
 
+    def on_autosave_finished(self, filepath):
+        """Runs on the GUI thread once a background autosave has been written"""
+        if filepath:
+            print(f"Game autosaved successfully to {filepath}")
+        else:
+            print("Autosave failed")
+
     def start_autosave(self):
-        self.autosave_timer.start(300000)  # 300000 ms = 5 minutes
+        # Default 5 minutes; with delta autosaves a few seconds is cheap
+        self.autosave_timer.start(int(getattr(self, 'autosave_interval', 300) * 1000))
 
     def autosave(self):
         print("Autosaving...")
         self.save_game(self.squid, self, is_autosave=True)
 
-    # New methods to update the new neurons
-    def update_satisfaction(self):
-        # Update satisfaction based on hunger, happiness, and cleanliness
-        hunger_factor = max(0, 1 - self.squid.hunger / 100)
-        happiness_factor = self.squid.happiness / 100
-        cleanliness_factor = self.squid.cleanliness / 100
-
-        satisfaction_change = (hunger_factor + happiness_factor + cleanliness_factor) / 3
-        satisfaction_change = (satisfaction_change - 0.5) * 2  # Scale to range from -1 to 1
-
-        self.squid.satisfaction += satisfaction_change * self.simulation_speed
-        self.squid.satisfaction = max(0, min(100, self.squid.satisfaction))
-
-    def update_anxiety(self):
-        # Update anxiety based on hunger, cleanliness, and health
-        hunger_factor = self.squid.hunger / 100
-        cleanliness_factor = 1 - self.squid.cleanliness / 100
-        health_factor = 1 - self.squid.health / 100
-
-        if self.squid.personality == Personality.GREEDY:
-            hunger_factor *= 1.5  # Greedy squids get more anxious when hungry
-
-        anxiety_change = (hunger_factor + cleanliness_factor + health_factor) / 3
-
-        if self.squid.personality == Personality.TIMID and self.squid.is_near_plant():
-            anxiety_change *= 0.5  # Timid squids are less anxious near plants
-
-        self.squid.anxiety += anxiety_change * self.simulation_speed
-        self.squid.anxiety = max(0, min(100, self.squid.anxiety))
-
-    def update_curiosity(self):
-        # Update curiosity based on satisfaction and anxiety
-        if self.squid.satisfaction > 70 and self.squid.anxiety < 30:
-            curiosity_change = 0.2 * self.simulation_speed
-        else:
-            curiosity_change = -0.1 * self.simulation_speed
-
-        # Adjust curiosity change based on personality
-        if self.squid.personality == Personality.TIMID:
-            curiosity_change *= 0.5  # Timid squids are less curious
-        elif self.squid.personality == Personality.ADVENTUROUS:
-            curiosity_change *= 1.5  # Adventurous squids are more curious
-
-        self.squid.curiosity += curiosity_change
-        self.squid.curiosity = max(0, min(100, self.squid.curiosity))
-
-
     def trigger_rock_test(self):
         """Trigger rock test from UI using the interaction manager"""
         if not hasattr(self, 'rock_interaction'):
@@ -2,6 +2,7 @@
 
 import os
 import json
+import hashlib
 import math
 import time
 import random
@@ -15,6 +16,7 @@ from .brain_tool import NeuronInspector as EnhancedNeuronInspector
 from .plugin_manager_dialog import PluginManagerDialog
 from .tutorial import TutorialManager
 from .vision import VisionWindow
+from .spatial_index import SpatialIndex
 
 class DecorationItem(QtWidgets.QLabel):
     def __init__(self, pixmap, filename):
@@ -48,6 +50,33 @@ class DecorationItem(QtWidgets.QLabel):
             drag.exec_(QtCore.Qt.CopyAction)
 
 
+class IndexedGraphicsScene(QtWidgets.QGraphicsScene):
+    """
+    Tank scene that keeps a SpatialIndex of its world objects (anything with a
+    `category`, plus food) for radius and vision-cone queries.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spatial_index = SpatialIndex()
+
+    @staticmethod
+    def is_indexed_object(item):
+        return hasattr(item, 'category') or hasattr(item, 'is_sushi')
+
+    def addItem(self, item):
+        super().addItem(item)
+        if self.is_indexed_object(item):
+            self.spatial_index.update(item)
+
+    def removeItem(self, item):
+        self.spatial_index.remove(item)
+        super().removeItem(item)
+
+    def clear(self):
+        self.spatial_index.clear()
+        super().clear()
+
+
 class ResizablePixmapItem(QtWidgets.QGraphicsPixmapItem):
     def __init__(self, pixmap=None, filename=None, category=None, parent=None):
         QtWidgets.QGraphicsPixmapItem.__init__(self, parent)
@@ -89,6 +118,29 @@ class ResizablePixmapItem(QtWidgets.QGraphicsPixmapItem):
         # Just use the original bounding rect without extra space for handles
         return super().boundingRect()
 
+    def setPixmap(self, pixmap):
+        super().setPixmap(pixmap)
+        self._update_spatial_index()
+
+    def itemChange(self, change, value):
+        if change == QtWidgets.QGraphicsItem.ItemSceneChange:
+            # Leaving (or switching) scenes: drop out of the old scene's index
+            index = getattr(self.scene(), 'spatial_index', None)
+            if index is not None:
+                index.remove(self)
+        elif change in (QtWidgets.QGraphicsItem.ItemSceneHasChanged,
+                        QtWidgets.QGraphicsItem.ItemPositionHasChanged,
+                        QtWidgets.QGraphicsItem.ItemTransformHasChanged,
+                        QtWidgets.QGraphicsItem.ItemScaleHasChanged,
+                        QtWidgets.QGraphicsItem.ItemRotationHasChanged):
+            self._update_spatial_index()
+        return super().itemChange(change, value)
+
+    def _update_spatial_index(self):
+        index = getattr(self.scene(), 'spatial_index', None)
+        if index is not None:
+            index.update(self)
+
     def wheelEvent(self, event):
         # Don't scale rocks
         if self.filename and ('rock01' in self.filename.lower() or 'rock02' in self.filename.lower()):
@@ -280,6 +332,10 @@ class Ui:
         self.window = window
         self.tamagotchi_logic = None
         self.debug_mode = debug_mode
+        self._pixmap_assets = {}  # QPixmap.cacheKey() -> (content hash, PNG bytes), reused across saves
+        self._pending_decorations = []  # Saved decorations still waiting to be built (see load_decorations_deferred)
+        self._pending_assets = {}
+        self._decoration_loader = None
         self.setup_neurogenesis_debug_shortcut()
         
         # Get screen size and initialize scaling
@@ -304,7 +360,7 @@ class Ui:
         self.window.resize(self.window_width, self.window_height)
 
         # Create scene and view
-        self.scene = QtWidgets.QGraphicsScene()
+        self.scene = IndexedGraphicsScene()
         self.view = QtWidgets.QGraphicsView(self.scene)
         self.tutorial_manager = TutorialManager(self, window)
         self.view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
@@ -1306,6 +1362,11 @@ class Ui:
         self.points_value_label.setPlainText(str(points))
 
     def get_nearby_decorations(self, x, y, radius=100):
+        index = getattr(self.scene, 'spatial_index', None)
+        if index is not None:
+            return [item for item in index.query_radius(x, y, radius)
+                    if isinstance(item, ResizablePixmapItem)]
+
         nearby_decorations = []
         for item in self.scene.items():
             if isinstance(item, ResizablePixmapItem):
@@ -1823,41 +1884,134 @@ class Ui:
         self.view_cone_action.triggered.connect(toggle_function)
 
     def get_decorations_data(self):
+        """
+        Decorations as a list of self-contained dicts, each with its image
+        embedded as base64 PNG data. Saves use get_decorations_with_assets(),
+        which stores each distinct image only once.
+        """
+        decorations_data, assets = self.get_decorations_with_assets()
+        legacy_data = []
+        for decoration_data in decorations_data:
+            decoration_data = dict(decoration_data)
+            asset_hash = decoration_data.pop('asset', None)
+            if asset_hash is not None:
+                decoration_data['pixmap_data'] = QtCore.QByteArray(assets[asset_hash]).toBase64().data().decode()
+            legacy_data.append(decoration_data)
+        return legacy_data
+
+    def get_decorations_with_assets(self):
+        """
+        Decorations for a save file.
+
+        Returns (decorations, assets): each decoration references its image by
+        content hash, and `assets` maps every distinct hash to PNG bytes once,
+        however many decorations share it.
+        """
         decorations_data = []
+        assets = {}
+        used = {}
         for item in self.scene.items():
             if isinstance(item, ResizablePixmapItem):
-                pixmap = item.pixmap()
-                buffer = QtCore.QBuffer()
-                buffer.open(QtCore.QIODevice.WriteOnly)
-                pixmap.save(buffer, "PNG")
-                pixmap_data = buffer.data().toBase64().data().decode()
+                key = item.pixmap().cacheKey()
+                asset_hash, png_data = self.get_pixmap_asset(item)
+                used[key] = (asset_hash, png_data)
+                assets[asset_hash] = png_data
                 decorations_data.append({
-                    'pixmap_data': pixmap_data,
-                    'pos': (item.pos().x(), item.pos().y()),  # Convert QPointF to tuple
-                    'scale': item.scale()
+                    'asset': asset_hash,
+                    'pos': [item.pos().x(), item.pos().y()],
+                    'scale': item.scale(),
+                    'filename': item.filename
                 })
-        return decorations_data
-
-    def load_decorations_data(self, decorations_data):
+        # Decorations from a save that haven't been built yet are still part of the tank
+        for decoration_data in self._pending_decorations:
+            asset_hash = decoration_data.get('asset')
+            if asset_hash is not None and asset_hash in self._pending_assets:
+                assets[asset_hash] = bytes(self._pending_assets[asset_hash])
+            decorations_data.append(decoration_data)
+
+        # Only keep encodings that are still in use
+        self._pixmap_assets = used
+        return decorations_data, assets
+
+    def load_decorations_data(self, decorations_data, assets=None):
+        """Build decorations right away, from either get_decorations_data() or get_decorations_with_assets() output"""
+        self.cancel_deferred_decorations()
+        assets = assets or {}
+        pixmaps = {}  # Decode each shared asset once; QPixmap copies are implicitly shared
         for decoration_data in decorations_data:
+            self._create_decoration(decoration_data, assets, pixmaps)
+
+    def load_decorations_deferred(self, decorations_data, assets=None, budget_ms=8):
+        """
+        Build saved decorations in small batches whenever the event loop is idle,
+        spending at most `budget_ms` per batch, so loading a crowded tank
+        doesn't hold up the first frames of the simulation.
+        """
+        self.cancel_deferred_decorations()
+        self._pending_decorations = list(decorations_data)
+        self._pending_assets = assets or {}
+        pixmaps = {}
+
+        def load_batch():
+            deadline = time.perf_counter() + budget_ms / 1000.0
+            while self._pending_decorations and time.perf_counter() < deadline:
+                self._create_decoration(self._pending_decorations.pop(0), self._pending_assets, pixmaps)
+            if not self._pending_decorations:
+                self.cancel_deferred_decorations()
+
+        self._decoration_loader = QtCore.QTimer()
+        self._decoration_loader.setInterval(0)  # Runs when there are no other events to process
+        self._decoration_loader.timeout.connect(load_batch)
+        self._decoration_loader.start()
+
+    def cancel_deferred_decorations(self):
+        """Stop building saved decorations; anything not built yet is dropped"""
+        if self._decoration_loader is not None:
+            self._decoration_loader.stop()
+            self._decoration_loader = None
+        self._pending_decorations = []
+        self._pending_assets = {}
+
+    def _create_decoration(self, decoration_data, assets, pixmaps):
+        asset_hash = decoration_data.get('asset')
+        if asset_hash is not None:
+            pixmap = pixmaps.get(asset_hash)
+            if pixmap is None:
+                pixmap = QtGui.QPixmap()
+                if asset_hash in assets:
+                    asset_data = assets[asset_hash]
+                    pixmap.loadFromData(asset_data)
+                    # Saving again without changes can reuse the stored bytes
+                    self._pixmap_assets[pixmap.cacheKey()] = (asset_hash, bytes(asset_data))
+                else:
+                    print(f"Missing decoration asset {asset_hash}")
+                pixmaps[asset_hash] = pixmap
+        else:
+            # Older saves embed a base64 PNG per decoration
             pixmap_data = decoration_data['pixmap_data']
             pixmap = QtGui.QPixmap()
             pixmap.loadFromData(QtCore.QByteArray.fromBase64(pixmap_data.encode()))
-            pos = QtCore.QPointF(decoration_data['pos'][0], decoration_data['pos'][1])
-            scale = decoration_data['scale']
-            filename = decoration_data['filename']
-            item = ResizablePixmapItem(pixmap, filename)
-            item.setPos(pos)
-            item.setScale(scale)
-            self.scene.addItem(item)
-
-    def get_pixmap_data(self, item):
+        pos = QtCore.QPointF(decoration_data['pos'][0], decoration_data['pos'][1])
+        scale = decoration_data['scale']
+        filename = decoration_data['filename']
+        item = ResizablePixmapItem(pixmap, filename)
+        item.setPos(pos)
+        item.setScale(scale)
+        self.scene.addItem(item)
+        return item
+
+    def get_pixmap_asset(self, item):
+        """Content hash and PNG bytes of an item's pixmap, encoded once per distinct pixmap"""
         pixmap = item.pixmap()
-        buffer = QtCore.QBuffer()
-        buffer.open(QtCore.QIODevice.WriteOnly)
-        pixmap.save(buffer, "PNG")
-        pixmap_data = buffer.data().toBase64().data().decode()
-        return pixmap_data
+        cached = self._pixmap_assets.get(pixmap.cacheKey())
+        if cached is None:
+            buffer = QtCore.QBuffer()
+            buffer.open(QtCore.QIODevice.WriteOnly)
+            pixmap.save(buffer, "PNG")
+            png_data = bytes(buffer.data())
+            cached = (hashlib.sha1(png_data).hexdigest(), png_data)
+            self._pixmap_assets[pixmap.cacheKey()] = cached
+        return cached
 
     def closeEvent(self, event):
         # Instead of closing, just hide the window
@@ -96,18 +96,9 @@ class VisionWindow(QtWidgets.QDialog):
 
         squid = self.tamagotchi_logic.squid
         
-        # Gather all world objects to check for visibility
-        all_objects = []
-        if hasattr(self.tamagotchi_logic, 'food_items'):
-            all_objects.extend(self.tamagotchi_logic.food_items)
-        if hasattr(self.tamagotchi_logic, 'poop_items'):
-            all_objects.extend(self.tamagotchi_logic.poop_items)
-        if hasattr(self.tamagotchi_logic, 'user_interface') and hasattr(self.tamagotchi_logic.user_interface, 'scene'):
-             all_decorations = [item for item in self.tamagotchi_logic.user_interface.scene.items() if hasattr(item, 'category')]
-             all_objects.extend(all_decorations)
-
         # Use the squid's own vision method to get what it can see
-        visible_objects = squid.get_visible_objects(all_objects)
+        # (food, poop and decorations come from the scene's spatial index)
+        visible_objects = squid.get_visible_scene_objects()
 
         self.visible_objects_list.clear()
 
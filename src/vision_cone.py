@@ -0,0 +1,20 @@
+import numpy as np
+
+
+def cone_mask(positions, origin_x, origin_y, view_angle, half_angle, length):
+    """
+    Vision-cone test for many points at once.
+
+    positions: (N, 2) array-like of x, y points
+    Returns (mask, distances): a boolean array that is True for points inside
+    the cone, and each point's distance from the cone origin.
+    """
+    points = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    dx = points[:, 0] - origin_x
+    dy = points[:, 1] - origin_y
+    distances = np.hypot(dx, dy)
+
+    # Angle difference wrapped into 0..pi
+    angle_diff = np.abs((np.arctan2(dy, dx) - view_angle + np.pi) % (2 * np.pi) - np.pi)
+    mask = (distances <= length) & (angle_diff <= half_angle)
+    return mask, distances
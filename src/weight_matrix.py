@@ -0,0 +1,267 @@
+import numpy as np
+from collections.abc import MutableMapping
+
+
+class WeightMatrix(MutableMapping):
+    """
+    Connection weights stored as a dense NumPy matrix plus a neuron name -> index map.
+
+    Behaves like the old ``dict[(source, target)] -> float`` (get, items, `in`,
+    `del`, assignment...), so existing tabs keep working, while decay, pruning,
+    clamping and heatmaps become single array operations. The matrix grows as
+    neurogenesis adds neurons; indices of removed neurons are reused.
+    """
+
+    def __init__(self, weights=None, capacity=16):
+        self._index = {}    # neuron name -> row/column
+        self._names = []    # row/column -> neuron name (None if free)
+        self._free = []     # reusable rows/columns from removed neurons
+        self._values = np.zeros((capacity, capacity), dtype=np.float64)
+        self._present = np.zeros((capacity, capacity), dtype=bool)
+        self._count = 0
+        self.version = 0    # Bumped on every change, so views can tell when to redraw
+        if weights:
+            self.update(weights)
+
+    # ------------------------------------------------------------------
+    # Index management
+    # ------------------------------------------------------------------
+    def _slot(self, name):
+        """Return the index for a neuron, allocating (and growing) if needed"""
+        idx = self._index.get(name)
+        if idx is not None:
+            return idx
+
+        if self._free:
+            idx = self._free.pop()
+            self._names[idx] = name
+        else:
+            idx = len(self._names)
+            self._names.append(name)
+            capacity = self._values.shape[0]
+            if idx >= capacity:
+                new_capacity = capacity * 2
+                values = np.zeros((new_capacity, new_capacity), dtype=np.float64)
+                present = np.zeros((new_capacity, new_capacity), dtype=bool)
+                values[:capacity, :capacity] = self._values
+                present[:capacity, :capacity] = self._present
+                self._values, self._present = values, present
+        self._index[name] = idx
+        return idx
+
+    def _lookup(self, key):
+        """Return (i, j) for an existing connection or raise KeyError"""
+        try:
+            source, target = key
+        except (TypeError, ValueError):
+            raise KeyError(key)
+        i = self._index.get(source)
+        j = self._index.get(target)
+        if i is None or j is None or not self._present[i, j]:
+            raise KeyError(key)
+        return i, j
+
+    def index_of(self, name):
+        return self._index.get(name)
+
+    def neurons(self):
+        """Names of all neurons that have (or had) connections"""
+        return list(self._index)
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+    def __getitem__(self, key):
+        i, j = self._lookup(key)
+        return float(self._values[i, j])
+
+    def __setitem__(self, key, value):
+        if not (isinstance(key, tuple) and len(key) == 2):
+            raise KeyError(f"Weight keys must be (source, target) tuples, got {key!r}")
+        i = self._slot(key[0])
+        j = self._slot(key[1])
+        if not self._present[i, j]:
+            self._present[i, j] = True
+            self._count += 1
+        self._values[i, j] = value
+        self.version += 1
+
+    def __delitem__(self, key):
+        i, j = self._lookup(key)
+        self._present[i, j] = False
+        self._values[i, j] = 0.0
+        self._count -= 1
+        self.version += 1
+
+    def __contains__(self, key):
+        try:
+            self._lookup(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        # Snapshot the keys so callers may modify weights while iterating
+        names = self._names
+        return iter([(names[i], names[j]) for i, j in np.argwhere(self._present)])
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"WeightMatrix({dict(self.items())!r})"
+
+    def items(self):
+        rows, cols = np.nonzero(self._present)
+        names = self._names
+        return [((names[i], names[j]), float(w))
+                for i, j, w in zip(rows.tolist(), cols.tolist(), self._values[rows, cols].tolist())]
+
+    def values(self):
+        return self._values[self._present].tolist()
+
+    def copy(self):
+        """Plain dict snapshot (used for freezing and trend comparisons)"""
+        return dict(self.items())
+
+    def clear(self):
+        version = self.version
+        self.__init__(capacity=self._values.shape[0])
+        self.version = version + 1
+
+    # ------------------------------------------------------------------
+    # Vectorized operations
+    # ------------------------------------------------------------------
+    def scale(self, factor):
+        """Multiply every weight by `factor` (weight decay)"""
+        self._values *= factor
+        self.version += 1
+
+    def clamp(self, low=-1.0, high=1.0):
+        np.clip(self._values, low, high, out=self._values)
+        self.version += 1
+
+    def add_noise(self, low, high, rng):
+        """
+        Add uniform noise to every existing connection.
+        rng: numpy Generator supplied by the caller, so seeded runs stay reproducible
+        """
+        noise = rng.uniform(low, high, size=self._values.shape)
+        self._values += noise * self._present
+        self.version += 1
+
+    def prune(self, threshold, protected=()):
+        """
+        Remove connections with |weight| < threshold.
+        Connections touching a neuron in `protected` are kept.
+        Returns the list of removed (source, target) pairs.
+        """
+        weak = self._present & (np.abs(self._values) < threshold)
+        for name in protected:
+            idx = self._index.get(name)
+            if idx is not None:
+                weak[idx, :] = False
+                weak[:, idx] = False
+        rows, cols = np.nonzero(weak)
+        if rows.size == 0:
+            return []
+        names = self._names
+        removed = [(names[i], names[j]) for i, j in zip(rows.tolist(), cols.tolist())]
+        self._present[weak] = False
+        self._values[weak] = 0.0
+        self._count -= len(removed)
+        self.version += 1
+        return removed
+
+    def remove_neuron(self, name):
+        """Drop a neuron and all of its connections; returns how many connections were removed"""
+        idx = self._index.pop(name, None)
+        if idx is None:
+            return 0
+        removed = int(self._present[idx, :].sum() + self._present[:, idx].sum() - self._present[idx, idx])
+        self._present[idx, :] = False
+        self._present[:, idx] = False
+        self._values[idx, :] = 0.0
+        self._values[:, idx] = 0.0
+        self._names[idx] = None
+        self._free.append(idx)
+        self._count -= removed
+        self.version += 1
+        return removed
+
+    def connection_strengths(self, name):
+        """Absolute weights of every connection touching `name`"""
+        idx = self._index.get(name)
+        if idx is None:
+            return []
+        row = np.abs(self._values[idx, :][self._present[idx, :]])
+        col_mask = self._present[:, idx].copy()
+        col_mask[idx] = False  # self-connection already counted in the row
+        col = np.abs(self._values[:, idx][col_mask])
+        return np.concatenate([row, col]).tolist()
+
+    def hebbian_update(self, names, activations, learning_rate, decay_rate,
+                       boosted=None, boost=2.0, low=-1.0, high=1.0):
+        """
+        One Hebbian step over every pair of `names` at once.
+
+        For each unordered pair the existing direction is updated ((a, b) first,
+        then (b, a)); unconnected pairs get a new (a, b) connection starting at 0:
+            w += lr * (act_a / 100) * (act_b / 100) - w * decay_rate
+        `boosted` flags neurons whose pairs learn `boost` times faster.
+        Returns the list of updated (source, target) pairs.
+        """
+        n = len(names)
+        if n < 2:
+            return []
+
+        idx = np.array([self._slot(name) for name in names], dtype=np.intp)
+        act = np.asarray(activations, dtype=np.float64) / 100.0
+        delta = np.outer(act, act) * learning_rate
+        if boosted is not None:
+            boosted = np.asarray(boosted, dtype=bool)
+            delta = np.where(boosted[:, None] | boosted[None, :], delta * boost, delta)
+
+        upper = np.triu(np.ones((n, n), dtype=bool), 1)
+        forward = self._present[np.ix_(idx, idx)]
+        reverse = forward.T
+        use_forward = upper & (forward | ~reverse)
+        use_reverse = upper & ~forward & reverse
+
+        updated = []
+        for mask, flip in ((use_forward, False), (use_reverse, True)):
+            a, b = np.nonzero(mask)
+            if a.size == 0:
+                continue
+            rows, cols = (idx[b], idx[a]) if flip else (idx[a], idx[b])
+            self._count += int((~self._present[rows, cols]).sum())
+            self._present[rows, cols] = True
+            current = self._values[rows, cols]
+            self._values[rows, cols] = np.clip(current + delta[a, b] - current * decay_rate, low, high)
+            names_list = self._names
+            updated.extend((names_list[r], names_list[c]) for r, c in zip(rows.tolist(), cols.tolist()))
+        if updated:
+            self.version += 1
+        return updated
+
+    def matrix(self, names, symmetric=True):
+        """
+        Weights between `names` as a len(names) x len(names) array (0 where unconnected).
+        With symmetric=True, a missing (a, b) falls back to (b, a) like the heatmap expects.
+        """
+        n = len(names)
+        result = np.zeros((n, n), dtype=np.float64)
+        idx = np.array([self._index.get(name, -1) for name in names], dtype=np.intp)
+        valid = idx >= 0
+        if not valid.any():
+            return result
+
+        sub_idx = idx[valid]
+        values = self._values[np.ix_(sub_idx, sub_idx)]
+        present = self._present[np.ix_(sub_idx, sub_idx)]
+        if symmetric:
+            values = np.where(present, values, values.T * present.T)
+        else:
+            values = values * present
+        result[np.ix_(valid, valid)] = values
+        return result
@@ -0,0 +1,113 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .spatial_index import SpatialIndex
+from .vision_cone import cone_mask
+
+
+# One categorised scene object as it was at the start of the tick.
+# rect is the scene bounding rect as (left, top, right, bottom).
+WorldObjectInfo = namedtuple('WorldObjectInfo', ['item', 'category', 'x', 'y', 'rect', 'is_decoration'])
+
+
+class WorldSnapshot:
+    """
+    View of the tank's world objects for one simulation tick.
+
+    Built once at the start of TamagotchiLogic.update_simulation and dropped
+    at the end, so decoration attraction, decisions and vision read positions,
+    rects and categories from plain arrays instead of each walking the scene
+    and probing item attributes. Positions do not follow items that move
+    during the tick; items removed during the tick (e.g. eaten food) are
+    dropped with discard().
+    """
+
+    def __init__(self, tick, objects):
+        self._build(tick, objects)
+
+    def _build(self, tick, objects):
+        self.tick = tick
+        self.objects = tuple(objects)
+        self.categories = [info.category for info in self.objects]
+        if self.objects:
+            self.positions = np.array([(info.x, info.y) for info in self.objects], dtype=np.float64)
+            rects = np.array([info.rect for info in self.objects], dtype=np.float64)
+            self.centers = np.column_stack(((rects[:, 0] + rects[:, 2]) / 2, (rects[:, 1] + rects[:, 3]) / 2))
+        else:
+            self.positions = np.zeros((0, 2), dtype=np.float64)
+            self.centers = np.zeros((0, 2), dtype=np.float64)
+        self.decoration_mask = np.array([info.is_decoration for info in self.objects], dtype=bool)
+        self._by_category = {}
+        for i, category in enumerate(self.categories):
+            self._by_category.setdefault(category, []).append(i)
+
+    @classmethod
+    def capture(cls, scene, tick=None, decoration_type=None):
+        """
+        Snapshot every categorised object (and food) in `scene`.
+        Items that are instances of `decoration_type` are flagged as decorations.
+        """
+        index = getattr(scene, 'spatial_index', None)
+        if index is not None:
+            items = list(index)
+        else:
+            items = [item for item in scene.items()
+                     if hasattr(item, 'category') or hasattr(item, 'is_sushi')]
+
+        objects = []
+        for item in items:
+            try:
+                pos = item.pos()
+                rect = item.sceneBoundingRect()
+            except RuntimeError:
+                continue  # Deleted underneath us
+            objects.append(WorldObjectInfo(
+                item, SpatialIndex.category_of(item), pos.x(), pos.y(),
+                (rect.left(), rect.top(), rect.right(), rect.bottom()),
+                decoration_type is not None and isinstance(item, decoration_type)))
+        return cls(tick, objects)
+
+    def discard(self, item):
+        """Forget an item that left the scene during the tick"""
+        if any(info.item is item for info in self.objects):
+            self._build(self.tick, [info for info in self.objects if info.item is not item])
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def _indices(self, categories=None):
+        if categories is None:
+            return np.arange(len(self.objects))
+        selected = []
+        for category in categories:
+            selected.extend(self._by_category.get(category, ()))
+        return np.array(sorted(selected), dtype=np.intp)
+
+    def items(self, categories=None):
+        """Snapshotted items, optionally limited to some categories"""
+        return [self.objects[i].item for i in self._indices(categories).tolist()]
+
+    def near(self, x, y, radius, decorations_only=False):
+        """Items whose bounding-rect centre is within `radius` of (x, y)"""
+        if not self.objects:
+            return []
+        distances = np.hypot(self.centers[:, 0] - x, self.centers[:, 1] - y)
+        mask = distances <= radius
+        if decorations_only:
+            mask &= self.decoration_mask
+        return [self.objects[i].item for i in np.nonzero(mask)[0].tolist()]
+
+    def visible(self, cone, categories=None):
+        """
+        Items whose position is inside a vision cone.
+        cone: (origin_x, origin_y, view_angle, half_angle, length)
+        """
+        indices = self._indices(categories)
+        if indices.size == 0:
+            return []
+        mask, _ = cone_mask(self.positions[indices], *cone)
+        return [self.objects[i].item for i in indices[mask].tolist()]
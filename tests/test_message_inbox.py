@@ -0,0 +1,40 @@
+from plugins.multiplayer.message_inbox import CoalescingInbox
+from plugins.multiplayer.state_sync import SquidStateDecoder, SquidStateEncoder
+
+
+def _queue_states(inbox, states):
+    encoder = SquidStateEncoder(keyframe_interval=10)
+    for state in states:
+        inbox.put({'type': 'squid_state', 'node_id': 'peer', 'payload': encoder.encode(state)}, ('127.0.0.1', 0))
+
+
+def test_coalesced_deltas_build_on_the_original_keyframe():
+    inbox = CoalescingInbox()
+    # The second delta drops is_sleeping because it is back to the keyframe's value
+    _queue_states(inbox, [
+        {'x': 0, 'is_sleeping': False},
+        {'x': 1, 'is_sleeping': True},
+        {'x': 2, 'is_sleeping': False},
+    ])
+
+    messages = inbox.drain()
+    assert len(messages) == 1
+    payload = messages[0][0]['payload']
+    assert payload['keyframe']
+    assert SquidStateDecoder().decode('peer', payload) == {'x': 2, 'is_sleeping': False}
+    assert inbox.coalesced == 2
+
+
+def test_later_deltas_decode_against_the_merged_keyframe():
+    inbox = CoalescingInbox()
+    encoder = SquidStateEncoder(keyframe_interval=10)
+    for state in ({'x': 0, 'is_sleeping': False}, {'x': 1, 'is_sleeping': True}):
+        inbox.put({'type': 'squid_state', 'node_id': 'peer', 'payload': encoder.encode(state)}, None)
+    decoder = SquidStateDecoder()
+    for message, _ in inbox.drain():
+        decoder.decode('peer', message['payload'])
+
+    # Still relative to the sender's keyframe, which had is_sleeping False
+    delta = encoder.encode({'x': 5, 'is_sleeping': False})
+    assert not delta.get('keyframe')
+    assert decoder.decode('peer', delta) == {'x': 5, 'is_sleeping': False}